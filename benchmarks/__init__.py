@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+# Offline performance benchmarks. Run from the repository root, e.g. `python -m benchmarks.bench_risk_engine`.
@@ -0,0 +1,177 @@
+import io
+import os
+import json
+import math
+import time
+import argparse
+import tempfile
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from src.models import ResearchQuery
+from src.pipeline import run_direct_pipeline
+from src.batch import run_batch
+from src.tools.composio_client import ComposioClient, set_composio_client, load_rate_limits, DEFAULT_MAX_WORKERS
+from src.tools.local_server import LocalComposioServer
+from src.tools.transport import create_transport
+from src.tools.workbench import LocalWorkbenchStore
+from benchmarks.fakes import Distribution, FakeLLM, FakeToolBackend
+
+# --- End-to-End Pipeline Benchmark ---
+# Runs the direct pipeline entirely offline: FakeLLM stands in for Groq and FakeToolBackend for
+# the Composio tools (in-process, or behind LocalComposioServer over HTTP), with configurable
+# latency and payload-size distributions. Reports p50/p95/p99 end-to-end latency and runs/sec
+# for single-run, batch and concurrent modes. Every run uses a distinct topic, and the result
+# cache is off and stage checkpoints go to a fresh temporary directory, so no run is served from
+# an earlier one (not even from a previous benchmark invocation). The providers' per-slug rate limits
+# are off by default too (they would cap throughput at ~4 runs/s); --provider-rate-limits keeps them.
+# Usage: python -m benchmarks.bench_pipeline --runs 50 --tool-latency lognormal:0.05:0.5 --llm-latency fixed:0.2
+
+BENCHMARK_MODES = ("single", "batch", "concurrent")
+
+
+def benchmark_queries(mode: str, runs: int) -> List[ResearchQuery]:
+    return [
+        ResearchQuery(
+            topic=f"Benchmark topic {mode} #{i}: carrier-mediated localized drug delivery",
+            target_output="Hypothesis, protocol summary and prior art matrix.",
+            keywords=["graphene quantum dots", "localized delivery", f"variant {i}"],
+        )
+        for i in range(runs)
+    ]
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100); NaN for an empty list."""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def _timed_run(query: ResearchQuery, llm) -> Optional[float]:
+    """End-to-end latency of one pipeline run, or None if it failed."""
+    started = time.perf_counter()
+    try:
+        run_direct_pipeline(query, llm=llm, output_file=None)
+    except Exception:
+        return None
+    return time.perf_counter() - started
+
+
+def run_single(queries: List[ResearchQuery], llm) -> List[Optional[float]]:
+    return [_timed_run(query, llm) for query in queries]
+
+
+def run_concurrent(queries: List[ResearchQuery], llm, concurrency: int) -> List[Optional[float]]:
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bench-run") as executor:
+        return list(executor.map(lambda query: _timed_run(query, llm), queries))
+
+
+def run_batch_mode(queries: List[ResearchQuery], llm, workers: int, work_dir: str) -> List[Optional[float]]:
+    input_path = os.path.join(work_dir, "batch_input.jsonl")
+    output_path = os.path.join(work_dir, "batch_output.jsonl")
+    with open(input_path, "w", encoding="utf-8") as f:
+        f.writelines(query.json() + "\n" for query in queries)
+    if os.path.exists(output_path):
+        os.remove(output_path)
+
+    run_batch(input_path, output_path, workers=workers, llm=llm)
+    with open(output_path, "r", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    return [r["wall_clock_s"] if r["status"] == "completed" else None for r in records]
+
+
+def measure(mode: str, run: Callable[[], List[Optional[float]]]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    latencies = run()
+    wall_clock_s = time.perf_counter() - started
+    completed = [s for s in latencies if s is not None]
+    return {
+        "mode": mode,
+        "runs": len(latencies),
+        "failed": len(latencies) - len(completed),
+        "p50_ms": percentile(completed, 50) * 1000,
+        "p95_ms": percentile(completed, 95) * 1000,
+        "p99_ms": percentile(completed, 99) * 1000,
+        "runs_per_s": len(completed) / wall_clock_s if wall_clock_s > 0 else 0.0,
+        "wall_clock_s": wall_clock_s,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the direct pipeline offline with fake LLM and tools.")
+    parser.add_argument("--runs", type=int, default=20, help="Pipeline runs per mode.")
+    parser.add_argument("--modes", nargs="+", choices=BENCHMARK_MODES, default=list(BENCHMARK_MODES))
+    parser.add_argument("--concurrency", type=int, default=8, help="Threads in concurrent mode.")
+    parser.add_argument("--batch-workers", type=int, default=4, help="Workers in batch mode.")
+    parser.add_argument("--tool-latency", type=Distribution.parse, default=Distribution.parse("lognormal:0.05:0.5"),
+                        help="Per tool-call latency in seconds (fixed:V, uniform:LO:HI, lognormal:MEDIAN:SIGMA).")
+    parser.add_argument("--llm-latency", type=Distribution.parse, default=Distribution.parse("uniform:0.1:0.3"),
+                        help="Per LLM-call latency in seconds.")
+    parser.add_argument("--payload-bytes", type=Distribution.parse, default=Distribution.parse("uniform:2000:20000"),
+                        help="Raw payload size of each Arxiv/PubChem result in bytes.")
+    parser.add_argument("--transport", choices=("local", "http"), default="local",
+                        help="'http' serves the fake tools through LocalComposioServer over pooled HTTP.")
+    parser.add_argument("--provider-rate-limits", action="store_true",
+                        help="Apply the production per-slug rate limits (load_rate_limits) to the fake tools.")
+    parser.add_argument("--no-sandbox", action="store_true", help="Simulate Remote Bash instead of running the analysis.")
+    parser.add_argument("--json", metavar="FILE", help="Also write the results as JSON (e.g. as a CI artifact).")
+    parser.add_argument("--verbose", action="store_true", help="Show the pipeline's own log output.")
+    args = parser.parse_args()
+
+    backend = FakeToolBackend(latency=args.tool_latency, payload_bytes=args.payload_bytes)
+    llm = FakeLLM(latency=args.llm_latency)
+    server = None
+    results = []
+
+    with tempfile.TemporaryDirectory(prefix="bench-pipeline-") as work_dir:
+        os.environ["CHECKPOINT_DIR"] = os.path.join(work_dir, "checkpoints")
+        client_kwargs: Dict[str, Any] = {"backend": backend}
+        if args.transport == "http":
+            server = LocalComposioServer(backend=backend)
+            client_kwargs = {"transport": create_transport(server.start_in_thread(), max_connections_per_host=DEFAULT_MAX_WORKERS)}
+        client = ComposioClient(
+            workbench=LocalWorkbenchStore(os.path.join(work_dir, "workbench")),
+            result_ttls_s={},  # Result cache off: every run pays for its tool calls
+            rate_limits=load_rate_limits() if args.provider_rate_limits else {},
+            **client_kwargs,
+        )
+        if args.no_sandbox:
+            client.sandbox_enabled = False
+        set_composio_client(client)
+
+        runners = {
+            "single": lambda queries: run_single(queries, llm),
+            "batch": lambda queries: run_batch_mode(queries, llm, args.batch_workers, work_dir),
+            "concurrent": lambda queries: run_concurrent(queries, llm, args.concurrency),
+        }
+        log = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+        try:
+            with log:
+                run_single(benchmark_queries("warmup", 1), llm)  # Starts the sandbox workers and thread pools
+                for mode in args.modes:
+                    queries = benchmark_queries(mode, args.runs)
+                    results.append(measure(mode, lambda: runners[mode](queries)))
+        finally:
+            set_composio_client(None)
+            client.shutdown()
+            if server is not None:
+                server.stop_in_thread()
+
+    print(f"\n--- Pipeline benchmark: {args.runs} runs/mode, transport={args.transport}, "
+          f"sandbox={'off' if args.no_sandbox else 'on'}, "
+          f"rate limits={'on' if args.provider_rate_limits else 'off'} ---")
+    print(f"tool latency {args.tool_latency}s, LLM latency {args.llm_latency}s, payload {args.payload_bytes} bytes")
+    print(f"{'mode':<12}{'runs':>6}{'failed':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'runs/s':>10}")
+    for r in results:
+        print(f"{r['mode']:<12}{r['runs']:>6}{r['failed']:>8}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}"
+              f"{r['p99_ms']:>10.1f}{r['runs_per_s']:>10.2f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"config": {k: str(v) for k, v in vars(args).items()}, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import json
+import math
+import time
+import random
+from typing import Any, Dict, NamedTuple, Optional, Union
+from src.identity import stable_digest
+from src.tools.backends import LocalToolBackend
+
+# --- Offline Stand-ins for Groq and Composio ---
+# Deterministic fakes for benchmarking without API keys or network access. Every latency and
+# payload size is drawn from a configurable distribution, using an RNG seeded from the request
+# itself, so the same set of queries produces the same samples on every run.
+
+COMPOUND_RECORD_BYTES = 130  # Approximate JSON size of one simulated PubChem compound record
+
+
+class Distribution(NamedTuple):
+    """
+    A sampling distribution, written on the command line as 'fixed:V', 'uniform:LO:HI' or
+    'lognormal:MEDIAN:SIGMA' (long-tailed, like real API latencies).
+    """
+    kind: str
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "Distribution":
+        kind, *params = spec.split(":")
+        expected = {"fixed": 1, "uniform": 2, "lognormal": 2}
+        if kind not in expected or len(params) != expected[kind]:
+            raise ValueError(f"Invalid distribution '{spec}'. Use fixed:V, uniform:LO:HI or lognormal:MEDIAN:SIGMA.")
+        return cls(kind, *(float(p) for p in params))
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "fixed":
+            return self.a
+        if self.kind == "uniform":
+            return rng.uniform(self.a, self.b)
+        return self.a * math.exp(rng.gauss(0.0, self.b))
+
+    def __str__(self) -> str:
+        params = (self.a,) if self.kind == "fixed" else (self.a, self.b)
+        return ":".join([self.kind, *(f"{p:g}" for p in params)])
+
+
+NO_DELAY = Distribution("fixed", 0.0)
+
+
+class FakeToolBackend(LocalToolBackend):
+    """
+    LocalToolBackend with sampled latencies and payload sizes: PubChem results are padded with
+    extra compounds and Arxiv full texts are lengthened until the payload reaches the sampled size.
+    """
+    def __init__(
+        self,
+        latency: Union[Distribution, Dict[str, Distribution]] = NO_DELAY,
+        payload_bytes: Optional[Distribution] = None,
+    ):
+        super().__init__()
+        self.latency = latency
+        self.payload_bytes = payload_bytes
+
+    def _latency_distribution(self, tool_slug: str) -> Distribution:
+        if isinstance(self.latency, dict):
+            return self.latency.get(tool_slug, NO_DELAY)
+        return self.latency
+
+    def _pad(self, data: Dict[str, Any], target_bytes: int, rng: random.Random):
+        if data.get("source") == "pubchem":
+            compounds = data["compounds"]
+            for i in range(len(compounds), target_bytes // COMPOUND_RECORD_BYTES):
+                compounds.append({
+                    "cid": rng.randint(1000, 9999999),
+                    "name": f"candidate-{i}",
+                    "molecular_weight": round(rng.uniform(150.0, 900.0), 2),
+                    "logp": round(rng.uniform(-2.0, 7.0), 2),
+                    "toxicity_flag": rng.random() < 0.2,
+                })
+        elif data.get("source") == "arxiv" and data["papers"]:
+            per_paper = target_bytes // len(data["papers"])
+            for paper in data["papers"]:
+                text = paper["full_text"] + " "
+                paper["full_text"] = (text * (per_paper // len(text) + 1))[:per_paper]
+
+    def execute(self, tool_slug: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        rng = random.Random(stable_digest({"fake_tool": tool_slug, "arguments": arguments}))
+        delay = self._latency_distribution(tool_slug).sample(rng)
+        if delay > 0:
+            time.sleep(delay)
+
+        output = super().execute(tool_slug, arguments)
+        if self.payload_bytes is not None and output.get("data") is not None:
+            self._pad(output["data"], int(self.payload_bytes.sample(rng)), rng)
+        return output
+
+
+class FakeMessage(NamedTuple):
+    """Mimics the LangChain message returned by ChatGroq.invoke (only `.content` is used)."""
+    content: str
+
+
+class FakeLLM:
+    """
+    Deterministic stand-in for the ChatGroq model used by the direct pipeline. Answers the
+    synthesis prompt with a valid FinalSynthesis JSON object and any other prompt with a
+    hypothesis sentence, after a latency sampled per prompt.
+    """
+    def __init__(self, latency: Distribution = NO_DELAY):
+        self.latency = latency
+        self.calls = 0
+
+    def invoke(self, prompt: str) -> FakeMessage:
+        self.calls += 1
+        rng = random.Random(stable_digest({"fake_llm": prompt}))
+        delay = self.latency.sample(rng)
+        if delay > 0:
+            time.sleep(delay)
+
+        if "Reply with ONLY a JSON object" in prompt:
+            return FakeMessage(json.dumps({
+                "protocol_summary": "Synthesize the top candidates, characterise them, and run in-vitro release assays.",
+                "next_steps": "Validate the lead compounds in a cell-viability panel.",
+            }))
+        return FakeMessage(f"Hypothesis {rng.randint(1, 10**6)}: the candidate carriers improve localized delivery.")
@@ -1 +1 @@
-# src/__init__.py
+# src/__init__.py
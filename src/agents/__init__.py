@@ -1,3 +1,3 @@
-# src/agents/__init__.py
-# Imports the main agent class for simplified access in other modules.
+# src/agents/__init__.py
+# Imports the main agent class for simplified access in other modules.
 from .scientist_agents import ScientistAgents
\ No newline at end of file
@@ -0,0 +1,129 @@
+import os
+import json
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, Optional, Tuple
+from dotenv import load_dotenv
+from src.models import ResearchQuery, PipelineResult
+from src.pipeline import run_direct_pipeline
+from src.tracing import export_trace
+from src.metrics import WORKFLOWS_STARTED, record_workflow, start_configured_exporters, export_metrics
+from src.tools.composio_client import get_composio_client
+
+# Load environment variables (API keys)
+load_dotenv()
+
+# --- Batch Mode ---
+# Runs many ResearchQuery jobs through the direct pipeline from one process. All jobs share the
+# process-wide Composio client and LLM. At most `max_pending` jobs are queued or running at any
+# time: reading the input blocks until a slot frees up (backpressure), and results are streamed
+# to the output file as they complete, so memory stays bounded however large the batch is.
+# Each batch starts by pruning expired Workbench payloads, so nightly sweeps do not fill the disk.
+
+DEFAULT_BATCH_WORKERS = 4
+
+
+def iter_research_queries(input_path: str) -> Iterator[Tuple[int, Optional[ResearchQuery], Optional[str]]]:
+    """
+    Lazily reads a JSONL file of ResearchQuery records.
+    Yields (line_number, query, None) for valid lines and (line_number, None, error) for invalid ones.
+    """
+    with open(input_path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, ResearchQuery(**json.loads(line)), None
+            except Exception as e:
+                yield line_number, None, f"Invalid ResearchQuery record: {e}"
+
+
+def _result_record(line_number: int, query: ResearchQuery, result: PipelineResult) -> Dict[str, Any]:
+    return {
+        "line": line_number,
+        "status": "completed",
+        "topic": query.topic,
+        "session_id": result.session_id,
+        "report_url": result.report_url,
+        "synthesis": result.synthesis.dict(),
+        "wall_clock_s": result.wall_clock_s,
+    }
+
+
+def run_batch(
+    input_path: str,
+    output_path: str,
+    workers: int = DEFAULT_BATCH_WORKERS,
+    max_pending: Optional[int] = None,
+    llm=None,
+) -> Dict[str, Any]:
+    """
+    Runs every ResearchQuery in `input_path` (JSONL) through the direct pipeline on a pool of
+    `workers` threads and appends one JSON line per job to `output_path`, in completion order.
+    Failed jobs are recorded with status 'failed' and do not stop the batch.
+    Returns counts of completed and failed jobs plus the total wall-clock time.
+    """
+    max_pending = max_pending or workers * 2
+    slots = threading.BoundedSemaphore(max_pending)
+    write_lock = threading.Lock()
+    counts = {"completed": 0, "failed": 0}
+    started = time.perf_counter()
+
+    print(f"--- Starting batch run: {input_path} -> {output_path} (workers={workers}, max_pending={max_pending}) ---")
+    start_configured_exporters()
+    pruned = get_composio_client().workbench.prune()
+    if pruned:
+        print(f"-> Pruned {pruned} expired Workbench payload(s)")
+
+    with open(output_path, "a", encoding="utf-8") as out:
+
+        def _write(record: Dict[str, Any]):
+            with write_lock:
+                counts[record["status"]] += 1
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+
+        def _run_job(line_number: int, query: ResearchQuery):
+            WORKFLOWS_STARTED.inc(mode="batch")
+            job_started = time.perf_counter()
+            try:
+                result = run_direct_pipeline(query, llm=llm, output_file=None)
+                record_workflow("batch", "completed", time.perf_counter() - job_started)
+                _write(_result_record(line_number, query, result))
+            except Exception as e:
+                record_workflow("batch", "failed", time.perf_counter() - job_started)
+                _write({"line": line_number, "status": "failed", "topic": query.topic, "error": str(e)})
+            finally:
+                slots.release()
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch-job") as executor:
+            for line_number, query, error in iter_research_queries(input_path):
+                if error:
+                    _write({"line": line_number, "status": "failed", "error": error})
+                    continue
+                slots.acquire()  # Backpressure: wait until fewer than max_pending jobs are in flight
+                executor.submit(_run_job, line_number, query)
+
+    summary = {**counts, "wall_clock_s": time.perf_counter() - started}
+    print(f"--- Batch run finished: {summary['completed']} completed, {summary['failed']} failed "
+          f"in {summary['wall_clock_s']:.1f}s ---")
+    export_trace()  # Chrome trace of every job, if TRACE_FILE is set
+    export_metrics()
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run many ResearchQuery jobs (JSONL) through the direct pipeline.")
+    parser.add_argument("input", help="Input JSONL file, one ResearchQuery record per line.")
+    parser.add_argument("output", help="Output JSONL file; one result record is appended per job.")
+    parser.add_argument("--workers", type=int, default=DEFAULT_BATCH_WORKERS, help="Number of concurrent jobs.")
+    parser.add_argument("--max-pending", type=int, default=None,
+                        help="Maximum jobs queued or running at once (default: 2 x workers).")
+    args = parser.parse_args()
+
+    if not os.getenv("GROQ_API_KEY") or not os.getenv("COMPOSIO_API_KEY"):
+        print("\nFATAL ERROR: Please set GROQ_API_KEY and COMPOSIO_API_KEY in your .env file.")
+    else:
+        run_batch(args.input, args.output, workers=args.workers, max_pending=args.max_pending)
@@ -0,0 +1,137 @@
+import os
+import json
+import time
+import shutil
+import tempfile
+import threading
+from urllib.parse import quote
+from typing import Any, Optional
+from src.paths import private_state_dir
+
+# --- Stage Checkpoints ---
+# The output of every completed workflow stage (plan, research Workbench keys, analysis JSON, ...)
+# is saved under the run's stable session ID, optionally tagged with a fingerprint of the inputs
+# it was computed from. If a run fails late in the chain, re-invoking it resumes after the last
+# completed stage; the direct pipeline also reuses any stage whose inputs a changed query did
+# not touch (see src.pipeline). CHECKPOINT_DIR moves the store; CHECKPOINTS_DISABLED=1 turns
+# resuming off.
+
+DEFAULT_CHECKPOINT_DIR_NAME = "checkpoints"  # Under the per-user STATE_ROOT (see src.paths)
+DEFAULT_CHECKPOINT_TTL_S = 7 * 24 * 3600  # Older checkpoints are ignored (the inputs may have gone stale)
+STALE_TEMP_FILE_AGE_S = 3600  # Temp files of interrupted writes older than this are removed by prune()
+
+
+class CheckpointStore:
+    """
+    Local JSON-file checkpoint store: one directory per session ID, one file per stage and
+    input fingerprint, so outputs computed from different inputs are kept side by side.
+    Writes are atomic (temp file + rename), so a crash never leaves a half-written checkpoint.
+    Safe to share between threads and processes.
+    """
+    def __init__(self, root_dir: Optional[str] = None, ttl_s: Optional[float] = None):
+        self.root_dir = root_dir or os.getenv("CHECKPOINT_DIR") or private_state_dir(DEFAULT_CHECKPOINT_DIR_NAME)
+        self.ttl_s = ttl_s if ttl_s is not None else float(os.getenv("CHECKPOINT_TTL_S", DEFAULT_CHECKPOINT_TTL_S))
+        os.makedirs(self.root_dir, mode=0o700, exist_ok=True)
+
+    def _session_dir(self, session_id: str) -> str:
+        return os.path.join(self.root_dir, quote(session_id, safe=""))
+
+    def _path(self, session_id: str, stage: str, fingerprint: str = "") -> str:
+        name = f"{stage}-{fingerprint}" if fingerprint else stage
+        return os.path.join(self._session_dir(session_id), f"{quote(name, safe='')}.json")
+
+    def save(self, session_id: str, stage: str, output: Any, fingerprint: str = ""):
+        """Persists a stage's JSON-serialisable output (computed from the inputs `fingerprint` identifies)."""
+        directory = self._session_dir(session_id)
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"stage": stage, "saved_at": time.time(), "output": output}, f)
+            os.replace(tmp_path, self._path(session_id, stage, fingerprint))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def load(self, session_id: str, stage: str, fingerprint: str = "", max_age_s: Optional[float] = None) -> Optional[Any]:
+        """
+        Returns the saved output of a stage, or None if there is no usable checkpoint.
+        `max_age_s` tightens the store's TTL (e.g. to a tool's result-freshness window).
+        """
+        try:
+            with open(self._path(session_id, stage, fingerprint), "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        age_s = time.time() - record.get("saved_at", 0)
+        if age_s > self.ttl_s:
+            self.discard(session_id, stage, fingerprint)  # Expired for every caller
+            return None
+        if max_age_s is not None and age_s > max_age_s:
+            return None
+        return record.get("output")
+
+    def discard(self, session_id: str, stage: str, fingerprint: str = ""):
+        """Removes one stage's checkpoint (e.g. when its output turned out to be unusable)."""
+        try:
+            os.unlink(self._path(session_id, stage, fingerprint))
+        except FileNotFoundError:
+            pass
+
+    def clear(self, session_id: str):
+        """Removes every checkpoint of a session."""
+        shutil.rmtree(self._session_dir(session_id), ignore_errors=True)
+
+    def prune(self) -> int:
+        """
+        Removes checkpoints older than the store's TTL, temp files left by interrupted writes, and
+        session directories left empty. Returns the number of checkpoints removed.
+        """
+        now = time.time()
+        removed = 0
+        for session in os.listdir(self.root_dir):
+            directory = os.path.join(self.root_dir, session)
+            if not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                path = os.path.join(directory, name)
+                try:
+                    # Files are only ever replaced whole, so the mtime is the save time
+                    age_s = now - os.path.getmtime(path)
+                    if name.startswith(".tmp-"):
+                        if age_s > STALE_TEMP_FILE_AGE_S:
+                            os.unlink(path)
+                    elif age_s > self.ttl_s:
+                        os.unlink(path)
+                        removed += 1
+                except OSError:
+                    continue
+            try:
+                os.rmdir(directory)  # Only succeeds once the session has no checkpoints left
+            except OSError:
+                pass
+        return removed
+
+
+# --- Process-wide Store ---
+_checkpoint_store: Optional[CheckpointStore] = None
+_checkpoint_store_lock = threading.Lock()
+
+def get_checkpoint_store() -> Optional[CheckpointStore]:
+    """
+    Returns the shared CheckpointStore, or None when CHECKPOINTS_DISABLED is set.
+    Expired checkpoints are pruned once, when the store is created.
+    """
+    global _checkpoint_store
+    if os.getenv("CHECKPOINTS_DISABLED", "").lower() in ("1", "true"):
+        return None
+    if _checkpoint_store is None:
+        with _checkpoint_store_lock:
+            if _checkpoint_store is None:
+                _checkpoint_store = CheckpointStore()
+                # Checkpoints are kept for reuse after success too, so expired ones are removed here
+                pruned = _checkpoint_store.prune()
+                if pruned:
+                    print(f"-> Pruned {pruned} expired checkpoint(s)")
+    return _checkpoint_store
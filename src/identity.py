@@ -0,0 +1,47 @@
+import re
+import json
+import hashlib
+from typing import Any, Dict, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.models import ResearchQuery
+
+# --- Stable Content Identity ---
+# Python's hash() is salted per process (PYTHONHASHSEED), so IDs built from it differ between
+# workers and runs. Everything that needs a cross-process identity (session IDs, cache keys,
+# report URLs) derives it from BLAKE2b over canonical JSON instead.
+
+DEFAULT_DIGEST_SIZE = 16  # bytes -> 32 hex characters
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def canonical_json(obj: Any) -> str:
+    """Deterministic JSON encoding: sorted keys, no insignificant whitespace, UTF-8 preserved."""
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def stable_digest(obj: Any, digest_size: int = DEFAULT_DIGEST_SIZE) -> str:
+    """Hex BLAKE2b digest of the canonical JSON form of `obj`; identical in every process."""
+    return hashlib.blake2b(canonical_json(obj).encode("utf-8"), digest_size=digest_size).hexdigest()
+
+
+def _normalise_text(text: str) -> str:
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def canonical_query(query: "ResearchQuery") -> Dict[str, Any]:
+    """
+    Normalised form of a ResearchQuery: whitespace-collapsed text fields and a sorted,
+    de-duplicated keyword list, so cosmetic differences map to the same identity.
+    """
+    return {
+        "topic": _normalise_text(query.topic),
+        "target_output": _normalise_text(query.target_output),
+        "keywords": sorted({_normalise_text(k) for k in query.keywords if k.strip()}),
+    }
+
+
+def query_fingerprint(query: "ResearchQuery") -> str:
+    """Stable identity of a ResearchQuery."""
+    return stable_digest(canonical_query(query))
@@ -0,0 +1,138 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import warnings
+import threading
+from typing import Any, Dict, Optional
+from src.paths import private_state_dir
+
+# --- Persistent LLM Response Cache ---
+# Exact-match cache keyed by model name + normalised prompt + generation parameters, stored in
+# SQLite so reruns and retries of the same topic (even from other processes) skip the LLM call.
+# Entries are evicted least-recently-used once the stored responses exceed `max_bytes`.
+
+DEFAULT_LLM_CACHE_FILE = "llm_cache.sqlite"  # In the per-user STATE_ROOT (see src.paths)
+DEFAULT_LLM_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalise_prompt(prompt: str) -> str:
+    """Collapses whitespace runs and trims, so formatting-only differences still hit the cache."""
+    return _WHITESPACE.sub(" ", prompt).strip()
+
+
+class LLMResponseCache:
+    """
+    SQLite-backed exact-match response cache with size-based LRU eviction and hit/miss counters.
+    Safe to share between threads; several processes may share the same database file.
+    """
+    def __init__(self, path: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.path = path or os.getenv("LLM_CACHE_PATH") or os.path.join(private_state_dir("llm_cache"), DEFAULT_LLM_CACHE_FILE)
+        self.max_bytes = max_bytes or int(os.getenv("LLM_CACHE_MAX_BYTES", DEFAULT_LLM_CACHE_MAX_BYTES))
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, response TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model_name: str, prompt: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Stable cache key over model name, normalised prompt and generation parameters."""
+        material = json.dumps(
+            {"model": model_name, "prompt": normalise_prompt(prompt), "params": params or {}},
+            sort_keys=True, default=str,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            return row[0]
+
+    def put(self, key: str, response: str):
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, response, size, time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drops least-recently-used entries until the cache fits in max_bytes (caller holds the lock)."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall():
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "size_bytes": size,
+        }
+
+
+def install_langchain_cache(cache: LLMResponseCache) -> bool:
+    """
+    Registers the cache as LangChain's global LLM cache, which ChatGroq (and therefore every
+    CrewAI agent and the direct pipeline) consults before calling the model.
+    Returns False if no compatible LangChain version is installed.
+    """
+    try:
+        from langchain_core.caches import BaseCache
+        from langchain_core.globals import set_llm_cache
+        from langchain_core.load import dumps, loads
+    except ImportError:
+        return False
+
+    class _LangChainResponseCache(BaseCache):
+        # LangChain's llm_string already encodes the model name and its parameters
+        def lookup(self, prompt: str, llm_string: str):
+            raw = cache.get(cache.make_key(llm_string, prompt))
+            if raw is None:
+                return None
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")  # langchain_core.load is flagged as beta
+                return loads(raw)
+
+        def update(self, prompt: str, llm_string: str, return_val):
+            cache.put(cache.make_key(llm_string, prompt), dumps(list(return_val)))
+
+        def clear(self, **kwargs: Any):
+            cache.clear()
+
+    set_llm_cache(_LangChainResponseCache())
+    return True
@@ -0,0 +1,370 @@
+import os
+import bisect
+import inspect
+import tempfile
+import threading
+import weakref
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# --- Prometheus-style Metrics ---
+# Process-wide counters and histograms for workflows, tool calls, Workbench traffic, LLM tokens
+# and cache hit ratios, rendered in the Prometheus text exposition format (v0.0.4).
+# Two optional exporters: METRICS_PORT serves them on http://127.0.0.1:<port>/metrics, and
+# METRICS_FILE rewrites a text file at the end of every workflow or batch run (e.g. for the node_exporter
+# textfile collector). Standard library only; recording a value is a dict update under a lock.
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_LATENCY_BUCKETS_S = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+WORKFLOW_DURATION_BUCKETS_S = (1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+
+LabelValues = Tuple[str, ...]
+StatsReader = Callable[[], Dict[str, Any]]
+StatsRef = Callable[[], Optional[StatsReader]]  # Returns None once the stats' owner is gone
+
+# Fields read from registered stats() callables at scrape time: (field, metric suffix, type, help)
+CACHE_FIELDS = (
+    ("hits", "cache_hits_total", "counter", "Cache lookups answered from the cache."),
+    ("misses", "cache_misses_total", "counter", "Cache lookups that missed."),
+    ("hit_ratio", "cache_hit_ratio", "gauge", "Hits / lookups since process start."),
+)
+RATE_LIMIT_FIELDS = (
+    ("queue_depth", "rate_limit_queue_depth", "gauge", "Callers waiting for a rate-limit slot or token."),
+    ("max_queue_depth", "rate_limit_max_queue_depth", "gauge", "Largest number of callers ever waiting at once."),
+    ("in_flight", "rate_limit_in_flight", "gauge", "Calls holding an in-flight slot."),
+    ("acquired", "rate_limit_acquired_total", "counter", "Calls admitted by the rate limiter."),
+    ("rejected", "rate_limit_rejected_total", "counter", "Calls that timed out waiting for the rate limiter."),
+    ("total_wait_s", "rate_limit_wait_seconds_total", "counter", "Time spent waiting for the rate limiter."),
+    ("max_wait_s", "rate_limit_max_wait_seconds", "gauge", "Longest single wait for the rate limiter."),
+)
+POOL_FIELDS = (
+    ("workers", "pool_workers", "gauge", "Configured number of pool workers."),
+    ("live_workers", "pool_live_workers", "gauge", "Pool workers running or starting."),
+    ("idle_workers", "pool_idle_workers", "gauge", "Pool workers waiting for a job."),
+    ("idle_connections", "pool_idle_connections", "gauge", "Pooled keep-alive connections not in use."),
+    ("workers_started", "pool_workers_started_total", "counter", "Pool worker processes started."),
+    ("jobs", "pool_jobs_total", "counter", "Jobs run by the pool."),
+    ("timeouts", "pool_timeouts_total", "counter", "Jobs that exceeded their wall-clock limit."),
+    ("crashes", "pool_crashes_total", "counter", "Jobs whose worker died."),
+    ("recycled", "pool_workers_recycled_total", "counter", "Workers replaced after a failed job or their job quota."),
+    ("requests", "pool_requests_total", "counter", "Requests sent through the pool."),
+    ("connections_created", "pool_connections_created_total", "counter", "Connections opened by the pool."),
+    ("connections_reused", "pool_connections_reused_total", "counter", "Requests served on a reused connection."),
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value != value:
+        return "NaN"
+    if value in (float("inf"), float("-inf")):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Metric '{self.name}' expects labels {self.labelnames}, got {tuple(labels)}.")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}", *self._samples()]
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing total, one series per label combination."""
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any):
+        if amount < 0:
+            raise ValueError("Counters can only increase.")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in values]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram with _bucket/_sum/_count series, as Prometheus expects."""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS_S):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelValues, List[Any]] = {}  # key -> [bucket counts (+Inf last), sum]
+
+    def observe(self, value: float, **labels: Any):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, **labels: Any) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return sum(series[0]) if series else 0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            series = sorted((key, (list(counts), total)) for key, (counts, total) in self._series.items())
+        lines = []
+        bucket_labels = self.labelnames + ("le",)
+        for key, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(bucket_labels, key + (_format_value(bound),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+def _weak_reader(stats: Callable) -> StatsRef:
+    # A bound stats() method is held weakly, so registering it does not keep its object alive
+    if inspect.ismethod(stats):
+        return weakref.WeakMethod(stats)
+    return lambda: stats
+
+
+class MetricsRegistry:
+    """
+    Holds the process's metrics and renders them. Caches (TTLCache, LLMResponseCache), worker and
+    connection pools, and the tool rate limiter are registered with their `stats()` callables,
+    which are read at scrape time. Each name shows its most recent registration whose owner is
+    still alive and has not unregistered it (e.g. a shut-down ComposioClient).
+    """
+    def __init__(self, namespace: str = "co_scientist"):
+        self.namespace = namespace
+        self._metrics: List[_Metric] = []
+        self._caches: Dict[str, List[StatsRef]] = {}
+        self._pools: Dict[str, List[StatsRef]] = {}
+        self._rate_limiters: Dict[str, List[StatsRef]] = {}  # One name: there is one tool rate limiter
+        self._lock = threading.Lock()
+
+    def _add(self, metric: _Metric) -> Any:
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(f"{self.namespace}_{name}", documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS_S) -> Histogram:
+        return self._add(Histogram(f"{self.namespace}_{name}", documentation, labelnames, buckets))
+
+    def _register(self, table: Dict[str, List[StatsRef]], name: str, stats: Callable):
+        with self._lock:
+            refs = [ref for ref in table.get(name, ()) if ref() is not None and ref() != stats]
+            table[name] = refs + [_weak_reader(stats)]
+
+    def register_cache(self, cache_name: str, stats: StatsReader):
+        """Exposes a cache's hits/misses/hit ratio; registering the same name again supersedes it."""
+        self._register(self._caches, cache_name, stats)
+
+    def register_pool(self, pool_name: str, stats: StatsReader):
+        """
+        Exposes a worker or connection pool (SandboxPool, the HTTP transports); the POOL_FIELDS its
+        stats contain are rendered. Registering the same name again supersedes it.
+        """
+        self._register(self._pools, pool_name, stats)
+
+    def register_rate_limiter(self, stats: Callable[[], Dict[str, Dict[str, Any]]]):
+        """Exposes RateLimiter.stats() per tool slug: queue depth, in-flight calls and wait times."""
+        self._register(self._rate_limiters, "", stats)
+
+    def unregister(self, *stats: Callable):
+        """Removes every registration of the given stats() callables."""
+        with self._lock:
+            for table in (self._caches, self._pools, self._rate_limiters):
+                for name, refs in list(table.items()):
+                    table[name] = [ref for ref in refs if ref() is not None and ref() not in stats]
+                    if not table[name]:
+                        del table[name]
+
+    @staticmethod
+    def _current(table: Dict[str, List[StatsRef]]) -> List[Tuple[str, StatsReader]]:
+        """The newest live reader of each name (call with the lock held)."""
+        current = []
+        for name, refs in sorted(table.items()):
+            live = [read for read in (ref() for ref in refs) if read is not None]
+            if live:
+                current.append((name, live[-1]))
+        return current
+
+    def _family_lines(self, label: str, rows: Dict[str, Dict[str, Any]], fields, always: bool = False) -> List[str]:
+        lines = []
+        for field, suffix, kind, documentation in fields:
+            samples = [(value, stats.get(field, 0)) for value, stats in sorted(rows.items()) if always or field in stats]
+            if not samples and not always:
+                continue
+            name = f"{self.namespace}_{suffix}"
+            lines += [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+            lines += [f'{name}{{{label}="{_escape(value)}"}} {_format_value(v)}' for value, v in samples]
+        return lines
+
+    def _stats_lines(self) -> List[str]:
+        with self._lock:
+            caches = self._current(self._caches)
+            pools = self._current(self._pools)
+            rate_limiters = self._current(self._rate_limiters)
+
+        def _read(sources) -> Dict[str, Any]:
+            stats = {}
+            for source_name, read in sources:
+                try:
+                    stats[source_name] = read()
+                except Exception:  # A closed cache or pool must not break the scrape
+                    continue
+            return stats
+
+        lines = self._family_lines("cache", _read(caches), CACHE_FIELDS, always=True)
+        lines += self._family_lines("pool", _read(pools), POOL_FIELDS)
+        if rate_limiters:
+            lines += self._family_lines("tool_slug", _read(rate_limiters).get("", {}), RATE_LIMIT_FIELDS)
+        return lines
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics)
+        lines: List[str] = []
+        for metric in metrics:
+            lines += metric.render()
+        lines += self._stats_lines()
+        return "\n".join(lines) + "\n"
+
+    def write_text_file(self, path: str) -> str:
+        """Writes the metrics atomically (temp file + rename), so collectors never read a partial file."""
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.render())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return path
+
+
+METRICS = MetricsRegistry()
+
+WORKFLOWS_STARTED = METRICS.counter("workflows_started_total", "Workflow runs started.", ("mode",))
+WORKFLOWS_COMPLETED = METRICS.counter("workflows_completed_total", "Workflow runs that completed.", ("mode",))
+WORKFLOWS_FAILED = METRICS.counter("workflows_failed_total", "Workflow runs that failed.", ("mode",))
+WORKFLOW_DURATION = METRICS.histogram(
+    "workflow_duration_seconds", "End-to-end workflow run time.", ("mode", "status"), WORKFLOW_DURATION_BUCKETS_S
+)
+TOOL_CALL_DURATION = METRICS.histogram(
+    "tool_call_duration_seconds", "Composio tool call latency per tool slug (status: completed/cached/failed).",
+    ("tool_slug", "status"),
+)
+WORKBENCH_BYTES_STORED = METRICS.counter("workbench_stored_bytes_total", "Payload bytes written to the Workbench.")
+WORKBENCH_BYTES_RETRIEVED = METRICS.counter("workbench_retrieved_bytes_total", "Payload bytes read from the Workbench.")
+LLM_TOKENS = METRICS.counter("llm_tokens_total", "LLM tokens by direction (in = prompt, out = completion).",
+                             ("model", "direction"))
+LLM_CALL_DURATION = METRICS.histogram("llm_call_duration_seconds", "LLM call latency.", ("model",))
+
+
+def record_workflow(mode: str, status: str, duration_s: float):
+    """Counts a finished workflow run ('completed' or 'failed') and its duration."""
+    (WORKFLOWS_COMPLETED if status == "completed" else WORKFLOWS_FAILED).inc(mode=mode)
+    WORKFLOW_DURATION.observe(duration_s, mode=mode, status=status)
+
+
+def record_tool_call(tool_slug: str, status: str, duration_s: float):
+    TOOL_CALL_DURATION.observe(duration_s, tool_slug=tool_slug, status=status)
+
+
+# --- Exporters ---
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = METRICS
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Scrapes are frequent; keep them out of the workflow log
+
+
+_metrics_server: Optional[ThreadingHTTPServer] = None
+_metrics_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: int = 0, host: str = "127.0.0.1",
+                         registry: MetricsRegistry = METRICS) -> ThreadingHTTPServer:
+    """Serves GET /metrics from a daemon thread and returns the server (port 0 picks a free port)."""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
+
+
+def start_configured_exporters() -> Optional[ThreadingHTTPServer]:
+    """Starts the /metrics endpoint once per process if METRICS_PORT is set; returns it (or None)."""
+    global _metrics_server
+    port = os.getenv("METRICS_PORT")
+    if not port:
+        return None
+    with _metrics_server_lock:
+        if _metrics_server is None:
+            _metrics_server = start_metrics_server(int(port), host=os.getenv("METRICS_HOST", "127.0.0.1"))
+            print(f"-> Metrics available at http://{_metrics_server.server_address[0]}:{_metrics_server.server_port}/metrics")
+    return _metrics_server
+
+
+def export_metrics(path: Optional[str] = None) -> Optional[str]:
+    """Writes the metrics text file to `path` (default: METRICS_FILE); returns the path, or None if unset."""
+    path = path or os.getenv("METRICS_FILE")
+    if not path:
+        return None
+    return METRICS.write_text_file(path)
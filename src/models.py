@@ -1,24 +1,51 @@
-from pydantic import BaseModel, Field
-from typing import List, Dict, Any
-
-# --- Input Models ---
-class ResearchQuery(BaseModel):
-    """Schema for the initial user request, validating user input."""
-    topic: str = Field(description="The scientific topic or hypothesis to be investigated.")
-    target_output: str = Field(description="The desired deliverable (e.g., 'Draft full experimental protocol').")
-    keywords: List[str] = Field(description="List of core keywords for literature search.")
-
-# --- Intermediate Tool Models ---
-class ToolExecutionRequest(BaseModel):
-    """Schema for a single tool request within the Multi-Execute call."""
-    tool_slug: str = Field(description="The unique slug for the Composio tool (e.g., arxiv_search_tool_slug).")
-    arguments: Dict[str, Any] = Field(description="Key-value arguments required by the tool's API.")
-
-# --- Final Output Model (The official deliverable schema) ---
-class FinalSynthesis(BaseModel):
-    """Schema for the final published scientific report, enforcing structured output."""
-    hypothesis: str = Field(description="The finalized, testable scientific hypothesis.")
-    protocol_summary: str = Field(description="A brief summary of the proposed experimental steps.")
-    analysis_findings: str = Field(description="The core metrics and conclusions from the remote data analysis.")
-    prior_art_reference_links: List[str] = Field(description="List of URLs or Workbench Keys for key prior art documents.")
-    next_steps: str = Field(description="Recommended next steps for human researchers (e.g., in-vitro testing).")
+from pydantic import BaseModel, Field
+from typing import List, Dict, Any
+
+# --- Input Models ---
+class ResearchQuery(BaseModel):
+    """Schema for the initial user request, validating user input."""
+    topic: str = Field(description="The scientific topic or hypothesis to be investigated.")
+    target_output: str = Field(description="The desired deliverable (e.g., 'Draft full experimental protocol').")
+    keywords: List[str] = Field(description="List of core keywords for literature search.")
+
+# --- Intermediate Tool Models ---
+class ToolExecutionRequest(BaseModel):
+    """Schema for a single tool request within the Multi-Execute call."""
+    tool_slug: str = Field(description="The unique slug for the Composio tool (e.g., arxiv_search_tool_slug).")
+    arguments: Dict[str, Any] = Field(description="Key-value arguments required by the tool's API.")
+
+class WorkflowPlan(BaseModel):
+    """Schema for the result of COMPOSIO_CREATE_PLAN."""
+    session_id: str = Field(description="The Composio session ID that ties the workflow's tool calls together.")
+    workflow_steps: List[str] = Field(description="The ordered, human-readable workflow steps.")
+
+class ResearchResult(BaseModel):
+    """Schema for the result of the parallel research (Multi-Execute) stage."""
+    workbench_keys: List[str] = Field(description="Workbench Keys under which the raw research payloads were stored.")
+    results: List[Dict[str, Any]] = Field(description="Per-request execution results, in request order.")
+
+class AnalysisResult(BaseModel):
+    """Schema for the structured output of the remote data analysis script."""
+    final_clean_compounds: int = Field(description="Number of compounds that passed cleaning and risk filtering.")
+    critical_risk_flag: bool = Field(description="True if any critical risk was found in the analysed data.")
+    summary: str = Field(description="Human-readable summary of the analysis.")
+
+# --- Final Output Model (The official deliverable schema) ---
+class FinalSynthesis(BaseModel):
+    """Schema for the final published scientific report, enforcing structured output."""
+    hypothesis: str = Field(description="The finalized, testable scientific hypothesis.")
+    protocol_summary: str = Field(description="A brief summary of the proposed experimental steps.")
+    analysis_findings: str = Field(description="The core metrics and conclusions from the remote data analysis.")
+    prior_art_reference_links: List[str] = Field(description="List of URLs or Workbench Keys for key prior art documents.")
+    next_steps: str = Field(description="Recommended next steps for human researchers (e.g., in-vitro testing).")
+
+class PipelineResult(BaseModel):
+    """Schema for the outcome of a direct (non-agentic) pipeline run."""
+    session_id: str = Field(description="The Composio session ID of the run.")
+    synthesis: FinalSynthesis = Field(description="The published final synthesis.")
+    report_url: str = Field(description="URL of the published report.")
+    stage_timings: Dict[str, float] = Field(default_factory=dict, description="Duration of each pipeline stage in seconds.")
+    critical_path: List[str] = Field(default_factory=list, description="Stages on the critical (longest) dependency path.")
+    critical_path_s: float = Field(default=0.0, description="Total duration of the critical path in seconds.")
+    wall_clock_s: float = Field(default=0.0, description="End-to-end wall-clock time of the run in seconds.")
+    reused_stages: List[str] = Field(default_factory=list, description="Stages and research requests reused from an earlier run.")
@@ -0,0 +1,37 @@
+import os
+import stat
+import getpass
+import tempfile
+
+# --- Per-User Local State ---
+# Checkpoints, the LLM response cache and the Workbench default to directories under the system
+# temp dir. A fixed shared path there could be pre-created (or symlinked) by another local user,
+# who could then read the stored outputs or plant entries the workflow trusts (LLM cache entries
+# are deserialised with langchain's loads()). The defaults therefore live in a per-user root
+# created with mode 0o700, and are refused unless they are real directories owned by this user.
+
+_USER = str(os.getuid()) if hasattr(os, "getuid") else getpass.getuser()
+STATE_ROOT = os.path.join(tempfile.gettempdir(), f"ai_co_scientist-{_USER}")
+
+
+def ensure_private_dir(path: str) -> str:
+    """
+    Creates `path` with mode 0o700 if missing. Raises PermissionError if it is a symlink, is not
+    a directory, or (on POSIX) belongs to another user or is writable by group or others.
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode):
+        raise PermissionError(f"{path} is not a directory (or is a symlink); refusing to store state in it.")
+    if hasattr(os, "getuid"):
+        if st.st_uid != os.getuid():
+            raise PermissionError(f"{path} is owned by another user; refusing to store state in it.")
+        if st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            raise PermissionError(f"{path} is writable by other users; refusing to store state in it.")
+    return path
+
+
+def private_state_dir(name: str) -> str:
+    """The per-user default directory `name` under STATE_ROOT, created and verified (with the root)."""
+    ensure_private_dir(STATE_ROOT)
+    return ensure_private_dir(os.path.join(STATE_ROOT, name))
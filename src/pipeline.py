@@ -0,0 +1,322 @@
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from src.identity import canonical_query, stable_digest
+from src.models import (
+    ResearchQuery, FinalSynthesis, PipelineResult, WorkflowPlan, ResearchResult, AnalysisResult,
+    ToolExecutionRequest,
+)
+from src.tasks import ScientistTasks
+from src.scheduler import DagScheduler
+from src.checkpoints import CheckpointStore, get_checkpoint_store
+from src.tools.composio_client import get_composio_client, TOOL_SLUGS
+from src.tools.custom_tools import (
+    plan_workflow, session_id_for_query, research_request_fingerprint, collect_parallel_research,
+    analyze_workbench_data, publish_synthesis, PRIMARY_TOOL_SLUGS, ANALYSIS_SCRIPT_TEMPLATE,
+)
+from src.risk_engine import RiskThresholds
+
+# --- Direct (Deterministic) Pipeline ---
+# The ScientistTasks already fix which tool each agent must call, so this mode runs the
+# four tools as a typed pipeline and only calls the LLM where text is actually generated:
+# once for the hypothesis and once for the final synthesis.
+# Stages run on a DAG scheduler, so e.g. literature retrieval (which only needs the query)
+# overlaps with planning, and analysis overlaps with hypothesis generation.
+
+REPORT_OUTPUT_FILE = "final_scientific_report.txt"
+
+HYPOTHESIS_PROMPT = (
+    "You are the Lead Principal Investigator. Formalize the following research request into ONE novel, "
+    "testable scientific hypothesis. Reply with the hypothesis only.\n"
+    "Topic: {topic}\n"
+    "Desired output: {target_output}\n"
+    "Workflow plan: {workflow_steps}"
+)
+SYNTHESIS_PROMPT = (
+    "You are the Journal Editor. Synthesize the hypothesis, the parallel research summary and the "
+    "structured analysis result, and draft a detailed experimental protocol based on the consolidated data.\n"
+    "Hypothesis: {hypothesis}\n"
+    "Desired output: {target_output}\n"
+    "Research summary: {research_summary}\n"
+    "Workbench Keys: {workbench_keys}\n"
+    "Analysis result: {analysis}\n"
+    "Reply with ONLY a JSON object with the keys: hypothesis, protocol_summary, analysis_findings, "
+    "prior_art_reference_links (list of strings), next_steps."
+)
+
+# --- Incremental Stages ---
+# Every stage but the final publish is checkpointed under the session ID (see src.checkpoints),
+# keyed by a fingerprint of exactly what the stage reads: the query fields and the parts of
+# upstream outputs that enter its tool call or prompt. Rerunning a query after an edit (or a
+# failure) therefore only recomputes the stages whose inputs changed; e.g. adding a keyword
+# re-issues only the PubChem request and recomputes analysis and synthesis.
+# Research is tracked per request, each reusable while its tool's result TTL allows and its
+# Workbench payload still exists. Each fingerprint is also salted with the stage's version: the
+# prompt template, analysis script, risk thresholds or execution mode it was produced with, plus
+# STAGE_CODE_VERSION, so outputs of older code are never reused.
+
+STAGE_CODE_VERSION = 1  # Bump when a stage's behaviour changes in a way its version salt misses
+
+# (output -> JSON, JSON -> output) per stage
+STAGE_CODECS: Dict[str, Tuple[Callable[[Any], Any], Callable[[Any], Any]]] = {
+    "plan": (lambda plan: plan.dict(), lambda data: WorkflowPlan(**data)),
+    "hypothesis": (lambda text: {"text": text}, lambda data: data["text"]),
+    "analysis": (lambda analysis: analysis.dict(), lambda data: AnalysisResult(**data)),
+    "synthesis": (lambda synthesis: synthesis.dict(), lambda data: FinalSynthesis(**data)),
+}
+
+# What each stage reads: canonical query fields, projections of its upstream outputs, whether
+# its output depends on the LLM, and the code-side version of the stage (read when the stage
+# runs). Keep in step with the prompts and tool calls below.
+STAGE_DEPENDENCIES: Dict[str, Dict[str, Any]] = {
+    "plan": {"fields": ("topic",), "version": lambda: PRIMARY_TOOL_SLUGS},
+    "hypothesis": {
+        "fields": ("topic", "target_output"),
+        "inputs": {"plan": lambda plan: plan.workflow_steps},
+        "llm": True,
+        "version": lambda: HYPOTHESIS_PROMPT,
+    },
+    "analysis": {
+        "inputs": {"research": lambda research: research.workbench_keys},
+        # The simulated Remote Bash tool returns canned output, so its results must not be reused in the sandbox
+        "version": lambda: [
+            ANALYSIS_SCRIPT_TEMPLATE,
+            RiskThresholds()._asdict(),
+            "sandbox" if get_composio_client().sandbox_enabled else "simulated",
+        ],
+    },
+    "synthesis": {
+        "fields": ("target_output",),
+        "inputs": {
+            "hypothesis": lambda hypothesis: hypothesis,
+            "research": lambda research: [
+                research.workbench_keys, [res.get("output_summary") for res in research.results]
+            ],
+            "analysis": lambda analysis: analysis.dict(),
+        },
+        "llm": True,
+        "version": lambda: SYNTHESIS_PROMPT,
+    },
+}
+
+RESEARCH_REQUEST_STAGE = "research-request"
+
+
+def _llm_identity(llm) -> str:
+    return getattr(llm, "model_name", None) or getattr(llm, "model", None) or type(llm).__name__
+
+
+def stage_fingerprint(stage: str, research_query: ResearchQuery, inputs: Dict[str, Any], llm=None) -> str:
+    """Digest of everything `stage` reads (see STAGE_DEPENDENCIES); equal fingerprints mean equal outputs."""
+    dependencies = STAGE_DEPENDENCIES[stage]
+    query = canonical_query(research_query)
+    return stable_digest({
+        "stage": stage,
+        "fields": {field: query[field] for field in dependencies.get("fields", ())},
+        "inputs": {name: project(inputs[name]) for name, project in dependencies.get("inputs", {}).items()},
+        "llm": _llm_identity(llm) if dependencies.get("llm") else None,
+        "version": [STAGE_CODE_VERSION, dependencies["version"]()],
+    })
+
+
+def _incremental(
+    checkpoints: CheckpointStore,
+    session_id: str,
+    stage: str,
+    research_query: ResearchQuery,
+    llm,
+    func: Callable[..., Any],
+    reused: List[str],
+) -> Callable[..., Any]:
+    """Wraps a stage so it returns the saved output for unchanged inputs, and saves it otherwise."""
+    encode, decode = STAGE_CODECS[stage]
+
+    def _run(**inputs: Any) -> Any:
+        fingerprint = stage_fingerprint(stage, research_query, inputs, llm)
+        saved = checkpoints.load(session_id, stage, fingerprint)
+        if saved is not None:
+            try:
+                output = decode(saved)
+            except Exception:  # Written by an incompatible version: recompute
+                checkpoints.discard(session_id, stage, fingerprint)
+            else:
+                print(f"-> Reusing stage '{stage}': its inputs are unchanged (session {session_id})")
+                reused.append(stage)
+                return output
+
+        output = func(**inputs)
+        checkpoints.save(session_id, stage, encode(output), fingerprint)
+        return output
+    return _run
+
+
+def _incremental_research(
+    checkpoints: CheckpointStore,
+    session_id: str,
+    requests: List[ToolExecutionRequest],
+    reused: List[str],
+) -> ResearchResult:
+    """Parallel research that only re-issues requests without a fresh, still-stored earlier result."""
+    client = get_composio_client()
+    fingerprints = [research_request_fingerprint(req) for req in requests]
+    # Results are only reused from the same backend (e.g. not simulated results once a real API key is set)
+    version = [STAGE_CODE_VERSION, type(client.backend).__name__]
+    checkpoint_keys = [stable_digest([fingerprint, version]) for fingerprint in fingerprints]
+    reuse: Dict[str, Dict[str, Any]] = {}
+    for request, fingerprint, checkpoint_key in zip(requests, fingerprints, checkpoint_keys):
+        # Tools without a result TTL are never reused (live or side-effecting calls)
+        max_age_s = client.result_ttls_s.get(TOOL_SLUGS.get(request.tool_slug, request.tool_slug), 0)
+        saved = checkpoints.load(session_id, RESEARCH_REQUEST_STAGE, checkpoint_key, max_age_s=max_age_s)
+        if saved and saved.get("status") == "completed" and client.workbench.exists(saved.get("workbench_key", "")):
+            reuse[fingerprint] = saved
+            reused.append(f"research:{request.tool_slug}")
+
+    research = collect_parallel_research(session_id, requests, reuse=reuse)
+    for checkpoint_key, result in zip(checkpoint_keys, research.results):
+        if result.get("status") == "completed" and not result.get("reused"):
+            checkpoints.save(session_id, RESEARCH_REQUEST_STAGE, result, checkpoint_key)
+    return research
+
+
+def _generate(llm, prompt: str) -> str:
+    """Runs one LLM completion and returns its text."""
+    response = llm.invoke(prompt)
+    # LangChain chat models return a message object; plain callables may return a string
+    return getattr(response, "content", response)
+
+
+def _extract_json_object(text: str) -> Dict[str, Any]:
+    """Parses the first JSON object in an LLM response, tolerating surrounding prose or code fences."""
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        raise ValueError("LLM response did not contain a JSON object.")
+    return json.loads(text[start:end + 1])
+
+
+def generate_hypothesis(llm, query: ResearchQuery, plan: WorkflowPlan) -> str:
+    """LLM step 1 (Hypothesis Planner): formalise the query into a testable hypothesis."""
+    prompt = HYPOTHESIS_PROMPT.format(
+        topic=query.topic, target_output=query.target_output, workflow_steps=plan.workflow_steps
+    )
+    return _generate(llm, prompt).strip()
+
+
+def generate_synthesis(
+    llm,
+    query: ResearchQuery,
+    hypothesis: str,
+    research: ResearchResult,
+    analysis: AnalysisResult,
+) -> FinalSynthesis:
+    """LLM step 2 (Publication Editor): draft the protocol and the FinalSynthesis report."""
+    prompt = SYNTHESIS_PROMPT.format(
+        hypothesis=hypothesis,
+        target_output=query.target_output,
+        research_summary=[res.get("output_summary") for res in research.results],
+        workbench_keys=json.dumps(research.workbench_keys),
+        analysis=analysis.json(),
+    )
+    fields = {
+        "hypothesis": hypothesis,
+        "analysis_findings": analysis.summary,
+        "prior_art_reference_links": research.workbench_keys,
+    }
+    fields.update(_extract_json_object(_generate(llm, prompt)))
+    return FinalSynthesis(**fields)
+
+
+def build_pipeline_graph(
+    research_query: ResearchQuery,
+    llm,
+    checkpoints: Optional[CheckpointStore] = None,
+    reused: Optional[List[str]] = None,
+) -> DagScheduler:
+    """
+    Declares the pipeline stages and their real data dependencies:
+
+        plan ──────► hypothesis ─┐
+        research ─┬──────────────┼─► synthesis ─► publish
+                  └► analysis ───┘
+
+    With a checkpoint store, stages (and research requests) whose inputs are unchanged since an
+    earlier run of the same session are not executed again; their names are appended to `reused`.
+    """
+    scientist_tasks = ScientistTasks(research_query=research_query)
+    session_id = session_id_for_query(research_query)
+    scheduler = DagScheduler(max_workers=4)
+    reused = reused if reused is not None else []
+
+    def add_stage(name: str, func: Callable[..., Any], depends_on=()):
+        if checkpoints is not None and name in STAGE_CODECS:
+            func = _incremental(checkpoints, session_id, name, research_query, llm, func, reused)
+        scheduler.add_stage(name, func, depends_on=depends_on)
+
+    def research() -> ResearchResult:
+        if checkpoints is None:
+            return collect_parallel_research(session_id, scientist_tasks.research_requests())
+        return _incremental_research(checkpoints, session_id, scientist_tasks.research_requests(), reused)
+
+    add_stage("plan", lambda: plan_workflow(research_query))
+    add_stage("research", research)
+    add_stage(
+        "hypothesis",
+        lambda plan: generate_hypothesis(llm, research_query, plan),
+        depends_on=["plan"],
+    )
+    add_stage(
+        "analysis",
+        lambda research: analyze_workbench_data(research.workbench_keys),
+        depends_on=["research"],
+    )
+    add_stage(
+        "synthesis",
+        lambda hypothesis, research, analysis: generate_synthesis(llm, research_query, hypothesis, research, analysis),
+        depends_on=["hypothesis", "research", "analysis"],
+    )
+    add_stage("publish", lambda synthesis: publish_synthesis(synthesis), depends_on=["synthesis"])
+    return scheduler
+
+
+def run_direct_pipeline(
+    research_query: ResearchQuery,
+    llm=None,
+    output_file: Optional[str] = REPORT_OUTPUT_FILE,
+    resume: bool = True,
+) -> PipelineResult:
+    """
+    Executes the workflow without agent reasoning turns:
+    plan -> parallel research -> hypothesis (LLM) -> analysis -> synthesis (LLM) -> publish,
+    with independent stages overlapping. Tool failures raise ToolExecutionError instead of
+    being returned as strings.
+    With `resume`, a rerun (after a failure, or of an edited query on the same topic) reuses
+    the saved outputs of every stage whose inputs did not change.
+    """
+    if llm is None:
+        from src.agents.scientist_agents import get_llm
+        llm = get_llm()
+
+    checkpoints = get_checkpoint_store() if resume else None
+    reused: List[str] = []
+    try:
+        report = build_pipeline_graph(research_query, llm, checkpoints=checkpoints, reused=reused).run()
+    except Exception as e:
+        partial = getattr(e, "schedule_report", None)
+        if partial is not None:
+            print(f"-> Pipeline timing (failed run): {partial.summary()}")
+        raise
+    plan, synthesis, report_url = report.outputs["plan"], report.outputs["synthesis"], report.outputs["publish"]
+    print(f"-> Pipeline timing: {report.summary()}")
+
+    if output_file:
+        with open(output_file, "w", encoding="utf-8") as f:
+            f.write(f"Final Synthesis published successfully. Report URL: {report_url}.\n\n{json.dumps(synthesis.dict(), indent=2)}")
+
+    return PipelineResult(
+        session_id=plan.session_id,
+        synthesis=synthesis,
+        report_url=report_url,
+        stage_timings={name: t["duration_s"] for name, t in report.timings.items()},
+        critical_path=report.critical_path,
+        critical_path_s=report.critical_path_s,
+        wall_clock_s=report.wall_clock_s,
+        reused_stages=sorted(reused),
+    )
@@ -0,0 +1,270 @@
+import json
+import codecs
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+import numpy as np
+
+# --- Vectorised Compound Risk Filtering ---
+# Compound records from PubChem Workbench payloads are loaded into columnar NumPy arrays once;
+# every risk filter is then a boolean mask over whole columns, so the per-row cost is paid in
+# C rather than in a Python loop. Payloads may hold records ({"compounds": [{...}, ...]}) or,
+# for very large result sets, columns ({"columns": {"cid": [...], "molecular_weight": [...], ...}}).
+# A payload given as an iterable of byte chunks (e.g. a Workbench payload streamed chunk by
+# chunk) is parsed incrementally: records are converted to columns in batches, so neither the
+# whole document nor all of its record dicts are ever held in memory at once.
+
+RECORD_BATCH_SIZE = 8192  # Streamed records are converted to columns this many at a time
+# Flag values given as strings (e.g. from CSV-derived payloads) are parsed, not tested for emptiness.
+# Any other string counts as toxic, so an unrecognised value never lets a compound pass.
+FALSE_STRINGS = frozenset({"", "0", "false", "f", "no", "n", "off", "none", "null"})
+
+Payload = Union[bytes, bytearray, memoryview, str, Dict[str, Any], Iterable[memoryview]]
+
+
+class RiskThresholds(NamedTuple):
+    """Lipinski-style property limits; a compound passes only if it meets all of them and is not toxic."""
+    max_molecular_weight: float = 500.0
+    max_logp: float = 5.0
+    critical_toxic_fraction: float = 0.5  # At or above this share of toxic compounds, raise the risk flag
+
+
+class CompoundTable(NamedTuple):
+    """Columnar compound data. Missing numeric values are NaN and never pass a threshold."""
+    cid: np.ndarray               # int64
+    molecular_weight: np.ndarray  # float64
+    logp: np.ndarray              # float64
+    toxicity_flag: np.ndarray     # bool
+
+    def __len__(self) -> int:
+        return len(self.cid)
+
+
+def _decode(payload: Payload) -> Dict[str, Any]:
+    if isinstance(payload, dict):
+        return payload
+    if isinstance(payload, (bytes, bytearray, memoryview)):
+        payload = bytes(payload).decode("utf-8")
+    return json.loads(payload)
+
+
+def _flag(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() not in FALSE_STRINGS
+    return bool(value)
+
+
+def _flags(values: List[Any]) -> np.ndarray:
+    """Boolean column of flag values; missing entries (None) are False."""
+    column = np.asarray(values)
+    if column.dtype.kind in "biuf":
+        return column.astype(bool)
+    return np.fromiter((_flag(v) for v in values), dtype=bool, count=len(values))
+
+
+def _table_from_records(records: List[Dict[str, Any]]) -> CompoundTable:
+    n = len(records)
+    # NumPy converts None to NaN in float columns, so missing properties fail every threshold
+    return CompoundTable(
+        cid=np.fromiter((r.get("cid") or 0 for r in records), dtype=np.int64, count=n),
+        molecular_weight=np.fromiter((r.get("molecular_weight") for r in records), dtype=np.float64, count=n),
+        logp=np.fromiter((r.get("logp") for r in records), dtype=np.float64, count=n),
+        toxicity_flag=np.fromiter((_flag(r.get("toxicity_flag")) for r in records), dtype=bool, count=n),
+    )
+
+
+def _table_from_columns(columns: Dict[str, List[Any]]) -> CompoundTable:
+    n = len(next(iter(columns.values()), ()))
+
+    def _column(name: str, dtype, fill) -> np.ndarray:
+        values = columns.get(name)
+        if values is None:
+            return np.full(n, fill, dtype=dtype)
+        try:
+            return np.asarray(values, dtype=dtype)
+        except TypeError:
+            # Missing entries (None) cannot be cast to int64: fill them as the record path does
+            column = np.asarray(values, dtype=object)
+            column[np.equal(column, None)] = fill
+            return column.astype(dtype)
+
+    toxicity = columns.get("toxicity_flag")
+    return CompoundTable(
+        cid=_column("cid", np.int64, 0),
+        molecular_weight=_column("molecular_weight", np.float64, np.nan),
+        logp=_column("logp", np.float64, np.nan),
+        toxicity_flag=np.zeros(n, dtype=bool) if toxicity is None else _flags(toxicity),
+    )
+
+
+class _JSONStream:
+    """
+    Pull parser for the top level of one JSON object arriving as UTF-8 byte chunks. Only the
+    current value and the unread rest of the current chunk are buffered.
+    """
+    def __init__(self, chunks: Iterable[memoryview]):
+        self._chunks = iter(chunks)
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Appends the next chunk to the unread buffer; False once the input is exhausted."""
+        if self._eof:
+            return False
+        for chunk in self._chunks:
+            text = self._text.decode(bytes(chunk))
+            if text:
+                self._buf, self._pos = self._buf[self._pos:] + text, 0
+                return True
+        self._buf, self._pos = self._buf[self._pos:] + self._text.decode(b"", final=True), 0
+        self._eof = True
+        return False
+
+    def _peek(self) -> str:
+        """The next non-whitespace character ('' at the end of the input)."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str):
+        if self._peek() != char:
+            raise ValueError(f"Malformed JSON payload: expected {char!r}.")
+        self._pos += 1
+
+    def _value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():  # The value is incomplete: read on, or fail at the end of the input
+                    raise
+                continue
+            if end == len(self._buf) and self._fill():
+                continue  # A number or literal may continue in the next chunk
+            self._pos = end
+            return value
+
+    def _elements(self, close: str) -> Iterator[None]:
+        """Yields once per element of the container whose opening bracket was just consumed."""
+        if self._peek() == close:
+            self._pos += 1
+            return
+        while True:
+            yield
+            separator = self._peek()
+            self._pos += 1
+            if separator == close:
+                return
+            if separator != ",":
+                raise ValueError("Malformed JSON payload: expected ',' or a closing bracket.")
+
+    def members(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Streams the top-level object: array values are yielded element by element as (key, element),
+        object values member by member as (key, (name, value)), and anything else as (key, value).
+        """
+        self._expect("{")
+        for _ in self._elements("}"):
+            key = self._value()
+            self._expect(":")
+            opening = self._peek()
+            if opening == "[":
+                self._pos += 1
+                for _ in self._elements("]"):
+                    yield key, self._value()
+            elif opening == "{":
+                self._pos += 1
+                for _ in self._elements("}"):
+                    name = self._value()
+                    self._expect(":")
+                    yield key, (name, self._value())
+            else:
+                yield key, self._value()
+
+
+def _table_from_chunks(chunks: Iterable[memoryview]) -> Optional[CompoundTable]:
+    """Streams one payload into a CompoundTable; None if it is not a PubChem payload."""
+    source = None
+    tables: List[CompoundTable] = []
+    batch: List[Dict[str, Any]] = []
+    columns: Dict[str, List[Any]] = {}
+    for key, item in _JSONStream(chunks).members():
+        if key == "source":
+            source = item
+        elif key == "compounds":
+            batch.append(item)
+            if len(batch) >= RECORD_BATCH_SIZE:
+                tables.append(_table_from_records(batch))
+                batch = []
+        elif key == "columns":
+            name, values = item
+            columns[name] = values
+    if source != "pubchem":
+        return None
+    if columns:  # As in the whole-document path, columns take precedence over records
+        return _table_from_columns(columns)
+    if batch:
+        tables.append(_table_from_records(batch))
+    return concat_tables(tables)
+
+
+def concat_tables(tables: List[CompoundTable]) -> CompoundTable:
+    if not tables:
+        return CompoundTable(np.empty(0, np.int64), np.empty(0), np.empty(0), np.empty(0, bool))
+    return CompoundTable(*(np.concatenate(columns) for columns in zip(*tables)))
+
+
+def load_compound_table(payloads: Iterable[Payload]) -> CompoundTable:
+    """
+    Builds one CompoundTable from every PubChem payload; payloads from other sources are skipped.
+    Each payload is a whole document (bytes, text or a parsed dict) or an iterable of byte chunks.
+    """
+    tables = []
+    for payload in payloads:
+        if not isinstance(payload, (bytes, bytearray, memoryview, str, dict)):
+            table = _table_from_chunks(payload)
+            if table is not None:
+                tables.append(table)
+            continue
+        data = _decode(payload)
+        if data.get("source") != "pubchem":
+            continue
+        if "columns" in data:
+            tables.append(_table_from_columns(data["columns"]))
+        else:
+            tables.append(_table_from_records(data.get("compounds", [])))
+    return concat_tables(tables)
+
+
+def clean_mask(table: CompoundTable, thresholds: RiskThresholds = RiskThresholds()) -> np.ndarray:
+    """Boolean mask of compounds that pass every risk filter (NaN comparisons are False)."""
+    return (
+        ~table.toxicity_flag
+        & (table.molecular_weight <= thresholds.max_molecular_weight)
+        & (table.logp <= thresholds.max_logp)
+    )
+
+
+def analyze_table(table: CompoundTable, thresholds: RiskThresholds = RiskThresholds()) -> Dict[str, Any]:
+    """Applies the risk filters and returns the analysis contract (see models.AnalysisResult)."""
+    total = len(table)
+    clean = int(np.count_nonzero(clean_mask(table, thresholds)))
+    toxic = int(np.count_nonzero(table.toxicity_flag))
+    critical = total > 0 and (clean == 0 or toxic >= thresholds.critical_toxic_fraction * total)
+    return {
+        "final_clean_compounds": clean,
+        "critical_risk_flag": bool(critical),
+        "summary": (f"Data cleaning complete. Identified {clean} high-potential compounds that passed "
+                    f"initial risk filtering ({toxic} of {total} flagged as toxic)."),
+    }
+
+
+def analyze_payloads(payloads: Iterable[Payload], thresholds: RiskThresholds = RiskThresholds()) -> Dict[str, Any]:
+    """Loads compound payloads into a columnar table and analyses it in one pass."""
+    return analyze_table(load_compound_table(payloads), thresholds)
@@ -1,90 +1,183 @@
-import os
-from typing import List
-from crewai import Crew
-from dotenv import load_dotenv
-from src.agents.scientist_agents import ScientistAgents
-from src.tasks import ScientistTasks
-from src.models import ResearchQuery
-from src.tools.custom_tools import SCIENTIST_TOOLS # Import the custom tools list
-
-# Load environment variables (API keys)
-load_dotenv()
-
-def run_co_scientist_crew(user_topic: str, desired_output: str, keywords: List[str]):
-    """
-    Orchestrates the AI Co-Scientist crew to execute the end-to-end workflow.
-    """
-    print("--- Starting AI Co-Scientist Lab Orchestration ---")
-
-    # 1. Instantiate Agents
-    scientist_agents = ScientistAgents()
-    hypothesis_agent = scientist_agents.hypothesis_planner()
-    review_agent = scientist_agents.literature_and_data_acquisition_agent()
-    analysis_agent = scientist_agents.analysis_and_protocol_agent()
-    reporting_agent = scientist_agents.synthesis_and_reporting_agent()
-
-    # 2. Define the Research Query (Validated Input)
-    research_query = ResearchQuery(
-        topic=user_topic,
-        target_output=desired_output,
-        keywords=keywords
-    )
-
-    # 3. Instantiate Tasks
-    scientist_tasks = ScientistTasks(research_query=research_query)
-
-    # Note: We use the methods from the tasks class to get the instances of Task objects
-    plan_task = scientist_tasks.plan_workflow_task(hypothesis_agent)
-    research_task = scientist_tasks.parallel_research_task(review_agent)
-    analysis_task = scientist_tasks.data_analysis_task(analysis_agent)
-    report_task = scientist_tasks.final_reporting_task(reporting_agent)
-
-    # 4. Define the Crew (Orchestration)
-    # CRITICAL: Pass the entire list of SCIENTIST_TOOLS to the crew.
-    scientific_crew = Crew(
-        agents=[
-            hypothesis_agent,
-            review_agent,
-            analysis_agent,
-            reporting_agent
-        ],
-        tasks=[
-            plan_task,
-            research_task,
-            analysis_task,
-            report_task
-        ],
-        tools=SCIENTIST_TOOLS, # Make all custom tools available
-        verbose=2, # Shows detailed reasoning and tool usage
-        process='sequential' 
-    )
-
-    # 5. Execute the Workflow
-    print("\n\n--- Initiating Autonomous Workflow Execution ---")
-    
-    try:
-        # CrewAI automatically handles passing the output of one task as input to the next.
-        result = scientific_crew.kickoff()
-        
-        print("\n\n#############################################")
-        print("  AI CO-SCIENTIST WORKFLOW COMPLETE! ")
-        print("#############################################")
-        print(f"\nFinal Result:\n{result}")
-        print("\nCheck the final_scientific_report.txt file for the published URL.")
-
-    except Exception as e:
-        print(f"\n--- CRITICAL WORKFLOW FAILURE ---")
-        print(f"Error during crew execution: {e}")
-        print("Ensure GROQ_API_KEY and COMPOSIO_API_KEY are set.")
-
-
-if __name__ == "__main__":
-    # Example User Input for the Hackathon Demo
-    example_topic = "A novel application of graphene quantum dots for localized drug delivery."
-    example_output = "Drafting a full hypothesis, protocol summary, and prior art matrix."
-    example_keywords = ["graphene quantum dots", "localized delivery", "biocompatibility", "nanomedicine"]
-    
-    if not os.getenv("GROQ_API_KEY") or not os.getenv("COMPOSIO_API_KEY"):
-        print("\nFATAL ERROR: Please set GROQ_API_KEY and COMPOSIO_API_KEY in your .env file.")
-    else:
-        run_co_scientist_crew(example_topic, example_output, example_keywords)
\ No newline at end of file
+import os
+import time
+import argparse
+from typing import List, Optional
+from dotenv import load_dotenv
+from src.models import ResearchQuery
+from src.tracing import TRACER, export_trace
+from src.metrics import WORKFLOWS_STARTED, record_workflow, start_configured_exporters, export_metrics
+# Crew mode (crewai, agents, tools) and the direct pipeline are imported inside the run
+# functions, so `--help` and `import src.run_workflow` start without the heavy dependencies.
+
+# Load environment variables (API keys)
+load_dotenv()
+
+EXECUTION_MODES = ("crew", "direct")
+
+def run_co_scientist_crew(
+    user_topic: str,
+    desired_output: str,
+    keywords: List[str],
+    mode: str = "crew",
+    trace_file: Optional[str] = None,
+):
+    """
+    Orchestrates the AI Co-Scientist crew to execute the end-to-end workflow.
+    mode='crew' lets the agents drive every tool call; mode='direct' runs the fixed tool
+    sequence as a deterministic pipeline and only uses the LLM for hypothesis and synthesis.
+    The run is traced (tasks, tool calls, Composio calls, LLM calls); the Chrome trace is written
+    to `trace_file` (default: the TRACE_FILE environment variable) if one is given.
+    Started/completed/failed runs are counted in src.metrics (METRICS_PORT / METRICS_FILE export them).
+    """
+    if mode not in EXECUTION_MODES:
+        raise ValueError(f"Unknown execution mode '{mode}'. Expected one of {EXECUTION_MODES}.")
+
+    print("--- Starting AI Co-Scientist Lab Orchestration ---")
+
+    start_configured_exporters()
+    WORKFLOWS_STARTED.inc(mode=mode)
+    started = time.perf_counter()
+    result = None
+    try:
+        with TRACER.span(f"workflow:{mode}", "workflow", topic=user_topic):
+            run = _run_direct if mode == "direct" else _run_crew
+            result = run(user_topic, desired_output, keywords)
+        return result
+    finally:
+        # The run functions report a failure by printing it and returning None
+        record_workflow(mode, "completed" if result is not None else "failed", time.perf_counter() - started)
+        export_trace(trace_file)
+        export_metrics()
+
+
+def _run_crew(user_topic: str, desired_output: str, keywords: List[str]):
+    """Runs the full agent crew (every tool call is decided by an agent)."""
+    from crewai import Crew
+    from src.agents.scientist_agents import ScientistAgents
+    from src.tasks import ScientistTasks
+    from src.checkpoints import get_checkpoint_store
+    from src.tools.custom_tools import get_scientist_tools # The custom tools list
+
+    # 1. Instantiate Agents
+    scientist_agents = ScientistAgents()
+    hypothesis_agent = scientist_agents.hypothesis_planner()
+    review_agent = scientist_agents.literature_and_data_acquisition_agent()
+    analysis_agent = scientist_agents.analysis_and_protocol_agent()
+    reporting_agent = scientist_agents.synthesis_and_reporting_agent()
+
+    # 2. Define the Research Query (Validated Input)
+    research_query = ResearchQuery(
+        topic=user_topic,
+        target_output=desired_output,
+        keywords=keywords
+    )
+
+    # 3. Instantiate Tasks (each completed task is checkpointed under the session ID)
+    checkpoints = get_checkpoint_store()
+    scientist_tasks = ScientistTasks(research_query=research_query, checkpoints=checkpoints)
+
+    # Note: We use the methods from the tasks class to get the instances of Task objects
+    plan_task = scientist_tasks.plan_workflow_task(hypothesis_agent)
+    research_task = scientist_tasks.parallel_research_task(review_agent)
+    analysis_task = scientist_tasks.data_analysis_task(analysis_agent)
+    report_task = scientist_tasks.final_reporting_task(reporting_agent)
+
+    # Resume after the last task that an earlier, failed run of this query completed
+    named_tasks = [
+        ("plan_workflow_task", plan_task),
+        ("parallel_research_task", research_task),
+        ("data_analysis_task", analysis_task),
+        ("final_reporting_task", report_task),
+    ]
+    task_names = [name for name, _ in named_tasks]
+    pending_tasks, completed = scientist_tasks.resume(named_tasks)
+    if completed:
+        print(f"-> Resuming session {scientist_tasks.session_id}: skipping completed task(s) {', '.join(completed)}")
+    if not pending_tasks:
+        scientist_tasks.discard_checkpoints(task_names)
+        return completed["final_reporting_task"]
+
+    # 4. Define the Crew (Orchestration)
+    # CRITICAL: Pass the entire list of SCIENTIST_TOOLS to the crew.
+    scientific_crew = Crew(
+        agents=[
+            hypothesis_agent,
+            review_agent,
+            analysis_agent,
+            reporting_agent
+        ],
+        tasks=pending_tasks,
+        tools=get_scientist_tools(), # Make all custom tools available
+        verbose=2, # Shows detailed reasoning and tool usage
+        process='sequential' 
+    )
+
+    # 5. Execute the Workflow
+    print("\n\n--- Initiating Autonomous Workflow Execution ---")
+    
+    try:
+        # CrewAI automatically handles passing the output of one task as input to the next.
+        scientist_tasks.task_spans.start()
+        result = scientific_crew.kickoff()
+        scientist_tasks.discard_checkpoints(task_names)
+        
+        print("\n\n#############################################")
+        print("  AI CO-SCIENTIST WORKFLOW COMPLETE! ")
+        print("#############################################")
+        print(f"\nFinal Result:\n{result}")
+        print("\nCheck the final_scientific_report.txt file for the published URL.")
+        return result
+
+    except Exception as e:
+        TRACER.annotate(status="failed", error=str(e))
+        print(f"\n--- CRITICAL WORKFLOW FAILURE ---")
+        print(f"Error during crew execution: {e}")
+        print("Ensure GROQ_API_KEY and COMPOSIO_API_KEY are set.")
+
+
+def _run_direct(user_topic: str, desired_output: str, keywords: List[str]):
+    """Runs the deterministic pipeline (2 LLM calls instead of a full agent conversation)."""
+    from src.pipeline import run_direct_pipeline
+
+    research_query = ResearchQuery(
+        topic=user_topic,
+        target_output=desired_output,
+        keywords=keywords
+    )
+
+    print("\n\n--- Initiating Direct Pipeline Execution ---")
+
+    try:
+        result = run_direct_pipeline(research_query)
+
+        print("\n\n#############################################")
+        print("  AI CO-SCIENTIST WORKFLOW COMPLETE! ")
+        print("#############################################")
+        print(f"\nFinal Result:\n{result.synthesis.json()}")
+        print(f"\nReport URL: {result.report_url}")
+        return result
+
+    except Exception as e:
+        TRACER.annotate(status="failed", error=str(e))
+        print(f"\n--- CRITICAL WORKFLOW FAILURE ---")
+        print(f"Error during direct pipeline execution: {e}")
+        print("Ensure GROQ_API_KEY and COMPOSIO_API_KEY are set.")
+
+
+if __name__ == "__main__":
+    # Example User Input for the Hackathon Demo
+    example_topic = "A novel application of graphene quantum dots for localized drug delivery."
+    example_output = "Drafting a full hypothesis, protocol summary, and prior art matrix."
+    example_keywords = ["graphene quantum dots", "localized delivery", "biocompatibility", "nanomedicine"]
+
+    parser = argparse.ArgumentParser(description="Run the AI Co-Scientist Lab Orchestrator.")
+    parser.add_argument("--mode", choices=EXECUTION_MODES, default="crew",
+                        help="'crew' for full agent orchestration, 'direct' for the deterministic tool pipeline.")
+    parser.add_argument("--trace", default=None, metavar="FILE",
+                        help="Write a Chrome trace (JSON) of the run to FILE (default: $TRACE_FILE).")
+    args = parser.parse_args()
+    
+    if not os.getenv("GROQ_API_KEY") or not os.getenv("COMPOSIO_API_KEY"):
+        print("\nFATAL ERROR: Please set GROQ_API_KEY and COMPOSIO_API_KEY in your .env file.")
+    else:
+        run_co_scientist_crew(example_topic, example_output, example_keywords, mode=args.mode, trace_file=args.trace)
\ No newline at end of file
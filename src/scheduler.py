@@ -0,0 +1,155 @@
+import time
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from src.tracing import TRACER
+
+# --- Dependency-Graph (DAG) Stage Scheduler ---
+# Each stage declares the stages whose outputs it consumes. A stage starts as soon as all of
+# its inputs are ready, so independent stages (e.g. planning and literature retrieval) overlap.
+
+
+class Stage:
+    """A named unit of work. `func` receives the outputs of `depends_on` as keyword arguments."""
+    def __init__(self, name: str, func: Callable[..., Any], depends_on: Sequence[str] = ()):
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+
+
+class ScheduleReport:
+    """Outputs and timing of one scheduler run, including its critical path."""
+    def __init__(self, outputs: Dict[str, Any], timings: Dict[str, Dict[str, float]],
+                 critical_path: List[str], wall_clock_s: float, failed_stages: Sequence[str] = ()):
+        self.outputs = outputs
+        self.timings = timings  # {stage: {"start_s", "end_s", "duration_s"}}, relative to run start
+        self.critical_path = critical_path
+        self.wall_clock_s = wall_clock_s
+        self.failed_stages = list(failed_stages)  # Non-empty for the partial report of a failed run
+
+    @property
+    def critical_path_s(self) -> float:
+        """Sum of stage durations along the critical path (the lower bound on wall-clock time)."""
+        return sum(self.timings[name]["duration_s"] for name in self.critical_path)
+
+    def summary(self) -> str:
+        stages = ", ".join(f"{name}={t['duration_s']:.3f}s" for name, t in self.timings.items())
+        failed = f" Failed: {', '.join(self.failed_stages)}." if self.failed_stages else ""
+        return (f"Critical path: {' -> '.join(self.critical_path)} ({self.critical_path_s:.3f}s); "
+                f"wall clock {self.wall_clock_s:.3f}s. Stages: {stages}.{failed}")
+
+
+class DagScheduler:
+    """
+    Runs stages on a thread pool in dependency order, starting each stage as soon as its
+    dependencies have completed. If a stage raises, no new stages are started, the running
+    ones are allowed to finish, and the first error is re-raised with the partial report of
+    the stages that did run attached as its `schedule_report` attribute.
+    """
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self.stages: Dict[str, Stage] = {}
+
+    def add_stage(self, name: str, func: Callable[..., Any], depends_on: Sequence[str] = ()) -> "DagScheduler":
+        if name in self.stages:
+            raise ValueError(f"Stage '{name}' is already defined.")
+        self.stages[name] = Stage(name, func, depends_on)
+        return self
+
+    def topological_order(self) -> List[str]:
+        """Returns the stage names in a valid execution order; raises ValueError on cycles or unknown deps."""
+        order: List[str] = []
+        state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+
+        def visit(name: str, path: List[str]):
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"Dependency cycle: {' -> '.join(path + [name])}")
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage '{name}' (required by '{path[-1]}').")
+            state[name] = 1
+            for dep in self.stages[name].depends_on:
+                visit(dep, path + [name])
+            state[name] = 2
+            order.append(name)
+
+        for name in self.stages:
+            visit(name, [])
+        return order
+
+    def _critical_path(self, order: List[str], timings: Dict[str, Dict[str, float]]) -> List[str]:
+        """Longest duration-weighted path through the graph (through the timed stages only)."""
+        order = [name for name in order if name in timings]
+        best: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        for name in order:
+            deps = [dep for dep in self.stages[name].depends_on if dep in best]
+            heaviest = max(deps, key=lambda d: best[d], default=None)
+            best[name] = timings[name]["duration_s"] + (best[heaviest] if heaviest else 0.0)
+            previous[name] = heaviest
+
+        node = max(order, key=lambda n: best[n], default=None)
+        path: List[str] = []
+        while node is not None:
+            path.append(node)
+            node = previous[node]
+        return list(reversed(path))
+
+    def run(self) -> ScheduleReport:
+        order = self.topological_order()
+        outputs: Dict[str, Any] = {}
+        timings: Dict[str, Dict[str, float]] = {}
+        run_start = time.perf_counter()
+
+        def _execute(stage: Stage) -> Any:
+            started = time.perf_counter()
+            try:
+                with TRACER.span(stage.name, "stage", depends_on=list(stage.depends_on)):
+                    return stage.func(**{dep: outputs[dep] for dep in stage.depends_on})
+            finally:
+                ended = time.perf_counter()
+                timings[stage.name] = {
+                    "start_s": started - run_start,
+                    "end_s": ended - run_start,
+                    "duration_s": ended - started,
+                }
+
+        remaining = list(order)
+        running = {}
+        error: Optional[BaseException] = None
+        failed: List[str] = []
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="dag-stage") as executor:
+            while remaining or running:
+                # Launch every stage whose inputs are all available
+                if error is None:
+                    for name in list(remaining):
+                        if all(dep in outputs for dep in self.stages[name].depends_on):
+                            remaining.remove(name)
+                            # Stages run in a copy of the caller's context, so their spans nest under its span
+                            context = contextvars.copy_context()
+                            running[executor.submit(context.run, _execute, self.stages[name])] = name
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        outputs[name] = future.result()
+                    except BaseException as e:
+                        failed.append(name)
+                        error = error or e
+
+        report = ScheduleReport(
+            outputs=outputs,
+            timings={name: timings[name] for name in order if name in timings},
+            critical_path=self._critical_path(order, timings),
+            wall_clock_s=time.perf_counter() - run_start,
+            failed_stages=failed,
+        )
+        if error is not None:
+            # Failed runs are the ones most worth profiling: keep their timings with the error
+            error.schedule_report = report
+            raise error
+        return report
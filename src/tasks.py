@@ -1,93 +1,163 @@
-import json
-from crewai import Task
-from src.tools.custom_tools import SCIENTIST_TOOLS
-from src.models import ResearchQuery, ToolExecutionRequest
-
-class ScientistTasks:
-    """
-    Defines the sequential tasks that drive the AI Co-Scientist workflow.
-    Each task's expected output becomes the input for the next.
-    """
-    def __init__(self, research_query: ResearchQuery):
-        self.query = research_query
-
-    def plan_workflow_task(self, agent) -> Task:
-        """
-        Task 1: Hypothesis Agent. 
-        ACTION: Use the CreateWorkflowPlan tool to initiate the workflow and get a session ID.
-        """
-        query_json = self.query.json()
-        return Task(
-            description=(
-                f"Formalize the request (Topic: {self.query.topic}, Output: {self.query.target_output}) into a novel hypothesis. "
-                f"CRITICAL: You MUST use the 'CreateWorkflowPlan' tool with the following JSON input: {query_json}. "
-                "The output must be the full plan result, including the Composio session_id."
-            ),
-            expected_output="The full structured workflow plan and the Composio session_id.",
-            agent=agent,
-            tools=[t for t in SCIENTIST_TOOLS if t.name == "CreateWorkflowPlan"],
-        )
-
-    def parallel_research_task(self, agent) -> Task:
-        """
-        Task 2: Literature Agent. 
-        ACTION: Use the ExecuteParallelResearch tool for concurrent data collection and Workbench storage.
-        """
-        # Example JSON structure to guide the LLM's tool call argument
-        example_requests = [
-            ToolExecutionRequest(
-                tool_slug="ARXIV_SEARCH", 
-                arguments={"query": f"{self.query.topic} prior art", "max_results": 5}
-            ),
-            ToolExecutionRequest(
-                tool_slug="PUBCHEM_QUERY", 
-                arguments={"keywords": self.query.keywords, "compound_type": "delivery vehicle"}
-            )
-        ]
-        requests_json = json.dumps([req.dict() for req in example_requests], indent=2)
-
-        return Task(
-            description=(
-                "Obtain the session_id from the previous task's result. "
-                "CRITICAL: You MUST use the 'ExecuteParallelResearch' tool. "
-                f"Pass the session_id and a JSON list of requests similar to this structure: {requests_json}. "
-                "This step showcases parallel execution and Workbench storage."
-            ),
-            expected_output="A summary of the parallel execution results, including the list of Workbench Keys (JSON list of strings) for the raw data.",
-            agent=agent,
-            tools=[t for t in SCIENTIST_TOOLS if t.name == "ExecuteParallelResearch"],
-        )
-
-    def data_analysis_task(self, agent) -> Task:
-        """
-        Task 3: Analysis Agent. 
-        ACTION: Use the RunRemoteDataAnalysis tool (Remote Bash) to process Workbench data.
-        """
-        return Task(
-            description=(
-                "Retrieve the JSON list of Workbench Keys from the previous task's output. "
-                "CRITICAL: You MUST use the 'RunRemoteDataAnalysis' tool, passing the JSON list of keys. "
-                "This action simulates retrieval from the Workbench and execution of custom analysis code (data cleaning and risk filtering)."
-            ),
-            expected_output="The final structured analysis output (JSON string) from the remote execution, including 'final_clean_compounds' and 'summary'.",
-            agent=agent,
-            tools=[t for t in SCIENTIST_TOOLS if t.name == "RunRemoteDataAnalysis"],
-        )
-
-    def final_reporting_task(self, agent) -> Task:
-        """
-        Task 4: Reporting Agent. 
-        ACTION: Synthesize all findings into the FinalSynthesis model and publish.
-        """
-        return Task(
-            description=(
-                "Synthesize the initial hypothesis, the parallel research summary, and the structured analysis result. "
-                "Draft a detailed experimental protocol based on the consolidated data. "
-                "CRITICAL: You MUST output a JSON string that conforms exactly to the 'FinalSynthesis' Pydantic model. "
-                "You MUST then use the 'PublishFinalReport' tool, passing this FinalSynthesis JSON string."
-            ),
-            expected_output="The URL and confirmation message of the published, finalized report.",
-            agent=agent,
-            tools=[t for t in SCIENTIST_TOOLS if t.name == "PublishFinalReport"],
-            output_file="final_scientific_report.txt"
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+from src.identity import query_fingerprint
+from src.tools.custom_tools import get_scientist_tools, session_id_for_query
+from src.models import ResearchQuery, ToolExecutionRequest
+from src.tracing import SequentialTaskSpans
+from src.checkpoints import CheckpointStore
+
+if TYPE_CHECKING:
+    from crewai import Task  # Imported lazily at runtime: crewai is slow to import and only needed in crew mode
+
+class ScientistTasks:
+    """
+    Defines the sequential tasks that drive the AI Co-Scientist workflow.
+    Each task's expected output becomes the input for the next.
+    Every task reports its completion to `task_spans`, which records one trace span per task,
+    and, given a checkpoint store, saves its output under the session ID so that a failed run
+    of the same query can later resume after its last completed task. Sessions are shared by
+    every query on a topic, so task checkpoints are also keyed by the full query fingerprint.
+    """
+    def __init__(self, research_query: ResearchQuery, checkpoints: Optional[CheckpointStore] = None):
+        self.query = research_query
+        self.task_spans = SequentialTaskSpans()
+        self.checkpoints = checkpoints
+        self.session_id = session_id_for_query(research_query) if checkpoints is not None else None
+        self.query_fingerprint = query_fingerprint(research_query)
+
+    def _on_task_complete(self, task_name: str) -> Callable[[Any], None]:
+        """Task(callback=...) that records the task's trace span and checkpoints its output."""
+        record_span = self.task_spans.callback(task_name)
+
+        def _callback(output: Any):
+            record_span(output)
+            if self.checkpoints is not None:
+                self.checkpoints.save(
+                    self.session_id, task_name, {"raw": str(getattr(output, "raw", output))}, self.query_fingerprint
+                )
+        return _callback
+
+    def resume(self, tasks: List[Tuple[str, "Task"]]) -> Tuple[List["Task"], Dict[str, str]]:
+        """
+        Drops the leading tasks that an earlier run of this session already completed and hands
+        their saved outputs to the first remaining task (CrewAI would otherwise pass it the
+        previous task's output). Returns (tasks still to run, {completed task name: output}).
+        """
+        completed: Dict[str, str] = {}
+        if self.checkpoints is not None:
+            for name, _ in tasks:
+                saved = self.checkpoints.load(self.session_id, name, self.query_fingerprint)
+                if saved is None:
+                    break
+                completed[name] = saved["raw"]
+
+        remaining = [task for _, task in tasks[len(completed):]]
+        if completed and remaining:
+            outputs = "\n".join(f"- {name}: {raw}" for name, raw in completed.items())
+            remaining[0].description += (
+                "\n\nRESUMED RUN: the earlier steps of this workflow already completed. "
+                f"Use their outputs instead of repeating them:\n{outputs}"
+            )
+        return remaining, completed
+
+    def discard_checkpoints(self, task_names: List[str]):
+        """Removes this query's task checkpoints (once its workflow has completed)."""
+        if self.checkpoints is not None:
+            for name in task_names:
+                self.checkpoints.discard(self.session_id, name, self.query_fingerprint)
+
+    def research_requests(self) -> List[ToolExecutionRequest]:
+        """
+        The parallel research requests derived from the query (Arxiv prior art + PubChem candidates).
+        Used both to guide the Literature Agent and directly by the deterministic pipeline.
+        """
+        return [
+            ToolExecutionRequest(
+                tool_slug="ARXIV_SEARCH", 
+                arguments={"query": f"{self.query.topic} prior art", "max_results": 5}
+            ),
+            ToolExecutionRequest(
+                tool_slug="PUBCHEM_QUERY", 
+                arguments={"keywords": self.query.keywords, "compound_type": "delivery vehicle"}
+            )
+        ]
+
+    def plan_workflow_task(self, agent) -> "Task":
+        """
+        Task 1: Hypothesis Agent. 
+        ACTION: Use the CreateWorkflowPlan tool to initiate the workflow and get a session ID.
+        """
+        query_json = self.query.json()
+        from crewai import Task
+        return Task(
+            description=(
+                f"Formalize the request (Topic: {self.query.topic}, Output: {self.query.target_output}) into a novel hypothesis. "
+                f"CRITICAL: You MUST use the 'CreateWorkflowPlan' tool with the following JSON input: {query_json}. "
+                "The output must be the full plan result, including the Composio session_id."
+            ),
+            expected_output="The full structured workflow plan and the Composio session_id.",
+            agent=agent,
+            callback=self._on_task_complete("plan_workflow_task"),
+            tools=[t for t in get_scientist_tools() if t.name == "CreateWorkflowPlan"],
+        )
+
+    def parallel_research_task(self, agent) -> "Task":
+        """
+        Task 2: Literature Agent. 
+        ACTION: Use the ExecuteParallelResearch tool for concurrent data collection and Workbench storage.
+        """
+        # Example JSON structure to guide the LLM's tool call argument
+        example_requests = self.research_requests()
+        requests_json = json.dumps([req.dict() for req in example_requests], indent=2)
+
+        from crewai import Task
+        return Task(
+            description=(
+                "Obtain the session_id from the previous task's result. "
+                "CRITICAL: You MUST use the 'ExecuteParallelResearch' tool. "
+                f"Pass the session_id and a JSON list of requests similar to this structure: {requests_json}. "
+                "This step showcases parallel execution and Workbench storage."
+            ),
+            expected_output="A summary of the parallel execution results, including the list of Workbench Keys (JSON list of strings) for the raw data.",
+            agent=agent,
+            callback=self._on_task_complete("parallel_research_task"),
+            tools=[t for t in get_scientist_tools() if t.name == "ExecuteParallelResearch"],
+        )
+
+    def data_analysis_task(self, agent) -> "Task":
+        """
+        Task 3: Analysis Agent. 
+        ACTION: Use the RunRemoteDataAnalysis tool (Remote Bash) to process Workbench data.
+        """
+        from crewai import Task
+        return Task(
+            description=(
+                "Retrieve the JSON list of Workbench Keys from the previous task's output. "
+                "CRITICAL: You MUST use the 'RunRemoteDataAnalysis' tool, passing the JSON list of keys. "
+                "This action simulates retrieval from the Workbench and execution of custom analysis code (data cleaning and risk filtering)."
+            ),
+            expected_output="The final structured analysis output (JSON string) from the remote execution, including 'final_clean_compounds' and 'summary'.",
+            agent=agent,
+            callback=self._on_task_complete("data_analysis_task"),
+            tools=[t for t in get_scientist_tools() if t.name == "RunRemoteDataAnalysis"],
+        )
+
+    def final_reporting_task(self, agent) -> "Task":
+        """
+        Task 4: Reporting Agent. 
+        ACTION: Synthesize all findings into the FinalSynthesis model and publish.
+        """
+        from crewai import Task
+        return Task(
+            description=(
+                "Synthesize the initial hypothesis, the parallel research summary, and the structured analysis result. "
+                "Draft a detailed experimental protocol based on the consolidated data. "
+                "CRITICAL: You MUST output a JSON string that conforms exactly to the 'FinalSynthesis' Pydantic model. "
+                "You MUST then use the 'PublishFinalReport' tool, passing this FinalSynthesis JSON string."
+            ),
+            expected_output="The URL and confirmation message of the published, finalized report.",
+            agent=agent,
+            callback=self._on_task_complete("final_reporting_task"),
+            tools=[t for t in get_scientist_tools() if t.name == "PublishFinalReport"],
+            output_file="final_scientific_report.txt"
         )
\ No newline at end of file
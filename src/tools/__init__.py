@@ -1,4 +1,11 @@
-# src/tools/__init__.py
-# Imports the core client and tool list for simplified access in other modules.
-from .composio_client import COMPOSIO_CLIENT
-from .custom_tools import SCIENTIST_TOOLS
\ No newline at end of file
+# src/tools/__init__.py
+# Exposes the core client and tool list for simplified access in other modules.
+# Both are resolved lazily, so importing the package does not create the client or import crewai.
+def __getattr__(name: str):
+    if name == "COMPOSIO_CLIENT":
+        from .composio_client import get_composio_client
+        return get_composio_client()
+    if name == "SCIENTIST_TOOLS":
+        from .custom_tools import get_scientist_tools
+        return get_scientist_tools()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
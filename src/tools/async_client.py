@@ -0,0 +1,258 @@
+import os
+import time
+import asyncio
+import threading
+import weakref
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
+from src.tools.backends import AsyncToolBackend, AsyncHTTPToolBackend, ThreadedAsyncBackend
+from src.tools.transport import AsyncTransport, AsyncHTTPTransport
+from src.tools.concurrency import AsyncSingleFlight
+from src.tools.resilience import NO_RETRY, acall_with_retry, ahedged_call
+from src.tools.composio_client import ComposioClient, get_composio_client, HEDGE_PERCENTILE
+from src.metrics import METRICS, record_tool_call
+from src.tracing import TRACER
+
+# --- Asyncio Composio Client ---
+# One event loop drives many concurrent research sessions: each in-flight tool call is a
+# coroutine on a pooled HTTP connection rather than a blocked thread. Workbench storage, the
+# result cache, rate limits and latency statistics are shared with a synchronous ComposioClient,
+# so sync and async callers in the same process see one cache and stay under one set of limits.
+
+DEFAULT_MAX_CONCURRENCY = 1024  # Upper bound on concurrently running tool calls per async client
+
+
+class AsyncComposioClient:
+    """
+    Asyncio variant of the ComposioClient with the same meta-tool methods as coroutines.
+    Tool calls go to `backend`; by default that is an AsyncHTTPToolBackend over `transport`
+    (or over an AsyncHTTPTransport to COMPOSIO_BASE_URL when set), and otherwise the sync
+    client's backend run on the default thread pool.
+    Instances hold asyncio primitives and must only be used from one event loop.
+    """
+    def __init__(
+        self,
+        backend: Optional[AsyncToolBackend] = None,
+        transport: Optional[AsyncTransport] = None,
+        client: Optional[ComposioClient] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ):
+        # Shared state (workbench, result cache, rate limiter, retry policy, latency tracker)
+        self.client = client or get_composio_client()
+
+        base_url = os.getenv("COMPOSIO_BASE_URL")
+        if transport is None and base_url:
+            transport = AsyncHTTPTransport(base_url)
+        if backend is None:
+            backend = (
+                AsyncHTTPToolBackend(
+                    transport,
+                    user_id=self.client.user_id,
+                    api_key=self.client.api_key,
+                    idempotent_slugs=self.client.idempotent_slugs,
+                )
+                if transport is not None
+                else ThreadedAsyncBackend(self.client.backend)
+            )
+        self.transport = transport
+        self.backend = backend
+        self.single_flight = AsyncSingleFlight()
+        self.max_concurrency = max_concurrency
+        self._slots = asyncio.Semaphore(max_concurrency)
+        if transport is not None:
+            METRICS.register_pool("async_transport", self.transport_stats)
+
+    @property
+    def request_timeout_s(self) -> float:
+        return self.client.request_timeout_s
+
+    def session_id_for(self, session_key: Any) -> str:
+        return self.client.session_id_for(session_key)
+
+    def transport_stats(self) -> Dict[str, Any]:
+        """Connection-pool statistics (connections created vs reused) of the async transport, if any."""
+        return self.transport.stats() if self.transport is not None else {}
+
+    async def aclose(self):
+        """Closes the backend's pooled connections and removes the client's metrics registration."""
+        METRICS.unregister(self.transport_stats)
+        await self.backend.aclose()
+
+    async def _execute_one(self, request: Dict[str, Any], timeout_s: float) -> Dict[str, Any]:
+        """
+        Async form of ComposioClient._execute_one: result cache, then single-flight, then the backend.
+        The call gets `timeout_s` from the moment it holds one of the client's slots, as a sync call
+        does from the moment a worker picks it up; one still running then is cancelled and reported
+        with status 'timeout'.
+        """
+        tool_slug = request.get("tool_slug")
+        async with self._slots:
+            started = time.perf_counter()
+            with TRACER.span(f"tool:{tool_slug}", "tool_call") as span:
+                # A task plus wait (rather than wait_for), so a backend's own TimeoutError stays a failure
+                call = asyncio.ensure_future(self._resolve_one(tool_slug, request.get("arguments", {})))
+                try:
+                    await asyncio.wait({call}, timeout=timeout_s)
+                finally:
+                    timed_out = not call.done()
+                    if timed_out:
+                        call.cancel()
+                if timed_out:
+                    result = {"tool_slug": tool_slug, "status": "timeout", "error": f"Request exceeded {timeout_s}s timeout."}
+                    record_tool_call(tool_slug, "timeout", time.perf_counter() - started)
+                elif call.exception() is not None:
+                    record_tool_call(tool_slug, "failed", time.perf_counter() - started)
+                    raise call.exception()
+                else:
+                    result = call.result()
+                    record_tool_call(tool_slug, "cached" if result.get("cached") else "completed", time.perf_counter() - started)
+                if span is not None:
+                    span.set(**{k: result.get(k) for k in ("status", "cached", "coalesced", "attempts", "hedged")})
+                return result
+
+    async def _resolve_one(self, tool_slug: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        ttl_s = self.client.result_ttls_s.get(tool_slug, 0.0)
+        cache_key = self.client.result_cache_key(tool_slug, arguments)
+
+        if ttl_s > 0:
+            # The lookup may read the cache's disk layer and stats the Workbench, so it runs off the loop
+            cached = await asyncio.to_thread(self.client._cached_result, cache_key)
+            if cached is not None:
+                return cached
+
+        if tool_slug in self.client.idempotent_slugs:
+            result, shared = await self.single_flight.do(
+                cache_key, lambda: self._run_backend(tool_slug, arguments, cache_key, ttl_s)
+            )
+            return {**result, "coalesced": shared}
+        return await self._run_backend(tool_slug, arguments, cache_key, ttl_s)
+
+    async def _call_backend(self, tool_slug: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        async with self.client.rate_limiter.alimit(tool_slug, timeout=self.request_timeout_s):
+            started = time.perf_counter()
+            output = await self.backend.execute(tool_slug, arguments)
+        self.client.latency.record(tool_slug, time.perf_counter() - started)
+        return output
+
+    async def _run_backend(self, tool_slug: str, arguments: Dict[str, Any], cache_key: str, ttl_s: float) -> Dict[str, Any]:
+        started = time.perf_counter()
+        idempotent = tool_slug in self.client.idempotent_slugs
+        hedged = False
+
+        async def _attempt() -> Dict[str, Any]:
+            nonlocal hedged
+            if idempotent and self.client.hedge_requests:
+                hedge_after_s = self.client.latency.percentile(tool_slug, HEDGE_PERCENTILE)
+                output, sent = await ahedged_call(lambda: self._call_backend(tool_slug, arguments), hedge_after_s)
+                hedged = hedged or sent
+                return output
+            return await self._call_backend(tool_slug, arguments)
+
+        output, attempts = await acall_with_retry(_attempt, self.client.retry_policy if idempotent else NO_RETRY)
+        # Workbench writes touch the disk, so they run off the event loop
+        result = await asyncio.to_thread(self.client._record_output, tool_slug, output, cache_key, ttl_s)
+        return {
+            **result,
+            "cached": False,
+            "coalesced": False,
+            "attempts": attempts,
+            "hedged": hedged,
+            "execution_time_ms": int((time.perf_counter() - started) * 1000),
+        }
+
+    async def create_plan(self, use_case: str, primary_tool_slugs: List[str], session_key: Any = None) -> Dict[str, Any]:
+        """COMPOSIO_CREATE_PLAN. Planning is simulated locally and does no I/O."""
+        return self.client.create_plan(use_case, primary_tool_slugs, session_key=session_key)
+
+    async def multi_execute_tool(
+        self,
+        execution_requests: List[Dict[str, Any]],
+        session_id: str,
+        timeout_s: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Async COMPOSIO_MULTI_EXECUTE_TOOL; same result shape as ComposioClient.multi_execute_tool."""
+        print(f"-> Calling MULTI_EXECUTE_TOOL async (Parallel execution count: {len(execution_requests)})")
+        started = time.perf_counter()
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(execution_requests)
+        # Parent span of the per-call tool spans, like ComposioClient.multi_execute_tool's
+        with TRACER.span("AsyncComposioClient.multi_execute_tool", "composio"):
+            async for index, result in self.iter_multi_execute_tool(execution_requests, timeout_s=timeout_s):
+                results[index] = result
+
+        return {
+            "successful": any(res["status"] == "completed" for res in results),
+            "results": results,
+            "session_id": session_id,
+            "execution_time_ms": int((time.perf_counter() - started) * 1000),
+        }
+
+    async def iter_multi_execute_tool(
+        self,
+        execution_requests: List[Dict[str, Any]],
+        timeout_s: Optional[float] = None,
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Async streaming COMPOSIO_MULTI_EXECUTE_TOOL: yields (request_index, result) in completion order.
+        Each request gets `timeout_s` from the moment it holds a concurrency slot (see _execute_one),
+        so requests queued behind max_concurrency are not penalised.
+        """
+        timeout_s = self.request_timeout_s if timeout_s is None else timeout_s
+        tasks = {asyncio.ensure_future(self._execute_one(req, timeout_s)): i for i, req in enumerate(execution_requests)}
+
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=tasks.get):
+                    index = tasks[task]
+                    if task.cancelled() or task.exception() is not None:
+                        error = "cancelled" if task.cancelled() else str(task.exception())
+                        yield index, {
+                            "tool_slug": execution_requests[index].get("tool_slug"),
+                            "status": "failed",
+                            "error": error,
+                        }
+                    else:
+                        yield index, task.result()
+        finally:
+            for task in pending:
+                task.cancel()  # E.g. when the caller stops iterating
+
+    # Workbench and Remote Bash calls are local file/CPU work, so they run on worker threads
+
+    async def remote_workbench(self, action: str, key: str = None, data: Any = None) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.client.remote_workbench, action, key, data)
+
+    async def retrieve_many(self, keys: List[str]) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.client.retrieve_many, keys)
+
+    async def retrieve_range(self, key: str, offset: int, length: int) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.client.retrieve_range, key, offset, length)
+
+    async def remote_bash_tool(self, script: str, inputs: Optional[Dict[str, memoryview]] = None) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.client.remote_bash_tool, script, inputs)
+
+
+# --- Per-Event-Loop Client Registry ---
+# asyncio primitives are bound to the loop they are first used on, so each running loop gets its
+# own AsyncComposioClient (all sharing the process-wide sync client's caches and limits).
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncComposioClient]" = weakref.WeakKeyDictionary()
+_async_clients_lock = threading.Lock()
+
+def get_async_composio_client() -> AsyncComposioClient:
+    """Returns the AsyncComposioClient for the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    with _async_clients_lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            client = _async_clients[loop] = AsyncComposioClient()
+    return client
+
+def set_async_composio_client(client: Optional[AsyncComposioClient]):
+    """Replaces the running loop's client (e.g. with one on a local stand-in server); None resets it."""
+    loop = asyncio.get_running_loop()
+    with _async_clients_lock:
+        if client is None:
+            _async_clients.pop(loop, None)
+        else:
+            _async_clients[loop] = client
@@ -0,0 +1,175 @@
+import time
+import random
+import asyncio
+from typing import Dict, Any, Optional, Union
+from src.identity import stable_digest
+from src.tools.resilience import TransientToolError
+from src.tools.transport import AsyncTransport, Transport, TransportResponse, TOOL_EXECUTE_PATH
+
+# --- Tool Execution Backends ---
+# A backend performs ONE tool call (e.g. an Arxiv search) and returns its raw result.
+# The ComposioClient owns concurrency, ordering and timeouts; backends only execute.
+
+
+class ToolBackend:
+    """
+    Base interface for anything that can execute a single Composio tool call.
+    Subclasses must implement `execute` and return a dict with 'output_summary' and either
+    'data' (the raw payload, stored in the Workbench by the client) or an existing 'workbench_key'.
+    """
+    def execute(self, tool_slug: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        raise NotImplementedError("ToolBackend subclasses must implement execute().")
+
+
+def _seeded_rng(tool_slug: str, arguments: Dict[str, Any]) -> random.Random:
+    """Deterministic RNG per (slug, arguments), so identical requests yield identical payloads."""
+    return random.Random(stable_digest({"tool_slug": tool_slug, "arguments": arguments}))
+
+
+class LocalToolBackend(ToolBackend):
+    """
+    Local stand-in for the remote tool providers (Arxiv, PubChem, ...).
+    Produces deterministic simulated payloads, optionally after an injected delay,
+    so concurrency, timeouts and Workbench storage can be exercised without network access.
+    """
+    def __init__(self, latency_s: Optional[Union[float, Dict[str, float]]] = None):
+        # Either one delay for every slug, or a {tool_slug: seconds} mapping
+        self.latency_s = latency_s or 0.0
+
+    def _latency_for(self, tool_slug: str) -> float:
+        if isinstance(self.latency_s, dict):
+            return float(self.latency_s.get(tool_slug, 0.0))
+        return float(self.latency_s)
+
+    def _simulate_arxiv(self, arguments: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
+        query = arguments.get("query", "")
+        papers = [
+            {
+                "arxiv_id": f"{rng.randint(1500, 2512)}.{rng.randint(10000, 99999)}",
+                "title": f"{query} (study {i + 1})",
+                "abstract": f"Simulated abstract for '{query}'.",
+                "full_text": f"Simulated full text for '{query}', paper {i + 1}.",
+            }
+            for i in range(int(arguments.get("max_results", 5)))
+        ]
+        return {
+            "output_summary": f"Found {len(papers)} highly relevant papers. Raw text stored in workbench.",
+            "data": {"source": "arxiv", "query": query, "papers": papers},
+        }
+
+    def _simulate_pubchem(self, arguments: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
+        compounds = [
+            {
+                "cid": rng.randint(1000, 9999999),
+                "name": f"candidate-{keyword.replace(' ', '-')}",
+                "molecular_weight": round(rng.uniform(150.0, 900.0), 2),
+                "logp": round(rng.uniform(-2.0, 7.0), 2),
+                "toxicity_flag": rng.random() < 0.2,
+            }
+            for keyword in arguments.get("keywords", [])
+        ]
+        return {
+            "output_summary": f"Retrieved {len(compounds)} candidate chemical structures. Raw data stored in workbench.",
+            "data": {"source": "pubchem", "compound_type": arguments.get("compound_type"), "compounds": compounds},
+        }
+
+    def execute(self, tool_slug: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        delay = self._latency_for(tool_slug)
+        if delay > 0:
+            time.sleep(delay)
+
+        rng = _seeded_rng(tool_slug, arguments)
+        if tool_slug == "arxiv_search_tool_slug":
+            return self._simulate_arxiv(arguments, rng)
+        if tool_slug == "pubchem_query_tool_slug":
+            return self._simulate_pubchem(arguments, rng)
+        return {
+            "output_summary": f"Executed {tool_slug} with {len(arguments)} argument(s). No raw data produced.",
+            "workbench_key": None,
+        }
+
+
+def check_tool_response(tool_slug: str, response: TransportResponse) -> Dict[str, Any]:
+    """Decodes a tool-execution response; throttling and 5xx errors are raised as retryable."""
+    if response.status == 429 or response.status >= 500:
+        raise TransientToolError(f"{tool_slug} failed with HTTP {response.status}.")
+    if response.status >= 400:
+        detail = response.body[:200].decode("utf-8", "replace")
+        raise RuntimeError(f"{tool_slug} failed with HTTP {response.status}: {detail}")
+    return response.json()
+
+
+class HTTPToolBackend(ToolBackend):
+    """Executes tool calls over a pooled Transport using the TOOL_EXECUTE_PATH wire protocol."""
+    def __init__(
+        self,
+        transport: Transport,
+        user_id: str,
+        api_key: Optional[str] = None,
+        idempotent_slugs: frozenset = frozenset(),
+    ):
+        self.transport = transport
+        self.user_id = user_id
+        self.headers = {"x-api-key": api_key} if api_key else {}
+        # Only these tools may be replayed by the transport after a stale keep-alive connection
+        self.idempotent_slugs = idempotent_slugs
+
+    def execute(self, tool_slug: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        response = self.transport.request(
+            "POST",
+            TOOL_EXECUTE_PATH.format(tool_slug=tool_slug),
+            json_body={"arguments": arguments, "user_id": self.user_id},
+            headers=self.headers,
+            idempotent=tool_slug in self.idempotent_slugs,
+        )
+        return check_tool_response(tool_slug, response)
+
+
+# --- Async Tool Execution Backends (used by the AsyncComposioClient) ---
+
+
+class AsyncToolBackend:
+    """Async counterpart of ToolBackend: `execute` is a coroutine with the same result contract."""
+    async def execute(self, tool_slug: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        raise NotImplementedError("AsyncToolBackend subclasses must implement execute().")
+
+    async def aclose(self):
+        """Releases any connections held by the backend."""
+
+
+class ThreadedAsyncBackend(AsyncToolBackend):
+    """Adapts a blocking ToolBackend by running each call on the event loop's default thread pool."""
+    def __init__(self, backend: ToolBackend):
+        self.backend = backend
+
+    async def execute(self, tool_slug: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.backend.execute, tool_slug, arguments)
+
+
+class AsyncHTTPToolBackend(AsyncToolBackend):
+    """Executes tool calls over an AsyncTransport using the TOOL_EXECUTE_PATH wire protocol."""
+    def __init__(
+        self,
+        transport: AsyncTransport,
+        user_id: str,
+        api_key: Optional[str] = None,
+        idempotent_slugs: frozenset = frozenset(),
+    ):
+        self.transport = transport
+        self.user_id = user_id
+        self.headers = {"x-api-key": api_key} if api_key else {}
+        # Only these tools may be replayed by the transport after a stale keep-alive connection
+        self.idempotent_slugs = idempotent_slugs
+
+    async def execute(self, tool_slug: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        response = await self.transport.request(
+            "POST",
+            TOOL_EXECUTE_PATH.format(tool_slug=tool_slug),
+            json_body={"arguments": arguments, "user_id": self.user_id},
+            headers=self.headers,
+            idempotent=tool_slug in self.idempotent_slugs,
+        )
+        return check_tool_response(tool_slug, response)
+
+    async def aclose(self):
+        await self.transport.aclose()
@@ -0,0 +1,153 @@
+import os
+import json
+import time
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# --- In-Process TTL + LRU Cache (optionally persisted to disk) ---
+# Values must be JSON-serialisable when a persist_dir is configured. Keys should be stable
+# digests (see src.identity), so entries written by one process are valid in every other.
+
+
+class TTLCache:
+    """
+    Thread-safe cache with per-entry expiry and least-recently-used eviction.
+    With `persist_dir`, entries are also written to disk (one JSON file per key) and
+    in-memory misses fall back to disk, so cached results survive restarts and are shared
+    by processes that point at the same directory. Expired and evicted entries are removed
+    from disk as well, and expired files left by earlier processes are pruned on start-up.
+    """
+    def __init__(self, max_entries: int = 1024, ttl_s: float = 3600.0, persist_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.persist_dir = persist_dir
+        if persist_dir:
+            os.makedirs(persist_dir, mode=0o700, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        if persist_dir:
+            self.prune()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.persist_dir, f"{key}.json")
+
+    def _load_from_disk(self, key: str) -> Optional[Tuple[float, Any]]:
+        try:
+            with open(self._disk_path(key), "r", encoding="utf-8") as f:
+                record = json.load(f)
+            return record["expires_at"], record["value"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _write_to_disk(self, key: str, expires_at: float, value: Any):
+        # Write to a temp file and rename, so concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.persist_dir, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"expires_at": expires_at, "value": value}, f)
+            os.replace(tmp_path, self._disk_path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def _remove_from_disk(self, key: str):
+        if self.persist_dir:
+            try:
+                os.unlink(self._disk_path(key))
+            except FileNotFoundError:
+                pass
+
+    def _remember(self, key: str, expires_at: float, value: Any):
+        """Inserts into the in-memory LRU, evicting the least recently used entries (caller holds the lock)."""
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._remove_from_disk(evicted)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the cached value, or None if absent or expired."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self.persist_dir:
+                entry = self._load_from_disk(key)
+                if entry is not None:
+                    self._remember(key, *entry)
+
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    self._entries.pop(key, None)
+                    self._remove_from_disk(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl_s: Optional[float] = None):
+        """Stores a value for `ttl_s` seconds (defaults to the cache-wide TTL)."""
+        expires_at = time.time() + (self.ttl_s if ttl_s is None else ttl_s)
+        with self._lock:
+            self._remember(key, expires_at, value)
+            if self.persist_dir:
+                self._write_to_disk(key, expires_at, value)
+
+    def invalidate(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._remove_from_disk(key)
+
+    def prune(self) -> int:
+        """Removes expired entries from memory and disk (and stray temp files); returns how many."""
+        now = time.time()
+        removed = 0
+        with self._lock:
+            for key in [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]:
+                del self._entries[key]
+                self._remove_from_disk(key)
+                removed += 1
+            if not self.persist_dir:
+                return removed
+            for name in os.listdir(self.persist_dir):
+                path = os.path.join(self.persist_dir, name)
+                if name.startswith(".tmp-"):
+                    stale = os.path.getmtime(path) < now - 3600  # Not a write in progress
+                elif name.endswith(".json"):
+                    entry = self._load_from_disk(name[:-len(".json")])
+                    stale = entry is None or entry[0] <= now
+                else:
+                    continue
+                if stale:
+                    try:
+                        os.unlink(path)
+                        removed += 1
+                    except OSError:
+                        pass
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self.persist_dir:
+                for name in os.listdir(self.persist_dir):
+                    if name.endswith(".json"):
+                        os.unlink(os.path.join(self.persist_dir, name))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits, misses, entries = self.hits, self.misses, len(self._entries)
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "entries": entries,
+        }
@@ -1,128 +1,620 @@
-import os
-import json
-from typing import List, Dict, Any
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-
-# --- Placeholder Tool Slugs (To be replaced with actual Composio slugs in a real deployment) ---
-TOOL_SLUGS = {
-    "ARXIV_SEARCH": "arxiv_search_tool_slug",
-    "PUBCHEM_QUERY": "pubchem_query_tool_slug",
-    "NOTION_DRAFT": "notion_create_page_slug",
-    "REMOTE_BASH": "COMPOSIO_REMOTE_BASH_TOOL",
-    "MULTI_EXECUTE": "COMPOSIO_MULTI_EXECUTE_TOOL",
-    "CREATE_PLAN": "COMPOSIO_CREATE_PLAN",
-    "REMOTE_WORKBENCH": "COMPOSIO_REMOTE_WORKBENCH",
-}
-
-class ComposioClient:
-    """
-    Simulated Client for the Composio Tool Router.
-    This class simulates calling the meta-tools with structured inputs and outputs,
-    crucial for demonstrating the core agentic workflow.
-    """
-    def __init__(self):
-        self.api_key = os.getenv("COMPOSIO_API_KEY")
-        self.user_id = os.getenv("COMPOSIO_USER_ID") or "default-user-id"
-        
-        # Check for API key adherence to Quality Guidelines (no hardcoding)
-        if not self.api_key or self.api_key == "your-composio-api-key-here":
-            print("WARNING: COMPOSIO_API_KEY not found. Tools will be SIMULATED.")
-            self.api_key = "SIMULATED_KEY"
-        
-        print(f"Composio Client initialized for User ID: {self.user_id}")
-
-    def create_plan(self, use_case: str, primary_tool_slugs: List[str]) -> Dict[str, Any]:
-        """
-        Simulates COMPOSIO_CREATE_PLAN. 
-        Generates a structured, multi-step execution plan based on the goal.
-        """
-        print(f"-> Calling CREATE_PLAN for: {use_case}")
-        
-        return {
-            "successful": True,
-            "complexity_assessment": "Hard (requires multi-agent collaboration and large file processing).",
-            "workflow_steps": [
-                f"1. Literature Review (Parallel search using {primary_tool_slugs[0]} and {primary_tool_slugs[1]})",
-                "2. Store raw results in Remote Workbench.",
-                "3. Execute Python Code (Remote Bash) for data cleaning and initial analysis.",
-                "4. Draft Final Hypothesis and Protocol.",
-                "5. Publish report to Notion/Docs."
-            ],
-            "session_id": f"sess-{hash(use_case)}",
-            "reasoning": "The complexity requires orchestration across research tools and a custom execution environment."
-        }
-
-    def multi_execute_tool(self, execution_requests: List[Dict[str, Any]], session_id: str) -> Dict[str, Any]:
-        """
-        Simulates COMPOSIO_MULTI_EXECUTE_TOOL. 
-        Returns simulated parallel outputs and critical Workbench keys.
-        """
-        print(f"-> Calling MULTI_EXECUTE_TOOL (Parallel execution count: {len(execution_requests)})")
-        
-        # Simulate the output of parallel research API calls, returning Workbench keys
-        return {
-            "successful": True,
-            "results": [
-                {
-                    "tool_slug": TOOL_SLUGS["ARXIV_SEARCH"],
-                    "output_summary": "Found 5 highly relevant papers. Raw text stored in workbench.",
-                    "workbench_key": "ARXIV-RAW-DATA-KEY-123", # Key for the Workbench
-                    "status": "completed"
-                },
-                {
-                    "tool_slug": TOOL_SLUGS["PUBCHEM_QUERY"],
-                    "output_summary": "Retrieved 2 candidate chemical structures. Raw data stored in workbench.",
-                    "workbench_key": "PUBCHEM-RAW-DATA-KEY-456", # Key for the Workbench
-                    "status": "completed"
-                }
-            ],
-            "session_id": session_id
-        }
-    
-    def remote_workbench(self, action: str, key: str = None, data: Any = None) -> Dict[str, Any]:
-        """
-        Simulates COMPOSIO_REMOTE_WORKBENCH (Storage/Retrieval).
-        Crucial for demonstrating large context management.
-        """
-        if action == "store":
-            key = key or f"workbench-data-{hash(str(data))}"
-            print(f"-> Calling REMOTE_WORKBENCH: Stored large data under key: {key}")
-            return {"successful": True, "workbench_key": key}
-        
-        elif action == "retrieve":
-            if key in ["ARXIV-RAW-DATA-KEY-123", "PUBCHEM-RAW-DATA-KEY-456"]:
-                print(f"-> Calling REMOTE_WORKBENCH: Retrieved complex data for key: {key}")
-                # Simulate the retrieval of the large, complex data for the LLM to analyze
-                return {
-                    "successful": True,
-                    "data": f"{{... large, structured scientific data for {key} ...}}",
-                }
-            
-        return {"successful": False, "error": "Invalid action or key."}
-    
-    def remote_bash_tool(self, script: str) -> Dict[str, Any]:
-        """
-        Simulates COMPOSIO_REMOTE_BASH_TOOL. 
-        Simulates custom code execution (e.g., Python/Pandas analysis).
-        """
-        print("-> Calling REMOTE_BASH_TOOL (Simulating Python/Pandas execution)")
-        
-        # Simulated structured output of the scientific analysis
-        analysis_output = {
-            "final_clean_compounds": 3,
-            "critical_risk_flag": False,
-            "summary": "Data cleaning complete. Identified 3 high-potential compounds that passed initial risk filtering."
-        }
-        
-        return {
-            "successful": True,
-            "stdout": json.dumps(analysis_output),
-            "stderr": "",
-            "execution_time_ms": 450
-        }
-
-# Instantiate the client globally for easy access by other tool wrappers
-COMPOSIO_CLIENT = ComposioClient()
+import os
+import json
+import time
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+from dotenv import load_dotenv
+from src.identity import stable_digest
+from src.tracing import TRACER, traced
+from src.metrics import METRICS, WORKBENCH_BYTES_STORED, WORKBENCH_BYTES_RETRIEVED, record_tool_call
+from src.tools.backends import ToolBackend, LocalToolBackend, HTTPToolBackend
+from src.tools.transport import Transport, create_transport
+from src.tools.workbench import LocalWorkbenchStore, DEFAULT_CHUNK_SIZE
+from src.tools.caching import TTLCache
+from src.tools.concurrency import SingleFlight, RateLimiter, RateLimit
+from src.tools.resilience import RetryPolicy, NO_RETRY, LatencyTracker, call_with_retry, hedged_call
+from src.tools.sandbox import SandboxPool, SandboxLimits, sandbox_supported, DEFAULT_PRELOAD_MODULES
+
+# Load environment variables
+load_dotenv()
+
+# --- Placeholder Tool Slugs (To be replaced with actual Composio slugs in a real deployment) ---
+TOOL_SLUGS = {
+    "ARXIV_SEARCH": "arxiv_search_tool_slug",
+    "PUBCHEM_QUERY": "pubchem_query_tool_slug",
+    "NOTION_DRAFT": "notion_create_page_slug",
+    "REMOTE_BASH": "COMPOSIO_REMOTE_BASH_TOOL",
+    "MULTI_EXECUTE": "COMPOSIO_MULTI_EXECUTE_TOOL",
+    "CREATE_PLAN": "COMPOSIO_CREATE_PLAN",
+    "REMOTE_WORKBENCH": "COMPOSIO_REMOTE_WORKBENCH",
+}
+
+# --- Multi-Execute Engine Defaults ---
+DEFAULT_MAX_WORKERS = 8          # Upper bound on concurrently running tool calls per client
+DEFAULT_REQUEST_TIMEOUT_S = 30.0 # Per-request deadline, measured from dispatch
+
+DEFAULT_RETRY_POLICY = RetryPolicy(max_attempts=3, base_delay_s=0.25, max_delay_s=4.0)
+HEDGE_PERCENTILE = 0.95          # Send a hedge once a call outlives this latency percentile for its slug
+
+# Read-only tools: identical calls return identical results, so they are safe to coalesce, retry and hedge
+IDEMPOTENT_TOOL_SLUGS = frozenset({TOOL_SLUGS["ARXIV_SEARCH"], TOOL_SLUGS["PUBCHEM_QUERY"]})
+
+# --- Per-Slug Rate Limits ---
+# Token-bucket rates and concurrency caps that keep us under the providers' published limits.
+# Override with COMPOSIO_RATE_LIMITS='{"<slug>": {"rate_per_s": 2, "burst": 2, "max_in_flight": 2}}'.
+DEFAULT_RATE_LIMITS = {
+    TOOL_SLUGS["ARXIV_SEARCH"]: RateLimit(rate_per_s=4.0, burst=8, max_in_flight=8),
+    TOOL_SLUGS["PUBCHEM_QUERY"]: RateLimit(rate_per_s=5.0, burst=5, max_in_flight=5),
+}
+
+def load_rate_limits() -> Dict[str, RateLimit]:
+    """Returns DEFAULT_RATE_LIMITS updated with any overrides from COMPOSIO_RATE_LIMITS (JSON)."""
+    limits = dict(DEFAULT_RATE_LIMITS)
+    overrides = os.getenv("COMPOSIO_RATE_LIMITS")
+    if overrides:
+        for slug, limit in json.loads(overrides).items():
+            limit = RateLimit(**limit)
+            if not limit.rate_per_s > 0 or limit.max_in_flight < 1:
+                raise ValueError(f"COMPOSIO_RATE_LIMITS['{slug}'] needs rate_per_s > 0 and max_in_flight >= 1.")
+            limits[TOOL_SLUGS.get(slug, slug)] = limit
+    return limits
+
+# --- Tool Result Cache Defaults ---
+# Only slugs listed here are cached (side-effecting tools such as NOTION_DRAFT never are).
+# Literature search results go stale slowly; live chemistry lookups are refreshed more often.
+DEFAULT_RESULT_TTLS_S = {
+    TOOL_SLUGS["ARXIV_SEARCH"]: 24 * 3600.0,
+    TOOL_SLUGS["PUBCHEM_QUERY"]: 15 * 60.0,
+}
+DEFAULT_RESULT_CACHE_MAX_ENTRIES = 4096
+
+# --- Remote Bash Sandbox Defaults ---
+# Scripts run in warm local worker processes; set REMOTE_BASH_SANDBOX=0 to use the simulated output.
+ANALYSIS_ENGINE_MODULE = "src.risk_engine"  # Imported by each worker up front, with numpy/pandas
+
+def load_sandbox_limits() -> SandboxLimits:
+    """
+    SandboxLimits with overrides from SANDBOX_CPU_TIME_S, SANDBOX_WALL_TIME_S, SANDBOX_MEMORY_MB
+    and SANDBOX_QUEUE_TIMEOUT_S (unset: runs wait for a free worker without a limit).
+    """
+    defaults = SandboxLimits()
+    queue_timeout_s = os.getenv("SANDBOX_QUEUE_TIMEOUT_S")
+    return SandboxLimits(
+        cpu_time_s=float(os.getenv("SANDBOX_CPU_TIME_S", defaults.cpu_time_s)),
+        wall_time_s=float(os.getenv("SANDBOX_WALL_TIME_S", defaults.wall_time_s)),
+        memory_bytes=int(os.getenv("SANDBOX_MEMORY_MB", defaults.memory_bytes // 1024 ** 2)) * 1024 ** 2,
+        queue_timeout_s=float(queue_timeout_s) if queue_timeout_s else defaults.queue_timeout_s,
+    )
+
+class ComposioClient:
+    """
+    Simulated Client for the Composio Tool Router.
+    This class simulates calling the meta-tools with structured inputs and outputs,
+    crucial for demonstrating the core agentic workflow.
+    """
+    def __init__(
+        self,
+        backend: Optional[ToolBackend] = None,
+        workbench: Optional[LocalWorkbenchStore] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        request_timeout_s: float = DEFAULT_REQUEST_TIMEOUT_S,
+        result_cache: Optional[TTLCache] = None,
+        result_ttls_s: Optional[Dict[str, float]] = None,
+        idempotent_slugs: Optional[frozenset] = None,
+        rate_limits: Optional[Dict[str, RateLimit]] = None,
+        retry_policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+        hedge_requests: bool = False,
+        transport: Optional[Transport] = None,
+        sandbox: Optional[SandboxPool] = None,
+    ):
+        self.api_key = os.getenv("COMPOSIO_API_KEY")
+        self.user_id = os.getenv("COMPOSIO_USER_ID") or "default-user-id"
+        
+        # Check for API key adherence to Quality Guidelines (no hardcoding)
+        if not self.api_key or self.api_key == "your-composio-api-key-here":
+            print("WARNING: COMPOSIO_API_KEY not found. Tools will be SIMULATED.")
+            self.api_key = "SIMULATED_KEY"
+        
+        # Shared, connection-pooled HTTP transport: injected, or created for COMPOSIO_BASE_URL.
+        # Without either, tools run on the local stand-in backend and no connections are made.
+        base_url = os.getenv("COMPOSIO_BASE_URL")
+        if transport is None and backend is None and base_url:
+            # Socket timeout = request timeout, so an abandoned call frees its worker soon after
+            transport = create_transport(base_url, max_connections_per_host=max_workers, timeout_s=request_timeout_s)
+        self.transport = transport
+
+        # Idempotent tools: concurrent identical calls are coalesced, and failures retried or replayed
+        self.idempotent_slugs = IDEMPOTENT_TOOL_SLUGS if idempotent_slugs is None else idempotent_slugs
+
+        # Pluggable execution backend (local stand-in unless a real one is injected)
+        if backend is None and transport is not None:
+            backend = HTTPToolBackend(
+                transport, user_id=self.user_id, api_key=self.api_key, idempotent_slugs=self.idempotent_slugs
+            )
+        self.backend = backend or LocalToolBackend()
+        # Content-addressed Workbench storage for large raw payloads
+        self.workbench = workbench or LocalWorkbenchStore()
+        # Per-slug cache of tool results (workbench keys + summaries); RESULT_CACHE_DIR persists it
+        self.result_ttls_s = DEFAULT_RESULT_TTLS_S if result_ttls_s is None else result_ttls_s
+        self.result_cache = result_cache or TTLCache(
+            max_entries=int(os.getenv("RESULT_CACHE_MAX_ENTRIES", DEFAULT_RESULT_CACHE_MAX_ENTRIES)),
+            persist_dir=os.getenv("RESULT_CACHE_DIR") or None,
+        )
+        METRICS.register_cache("tool_result", self.result_cache.stats)
+        self.single_flight = SingleFlight()
+        # Per-slug token buckets and in-flight caps, shared by every thread using this client
+        self.rate_limiter = RateLimiter(load_rate_limits() if rate_limits is None else rate_limits)
+        # Transient failures of idempotent tools are retried with jittered backoff; optionally a
+        # duplicate (hedge) request is sent once a call is slower than the slug's p95 latency
+        self.retry_policy = retry_policy
+        self.hedge_requests = hedge_requests or os.getenv("COMPOSIO_HEDGE_REQUESTS", "").lower() in ("1", "true")
+        self.latency = LatencyTracker()
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self.max_workers = max_workers
+        self.request_timeout_s = request_timeout_s
+        # Warm worker processes for Remote Bash scripts, started on first use
+        self._sandbox = sandbox
+        self.sandbox_enabled = sandbox is not None or (
+            sandbox_supported() and os.getenv("REMOTE_BASH_SANDBOX", "1").lower() not in ("0", "false")
+        )
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        # Rate-limit queues and pool usage are read by the metrics exporters at scrape time
+        METRICS.register_rate_limiter(self.rate_limiter.stats)
+        METRICS.register_pool("transport", self.transport_stats)
+        METRICS.register_pool("sandbox", self.sandbox_stats)
+
+        print(f"Composio Client initialized for User ID: {self.user_id}")
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Creates the bounded worker pool on first use and shares it across calls."""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="composio-exec",
+                    )
+        return self._executor
+
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        """Separate pool for hedged attempts, so they never wait behind the multi-execute workers."""
+        if self._hedge_executor is None:
+            with self._executor_lock:
+                if self._hedge_executor is None:
+                    self._hedge_executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers * 2,
+                        thread_name_prefix="composio-hedge",
+                    )
+        return self._hedge_executor
+
+    def transport_stats(self) -> Dict[str, Any]:
+        """Connection-pool statistics (connections created vs reused) of the HTTP transport, if any."""
+        return self.transport.stats() if self.transport is not None else {}
+
+    def sandbox_stats(self) -> Dict[str, Any]:
+        """Worker-pool statistics of the Remote Bash sandbox, once it has been started."""
+        sandbox = self._sandbox
+        return sandbox.stats() if sandbox is not None else {}
+
+    def _get_sandbox(self) -> Optional[SandboxPool]:
+        """Creates the Remote Bash sandbox pool on first use; None when the sandbox is disabled."""
+        if self._sandbox is None and self.sandbox_enabled:
+            with self._executor_lock:
+                if self._sandbox is None:
+                    self._sandbox = SandboxPool(
+                        size=int(os.getenv("SANDBOX_WORKERS", "2")),
+                        limits=load_sandbox_limits(),
+                        preload=DEFAULT_PRELOAD_MODULES + (ANALYSIS_ENGINE_MODULE,),
+                    )
+        return self._sandbox
+
+    def shutdown(self, wait: bool = True):
+        """
+        Releases the worker pools and removes the client's metrics registrations. The client can
+        still be used afterwards (the pools are recreated), but is no longer exported.
+        """
+        METRICS.unregister(self.result_cache.stats, self.rate_limiter.stats, self.transport_stats, self.sandbox_stats)
+        with self._executor_lock:
+            for executor in (self._executor, self._hedge_executor):
+                if executor is not None:
+                    executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+            self._hedge_executor = None
+            if self._sandbox is not None:
+                self._sandbox.close()
+                self._sandbox = None
+
+    @staticmethod
+    def result_cache_key(tool_slug: str, arguments: Dict[str, Any]) -> str:
+        """Stable identity of a tool call: slug plus canonicalised arguments."""
+        return stable_digest({"tool_slug": tool_slug, "arguments": arguments})
+
+    def _cached_result(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Returns a cached result whose Workbench payload still exists, or None."""
+        cached = self.result_cache.get(cache_key)
+        if cached is None:
+            return None
+        if cached.get("workbench_key") and not self.workbench.exists(cached["workbench_key"]):
+            self.result_cache.invalidate(cache_key)
+            return None
+        return {**cached, "cached": True, "coalesced": False, "execution_time_ms": 0}
+
+    def _execute_one(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Runs a single tool call and normalises its output. Results are served from the result
+        cache when possible, and concurrent identical calls to idempotent tools are coalesced.
+        """
+        tool_slug = request.get("tool_slug")
+        started = time.perf_counter()
+        with TRACER.span(f"tool:{tool_slug}", "tool_call") as span:
+            try:
+                result = self._resolve_one(tool_slug, request.get("arguments", {}))
+            except Exception:
+                record_tool_call(tool_slug, "failed", time.perf_counter() - started)
+                raise
+            record_tool_call(tool_slug, "cached" if result.get("cached") else "completed", time.perf_counter() - started)
+            if span is not None:
+                span.set(**{k: result.get(k) for k in ("status", "cached", "coalesced", "attempts", "hedged")})
+            return result
+
+    def _resolve_one(self, tool_slug: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        ttl_s = self.result_ttls_s.get(tool_slug, 0.0)
+        cache_key = self.result_cache_key(tool_slug, arguments)
+
+        if ttl_s > 0:
+            cached = self._cached_result(cache_key)
+            if cached is not None:
+                return cached
+
+        if tool_slug in self.idempotent_slugs:
+            result, shared = self.single_flight.do(
+                cache_key, lambda: self._run_backend(tool_slug, arguments, cache_key, ttl_s)
+            )
+            return {**result, "coalesced": shared}
+        return self._run_backend(tool_slug, arguments, cache_key, ttl_s)
+
+    def _call_backend(self, tool_slug: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """One rate-limited attempt against the backend; successful latencies feed the hedge threshold."""
+        with self.rate_limiter.limit(tool_slug, timeout=self.request_timeout_s):
+            started = time.perf_counter()
+            output = self.backend.execute(tool_slug, arguments)
+        self.latency.record(tool_slug, time.perf_counter() - started)
+        return output
+
+    def _record_output(self, tool_slug: str, output: Dict[str, Any], cache_key: str, ttl_s: float) -> Dict[str, Any]:
+        """Stores a backend output's raw payload in the Workbench and caches the normalised result."""
+        # Raw payloads go straight to the Workbench; only the key travels back to the agent
+        workbench_key = output.get("workbench_key")
+        if output.get("data") is not None:
+            workbench_key = self.workbench.store(output["data"])
+            size_bytes = self.workbench.size(workbench_key)
+            WORKBENCH_BYTES_STORED.inc(size_bytes)
+            TRACER.annotate(bytes_out=size_bytes)
+
+        result = {
+            "tool_slug": tool_slug,
+            "output_summary": output.get("output_summary", ""),
+            "workbench_key": workbench_key,
+            "status": "completed",
+        }
+        if ttl_s > 0:
+            self.result_cache.set(cache_key, result, ttl_s=ttl_s)
+        return result
+
+    def _run_backend(self, tool_slug: str, arguments: Dict[str, Any], cache_key: str, ttl_s: float) -> Dict[str, Any]:
+        """Executes the call on the backend, stores its payload in the Workbench and caches the result."""
+        started = time.perf_counter()
+        idempotent = tool_slug in self.idempotent_slugs
+        hedged = False
+
+        def _attempt() -> Dict[str, Any]:
+            nonlocal hedged
+            if idempotent and self.hedge_requests:
+                hedge_after_s = self.latency.percentile(tool_slug, HEDGE_PERCENTILE)
+                output, sent = hedged_call(
+                    lambda: self._call_backend(tool_slug, arguments), hedge_after_s, self._get_hedge_executor()
+                )
+                hedged = hedged or sent
+                return output
+            return self._call_backend(tool_slug, arguments)
+
+        # Non-idempotent tools (e.g. creating a Notion page) are never retried
+        output, attempts = call_with_retry(_attempt, self.retry_policy if idempotent else NO_RETRY)
+        result = self._record_output(tool_slug, output, cache_key, ttl_s)
+        return {
+            **result,
+            "cached": False,
+            "coalesced": False,
+            "attempts": attempts,
+            "hedged": hedged,
+            "execution_time_ms": int((time.perf_counter() - started) * 1000),
+        }
+
+    def session_id_for(self, session_key: Any) -> str:
+        """
+        Returns the session ID that CREATE_PLAN assigns to a session key (by default the use case).
+        The ID is a stable content hash, identical across processes, so caches and resume logic
+        can rely on it. Exposed so that stages which only need the session (e.g. parallel research)
+        can start before planning finishes.
+        """
+        return f"sess-{stable_digest(session_key)}"
+
+    @traced("composio")
+    def create_plan(self, use_case: str, primary_tool_slugs: List[str], session_key: Any = None) -> Dict[str, Any]:
+        """
+        Simulates COMPOSIO_CREATE_PLAN. 
+        Generates a structured, multi-step execution plan based on the goal.
+        `session_key` (e.g. the canonical ResearchQuery) determines the session ID; it defaults to the use case.
+        """
+        print(f"-> Calling CREATE_PLAN for: {use_case}")
+        
+        return {
+            "successful": True,
+            "complexity_assessment": "Hard (requires multi-agent collaboration and large file processing).",
+            "workflow_steps": [
+                f"1. Literature Review (Parallel search using {primary_tool_slugs[0]} and {primary_tool_slugs[1]})",
+                "2. Store raw results in Remote Workbench.",
+                "3. Execute Python Code (Remote Bash) for data cleaning and initial analysis.",
+                "4. Draft Final Hypothesis and Protocol.",
+                "5. Publish report to Notion/Docs."
+            ],
+            "session_id": self.session_id_for(use_case if session_key is None else session_key),
+            "reasoning": "The complexity requires orchestration across research tools and a custom execution environment."
+        }
+
+    @traced("composio")
+    def multi_execute_tool(
+        self,
+        execution_requests: List[Dict[str, Any]],
+        session_id: str,
+        timeout_s: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Simulates COMPOSIO_MULTI_EXECUTE_TOOL.
+        Dispatches every request concurrently on the bounded worker pool and returns
+        the results in request order. Wall-clock time is that of the slowest request.
+        A request that fails or exceeds its timeout is reported with status 'failed'
+        or 'timeout' instead of aborting the whole batch.
+        """
+        print(f"-> Calling MULTI_EXECUTE_TOOL (Parallel execution count: {len(execution_requests)})")
+        started = time.perf_counter()
+
+        # Collect the streamed results and put them back in request order
+        results: List[Optional[Dict[str, Any]]] = [None] * len(execution_requests)
+        for index, result in self.iter_multi_execute_tool(execution_requests, timeout_s=timeout_s):
+            results[index] = result
+
+        return {
+            "successful": any(res["status"] == "completed" for res in results),
+            "results": results,
+            "session_id": session_id,
+            "execution_time_ms": int((time.perf_counter() - started) * 1000),
+        }
+
+    def iter_multi_execute_tool(
+        self,
+        execution_requests: List[Dict[str, Any]],
+        timeout_s: Optional[float] = None,
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Streaming form of COMPOSIO_MULTI_EXECUTE_TOOL.
+        Dispatches every request concurrently and yields (request_index, result) pairs
+        in completion order, so callers can start on the fastest results immediately.
+        Each request gets `timeout_s` from the moment a worker picks it up, so requests queued
+        behind a full pool are not penalised; one still running at its deadline is yielded
+        with status 'timeout'. A running backend call cannot be interrupted: it keeps its
+        worker until it returns (for HTTP backends, at most the transport's socket timeout).
+        """
+        timeout_s = self.request_timeout_s if timeout_s is None else timeout_s
+        executor = self._get_executor()
+        dispatched_at: Dict[int, float] = {}
+
+        def _dispatch(index: int, request: Dict[str, Any]) -> Dict[str, Any]:
+            dispatched_at[index] = time.monotonic()
+            return self._execute_one(request)
+
+        # Each call runs in a copy of the caller's context, so its span nests under the caller's
+        futures = {
+            executor.submit(contextvars.copy_context().run, _dispatch, i, req): i
+            for i, req in enumerate(execution_requests)
+        }
+
+        pending = set(futures)
+        try:
+            while pending:
+                now = time.monotonic()
+                expired = [f for f in pending if futures[f] in dispatched_at and now - dispatched_at[futures[f]] >= timeout_s]
+                for future in sorted(expired, key=futures.get):
+                    pending.discard(future)
+                    index = futures[future]
+                    yield index, {
+                        "tool_slug": execution_requests[index].get("tool_slug"),
+                        "status": "timeout",
+                        "error": f"Request exceeded {timeout_s}s timeout.",
+                    }
+                if not pending:
+                    break
+
+                # Sleep until the earliest running request's deadline; queued ones have none yet
+                deadlines = [dispatched_at[futures[f]] + timeout_s for f in pending if futures[f] in dispatched_at]
+                wait_s = max(0.0, min(deadlines) - now) if deadlines else timeout_s
+                done, _ = wait(pending, timeout=wait_s, return_when=FIRST_COMPLETED)
+                for future in sorted(done, key=futures.get):
+                    pending.discard(future)
+                    index = futures[future]
+                    try:
+                        yield index, future.result()
+                    except Exception as e:
+                        yield index, {
+                            "tool_slug": execution_requests[index].get("tool_slug"),
+                            "status": "failed",
+                            "error": str(e),
+                        }
+        finally:
+            for future in pending:
+                future.cancel()  # Only prevents queued work (e.g. when the caller stops iterating)
+
+    @traced("composio")
+    def remote_workbench(self, action: str, key: str = None, data: Any = None) -> Dict[str, Any]:
+        """
+        Simulates COMPOSIO_REMOTE_WORKBENCH (Storage/Retrieval).
+        Crucial for demonstrating large context management.
+        Payloads are content-addressed (SHA-256) and deduplicated; 'retrieve' returns a
+        zero-copy, read-only memoryview over the memory-mapped payload.
+        """
+        if action == "store":
+            key = self.workbench.store(data, name=key)
+            print(f"-> Calling REMOTE_WORKBENCH: Stored large data under key: {key}")
+            size_bytes = self.workbench.size(key)
+            WORKBENCH_BYTES_STORED.inc(size_bytes)
+            TRACER.annotate(bytes_in=size_bytes)
+            return {"successful": True, "workbench_key": key, "size_bytes": size_bytes}
+        
+        elif action == "retrieve":
+            if key and self.workbench.exists(key):
+                print(f"-> Calling REMOTE_WORKBENCH: Retrieved complex data for key: {key}")
+                payload = self.workbench.retrieve(key)
+                WORKBENCH_BYTES_RETRIEVED.inc(len(payload))
+                TRACER.annotate(bytes_out=len(payload))
+                return {
+                    "successful": True,
+                    "data": payload,
+                    "size_bytes": len(payload),
+                }
+            
+        return {"successful": False, "error": "Invalid action or key."}
+    
+    @traced("composio")
+    def retrieve_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Batch COMPOSIO_REMOTE_WORKBENCH retrieval.
+        Fetches all keys concurrently on the worker pool instead of one round trip per key.
+        Returns zero-copy payload views keyed by workbench key, plus any keys that were not found.
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        print(f"-> Calling REMOTE_WORKBENCH: Batch retrieve of {len(unique_keys)} key(s)")
+
+        def _fetch(key: str) -> Optional[memoryview]:
+            try:
+                return self.workbench.retrieve(key)
+            except KeyError:
+                return None
+
+        payloads: Dict[str, memoryview] = {}
+        missing: List[str] = []
+        for key, payload in zip(unique_keys, self._get_executor().map(_fetch, unique_keys)):
+            if payload is None:
+                missing.append(key)
+            else:
+                payloads[key] = payload
+
+        size_bytes = sum(len(p) for p in payloads.values())
+        WORKBENCH_BYTES_RETRIEVED.inc(size_bytes)
+        TRACER.annotate(bytes_out=size_bytes, keys=len(unique_keys), missing=len(missing))
+        return {
+            "successful": not missing,
+            "payloads": payloads,
+            "missing": missing,
+            "size_bytes": size_bytes,
+        }
+
+    @traced("composio")
+    def retrieve_range(self, key: str, offset: int, length: int) -> Dict[str, Any]:
+        """
+        Ranged COMPOSIO_REMOTE_WORKBENCH retrieval.
+        Returns a zero-copy view of at most `length` bytes of the payload starting at `offset`.
+        """
+        if not key or not self.workbench.exists(key):
+            return {"successful": False, "error": "Invalid action or key."}
+        try:
+            chunk = self.workbench.retrieve_range(key, offset, length)
+        except ValueError as e:
+            return {"successful": False, "error": str(e)}
+        WORKBENCH_BYTES_RETRIEVED.inc(len(chunk))
+        TRACER.annotate(bytes_out=len(chunk))
+        return {
+            "successful": True,
+            "data": chunk,
+            "offset": offset,
+            "length": len(chunk),
+            "size_bytes": self.workbench.size(key),
+        }
+
+    def iter_workbench_chunks(self, key: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[memoryview]:
+        """
+        Streams a Workbench payload as consecutive zero-copy chunks, so large payloads can be
+        processed without ever being loaded whole. Raises KeyError if the key is unknown.
+        """
+        return self.workbench.iter_chunks(key, chunk_size=chunk_size)
+
+    @traced("composio")
+    def remote_bash_tool(self, script: str, inputs: Optional[Dict[str, memoryview]] = None) -> Dict[str, Any]:
+        """
+        COMPOSIO_REMOTE_BASH_TOOL, executed locally on a warm sandbox worker (see src.tools.sandbox)
+        under CPU, memory and wall-clock limits, with stdout/stderr captured.
+        `inputs` maps workbench keys to their payloads; the script reads them as `inputs[key]`,
+        streams them with `iter_chunks(key)` or parses them with `load_json(key)`.
+        Falls back to simulated output when the sandbox is disabled.
+        """
+        inputs = inputs or {}
+        sandbox = self._get_sandbox()
+        if sandbox is not None:
+            print(f"-> Calling REMOTE_BASH_TOOL (Sandboxed Python execution on {len(inputs)} input(s))")
+            # Workers map the Workbench files directly; payloads not yet in the Workbench are stored first
+            input_paths = {
+                key: self.workbench.path(key if self.workbench.exists(key) else self.workbench.store(payload))
+                for key, payload in inputs.items()
+            }
+            result = sandbox.run(script, input_paths)
+            input_bytes = sum(os.path.getsize(path) for path in input_paths.values())
+            WORKBENCH_BYTES_RETRIEVED.inc(input_bytes)  # The workers read the payload files directly
+            TRACER.annotate(
+                bytes_in=len(script) + input_bytes,
+                bytes_out=len(result["stdout"]) + len(result["stderr"]),
+            )
+            return result
+
+        print(f"-> Calling REMOTE_BASH_TOOL (Simulating Python/Pandas execution on {len(inputs)} input(s))")
+        
+        # Simulated structured output of the scientific analysis
+        analysis_output = {
+            "final_clean_compounds": 3,
+            "critical_risk_flag": False,
+            "summary": "Data cleaning complete. Identified 3 high-potential compounds that passed initial risk filtering."
+        }
+        
+        return {
+            "successful": True,
+            "stdout": json.dumps(analysis_output),
+            "stderr": "",
+            "execution_time_ms": 450
+        }
+
+# --- Process-wide Client Singleton ---
+# Created lazily on first use (not at import time), then shared by every tool wrapper.
+_composio_client: Optional[ComposioClient] = None
+_composio_client_lock = threading.Lock()
+
+def get_composio_client() -> ComposioClient:
+    """Returns the shared ComposioClient, creating it on first use."""
+    global _composio_client
+    if _composio_client is None:
+        with _composio_client_lock:
+            if _composio_client is None:
+                _composio_client = ComposioClient()
+    return _composio_client
+
+def set_composio_client(client: Optional[ComposioClient]):
+    """Replaces the shared client (e.g. with one using a different backend); None resets it."""
+    global _composio_client
+    with _composio_client_lock:
+        _composio_client = client
+
+def __getattr__(name: str):
+    # Backwards-compatible module attribute: COMPOSIO_CLIENT resolves to the lazy singleton
+    if name == "COMPOSIO_CLIENT":
+        return get_composio_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
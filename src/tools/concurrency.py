@@ -0,0 +1,278 @@
+import time
+import asyncio
+import functools
+import threading
+from contextlib import contextmanager, asynccontextmanager
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, NamedTuple, Optional, Tuple
+
+# --- Concurrency Primitives Shared by the Composio Client ---
+
+
+class SingleFlight:
+    """
+    In-flight request coalescing: while a call for a key is running, identical concurrent
+    calls wait for it and share its result (or exception) instead of executing again.
+    Once the call finishes, the next call for the key executes normally.
+    """
+    def __init__(self):
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Returns (result, shared), where shared is True if another caller's execution was reused."""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.executed += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = fn()
+            future.set_result(result)
+            return result, False
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"executed": self.executed, "coalesced": self.coalesced, "in_flight": len(self._calls)}
+
+
+class AsyncSingleFlight:
+    """
+    Asyncio counterpart of SingleFlight: concurrent tasks awaiting the same key share one
+    execution. Must only be used from a single event loop (no locking is needed there).
+    The execution runs in a task owned by the flight, so cancelling any caller, the first one
+    included, leaves the others waiting on it.
+    """
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Returns (result, shared), where shared is True if another task's execution was reused."""
+        task = self._calls.get(key)
+        shared = task is not None
+        if shared:
+            self.coalesced += 1
+        else:
+            task = self._calls[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(functools.partial(self._finished, key))
+            self.executed += 1
+        return await asyncio.shield(task), shared
+
+    def _finished(self, key: str, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # Mark as retrieved: every caller may have been cancelled
+
+    def stats(self) -> Dict[str, int]:
+        return {"executed": self.executed, "coalesced": self.coalesced, "in_flight": len(self._calls)}
+
+
+class RateLimitTimeout(TimeoutError):
+    """Raised when a rate-limit or concurrency slot could not be acquired in time."""
+
+
+class RateLimit(NamedTuple):
+    """Limits for one tool slug: sustained calls per second, burst size and max concurrent calls."""
+    rate_per_s: float
+    burst: int = 1
+    max_in_flight: int = 8
+
+
+class TokenBucket:
+    """Thread-safe token bucket: refills at `rate_per_s` up to `burst` tokens; each call takes one."""
+    def __init__(self, rate_per_s: float, burst: int = 1):
+        if not rate_per_s > 0:
+            raise ValueError(f"rate_per_s must be positive, got {rate_per_s!r}.")
+        self.rate_per_s = rate_per_s
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """Takes a token without blocking. Returns 0.0 on success, else the seconds until one is due."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate_per_s)
+            self._updated = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return 0.0
+            return (1.0 - self._tokens) / self.rate_per_s
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until a token is available; returns False if `timeout` seconds pass first."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait_s = self.try_acquire()
+            if wait_s == 0.0:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait_s = min(wait_s, remaining)
+            time.sleep(wait_s)
+
+
+class _SlugLimiter:
+    """Token bucket + in-flight cap for one slug, with queue-depth and wait-time counters."""
+    def __init__(self, limit: RateLimit):
+        self.limit = limit
+        self.bucket = TokenBucket(limit.rate_per_s, limit.burst)
+        self.slots = threading.BoundedSemaphore(limit.max_in_flight)
+        self.lock = threading.Lock()
+        self.waiting = 0
+        self.max_waiting = 0
+        self.in_flight = 0
+        self.acquired = 0
+        self.rejected = 0
+        self.total_wait_s = 0.0
+        self.max_wait_s = 0.0
+
+    def start_waiting(self):
+        with self.lock:
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+
+    def stop_waiting(self, waited_s: float, acquired: bool):
+        with self.lock:
+            self.waiting -= 1
+            self.total_wait_s += waited_s
+            self.max_wait_s = max(self.max_wait_s, waited_s)
+            if acquired:
+                self.acquired += 1
+                self.in_flight += 1
+            else:
+                self.rejected += 1
+
+    def release(self):
+        with self.lock:
+            self.in_flight -= 1
+        self.slots.release()
+
+
+async def _await_slot(slots: threading.BoundedSemaphore, deadline: Optional[float]) -> bool:
+    """Polls a thread semaphore without blocking the event loop (backing off up to 50 ms)."""
+    delay_s = 0.001
+    while not slots.acquire(blocking=False):
+        if deadline is not None and time.monotonic() >= deadline:
+            return False
+        await asyncio.sleep(delay_s)
+        delay_s = min(delay_s * 2, 0.05)
+    return True
+
+
+async def _await_token(bucket: TokenBucket, deadline: Optional[float]) -> bool:
+    while True:
+        wait_s = bucket.try_acquire()
+        if wait_s == 0.0:
+            return True
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            wait_s = min(wait_s, remaining)
+        await asyncio.sleep(wait_s)
+
+
+class RateLimiter:
+    """
+    Per-slug rate limits and concurrency caps, shared by every thread using the same client.
+    `limit` serves threads and `alimit` serves asyncio tasks; both draw on the same buckets and
+    slots, so sync and async clients sharing a limiter stay under one combined limit.
+    Slugs without a configured RateLimit are not limited.
+    """
+    def __init__(self, limits: Optional[Dict[str, RateLimit]] = None):
+        self._limiters = {slug: _SlugLimiter(limit) for slug, limit in (limits or {}).items()}
+
+    @contextmanager
+    def limit(self, slug: str, timeout: Optional[float] = None) -> Iterator[None]:
+        """Holds an in-flight slot and one rate token for `slug` for the duration of the block."""
+        limiter = self._limiters.get(slug)
+        if limiter is None:
+            yield
+            return
+
+        started = time.monotonic()
+        limiter.start_waiting()
+        got_slot = got_token = False
+        try:
+            got_slot = limiter.slots.acquire(timeout=timeout)
+            remaining = None if timeout is None else max(0.0, timeout - (time.monotonic() - started))
+            got_token = got_slot and limiter.bucket.acquire(timeout=remaining)
+            if got_slot and not got_token:
+                limiter.slots.release()
+        finally:
+            limiter.stop_waiting(time.monotonic() - started, got_token)
+
+        if not got_token:
+            raise RateLimitTimeout(f"Rate limit for '{slug}' not acquired within {timeout}s.")
+        try:
+            yield
+        finally:
+            limiter.release()
+
+    @asynccontextmanager
+    async def alimit(self, slug: str, timeout: Optional[float] = None) -> AsyncIterator[None]:
+        """Async form of `limit`: waits for the slot and token without blocking the event loop."""
+        limiter = self._limiters.get(slug)
+        if limiter is None:
+            yield
+            return
+
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        limiter.start_waiting()
+        got_slot = got_token = False
+        try:
+            got_slot = await _await_slot(limiter.slots, deadline)
+            got_token = got_slot and await _await_token(limiter.bucket, deadline)
+        finally:
+            if got_slot and not got_token:
+                limiter.slots.release()
+            limiter.stop_waiting(time.monotonic() - started, got_token)
+
+        if not got_token:
+            raise RateLimitTimeout(f"Rate limit for '{slug}' not acquired within {timeout}s.")
+        try:
+            yield
+        finally:
+            limiter.release()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-slug queue depth, in-flight count and wait-time metrics."""
+        stats = {}
+        for slug, limiter in self._limiters.items():
+            with limiter.lock:
+                attempts = limiter.acquired + limiter.rejected
+                stats[slug] = {
+                    "queue_depth": limiter.waiting,
+                    "max_queue_depth": limiter.max_waiting,
+                    "in_flight": limiter.in_flight,
+                    "acquired": limiter.acquired,
+                    "rejected": limiter.rejected,
+                    "total_wait_s": limiter.total_wait_s,
+                    "avg_wait_s": limiter.total_wait_s / attempts if attempts else 0.0,
+                    "max_wait_s": limiter.max_wait_s,
+                }
+        return stats
@@ -1,144 +1,438 @@
-import json
-from crewai import Tool
-from typing import List, Dict, Any
-from src.tools.composio_client import COMPOSIO_CLIENT, TOOL_SLUGS
-from src.models import ResearchQuery, FinalSynthesis # Import Pydantic models
-
-# --- Tool 1: COMPOSIO_CREATE_PLAN Wrapper ---
-def create_workflow_plan(query_json: str) -> str:
-    """
-    REQUIRED META-TOOL: Uses COMPOSIO_CREATE_PLAN to generate a reliable, multi-step execution plan.
-    Input MUST be a JSON string of the ResearchQuery model.
-    """
-    try:
-        # Pydantic validation for input quality (adherence to Type Safety)
-        query = ResearchQuery(**json.loads(query_json))
-        primary_tools = [TOOL_SLUGS["ARXIV_SEARCH"], TOOL_SLUGS["PUBCHEM_QUERY"]]
-        use_case = f"Generate a novel hypothesis and experimental protocol for the topic: {query.topic}"
-        
-        plan_result = COMPOSIO_CLIENT.create_plan(
-            use_case=use_case,
-            primary_tool_slugs=primary_tools
-        )
-        if plan_result.get("successful"):
-            # Return the session_id and plan for the next agent
-            return (f"Plan successful. Session ID: {plan_result['session_id']}. "
-                    f"Workflow steps: {plan_result['workflow_steps']}.")
-        else:
-            return f"Error generating plan: {plan_result.get('reasoning', 'Unknown Error')}"
-    except json.JSONDecodeError:
-        return "CRITICAL TOOL ERROR: Input was not valid JSON. You must pass a JSON string conforming to ResearchQuery."
-    except Exception as e:
-        # Graceful error handling (adherence to Error Handling)
-        return f"CRITICAL TOOL ERROR: Failed to call Composio CREATE_PLAN. Error: {str(e)}"
-
-# --- Tool 2: COMPOSIO_MULTI_EXECUTE_TOOL Wrapper ---
-def execute_parallel_research(session_id: str, requests_json: str) -> str:
-    """
-    REQUIRED META-TOOL: Executes multiple API calls concurrently via COMPOSIO_MULTI_EXECUTE_TOOL.
-    Inputs: session_id and a JSON string of a list of ToolExecutionRequest objects.
-    """
-    try:
-        # No Pydantic validation here, as the LLM's output for this tool is inherently nested and complex
-        requests_list = json.loads(requests_json)
-        
-        # Prepare execution requests using the simulated tool slugs
-        execution_requests = []
-        for req in requests_list:
-            tool_slug = TOOL_SLUGS.get(req.get('tool_slug')) or req.get('tool_slug')
-            execution_requests.append({
-                "tool_slug": tool_slug,
-                "arguments": req.get('arguments', {})
-            })
-
-        multi_exec_result = COMPOSIO_CLIENT.multi_execute_tool(
-            execution_requests=execution_requests,
-            session_id=session_id
-        )
-
-        if multi_exec_result.get("successful"):
-            # Extract the crucial Workbench keys for the next agent
-            workbench_keys = [res.get('workbench_key') for res in multi_exec_result['results'] if res.get('workbench_key')]
-            
-            return (f"Parallel execution successful. Raw data saved to Workbench. "
-                    f"Workbench Keys (JSON list): {json.dumps(workbench_keys)}. Summary: {multi_exec_result['results']}")
-        else:
-            # Informative error message (adherence to Error Handling)
-            return f"Error during multi-execution: {multi_exec_result.get('error', 'Unknown Error')}"
-    except json.JSONDecodeError:
-        return "JSON Error: The 'requests_json' input was not valid JSON."
-    except Exception as e:
-        return f"CRITICAL TOOL ERROR: Failed to call Composio MULTI_EXECUTE. Error: {str(e)}"
-
-# --- Tool 3: COMPOSIO_REMOTE_BASH_TOOL Wrapper ---
-def run_data_analysis(workbench_keys_json: str) -> str:
-    """
-    REQUIRED META-TOOL: Executes custom Python/Pandas code via COMPOSIO_REMOTE_BASH_TOOL on Workbench data.
-    Input: A JSON string containing a list of workbench keys to retrieve data.
-    """
-    try:
-        workbench_keys = json.loads(workbench_keys_json)
-        
-        # Simulate data retrieval from Workbench (Crucial Step for context management)
-        # The agent must know the data is retrieved before the bash tool executes
-        for key in workbench_keys:
-             COMPOSIO_CLIENT.remote_workbench(action='retrieve', key=key)
-
-        # In a real system, the agent would generate a complex Python script here
-        python_script = f"analyze_data_from_workbench(keys={workbench_keys})"
-        bash_result = COMPOSIO_CLIENT.remote_bash_tool(script=python_script)
-
-        if bash_result.get("successful"):
-            return f"Analysis complete. Raw analysis output (stdout JSON): {bash_result['stdout']}"
-        else:
-            return f"Error during Remote Bash execution: {bash_result.get('stderr', 'Unknown Error')}"
-    except json.JSONDecodeError:
-        return "JSON Error: The 'workbench_keys_json' input was not valid JSON."
-    except Exception as e:
-        return f"CRITICAL TOOL ERROR: Failed to run data analysis. Error: {str(e)}"
-
-# --- Tool 4: Simple Documentation/Reporting Tool ---
-def publish_final_report(final_synthesis_json: str) -> str:
-    """
-    Publishes the final report to Notion/Docs.
-    Input: A JSON string conforming to the FinalSynthesis model.
-    """
-    try:
-        # Pydantic validation for output quality (Best Practice)
-        synthesis_data = FinalSynthesis(**json.loads(final_synthesis_json))
-        
-        # Simulate Notion/Docs tool call via Composio
-        print(f"-> Calling Composio Notion Tool: Creating page '{synthesis_data.hypothesis}'")
-        
-        report_url = f"https://notion.com/reports/{hash(synthesis_data.hypothesis)}"
-        
-        return f"Final Synthesis published successfully. Report URL: {report_url}."
-    except json.JSONDecodeError:
-        return "JSON Error: The 'final_synthesis_json' input was not valid JSON. Ensure all fields in FinalSynthesis are present."
-    except Exception as e:
-        return f"CRITICAL TOOL ERROR: Failed to publish report. Error: {str(e)}"
-
-
-# Define the list of tools that CrewAI will expose to the agents
-SCIENTIST_TOOLS = [
-    Tool(
-        name="CreateWorkflowPlan",
-        func=create_workflow_plan,
-        description="A required planning meta-tool. Use this FIRST to define the workflow steps and get a session ID. Input MUST be a JSON string of the ResearchQuery model."
-    ),
-    Tool(
-        name="ExecuteParallelResearch",
-        func=execute_parallel_research,
-        description="A required execution meta-tool. Use this to run multiple data acquisition APIs (Arxiv, PubChem) concurrently and store large results in the Workbench. Requires session_id and a list of tool requests in JSON format."
-    ),
-    Tool(
-        name="RunRemoteDataAnalysis",
-        func=run_data_analysis,
-        description="A required execution meta-tool. Use this to execute Python/Pandas scripts via Remote Bash on the data stored in the Workbench. Input MUST be a JSON list of workbench keys."
-    ),
-    Tool(
-        name="PublishFinalReport",
-        func=publish_final_report,
-        description="A final documentation tool. Use this to format and publish the final synthesis (hypothesis, protocol, and analysis) to Notion or Google Docs. Input MUST be a JSON string of the FinalSynthesis model."
-    )
-]
+import os
+import json
+import threading
+from typing import List, Dict, Any, AsyncIterator, Iterator, Optional, Tuple
+from src.identity import canonical_query, stable_digest
+from src.tools.composio_client import get_composio_client, TOOL_SLUGS
+from src.tools.async_client import get_async_composio_client
+from src.tools.caching import TTLCache
+from src.tracing import traced
+from src.metrics import METRICS
+from src.models import ( # Import Pydantic models
+    ResearchQuery, ToolExecutionRequest, FinalSynthesis, WorkflowPlan, ResearchResult, AnalysisResult
+)
+
+class ToolExecutionError(Exception):
+    """Raised by the typed tool functions when a Composio meta-tool reports a failure."""
+
+def _tool_error_message(error: Exception, json_error: str, failure: str) -> str:
+    """Maps an exception raised inside a tool wrapper to the error string returned to the agent."""
+    if isinstance(error, ToolExecutionError):
+        return str(error)
+    if isinstance(error, json.JSONDecodeError):
+        return json_error
+    # Graceful error handling (adherence to Error Handling)
+    return f"CRITICAL TOOL ERROR: {failure}. Error: {str(error)}"
+
+# --- Tool 1: COMPOSIO_CREATE_PLAN Wrapper ---
+# Plans are cached per normalised query (topic, target_output, sorted keywords) + tool set, so
+# reruns of a query skip the remote round trip even when its text differs cosmetically.
+# Set PLAN_CACHE_DIR to also persist plans on disk across processes.
+PLAN_CACHE = TTLCache(
+    max_entries=int(os.getenv("PLAN_CACHE_MAX_ENTRIES", "1024")),
+    ttl_s=float(os.getenv("PLAN_CACHE_TTL_S", str(24 * 3600))),
+    persist_dir=os.getenv("PLAN_CACHE_DIR") or None,
+)
+METRICS.register_cache("plan", PLAN_CACHE.stats)
+
+def plan_use_case(query: ResearchQuery) -> str:
+    """The CREATE_PLAN use-case description for a query."""
+    return f"Generate a novel hypothesis and experimental protocol for the topic: {query.topic}"
+
+PRIMARY_TOOL_SLUGS = [TOOL_SLUGS["ARXIV_SEARCH"], TOOL_SLUGS["PUBCHEM_QUERY"]]
+
+def plan_key(query: ResearchQuery) -> Dict[str, Any]:
+    """The plan cache key: the normalised query (topic, target_output, sorted keywords) and the tool set."""
+    return {**canonical_query(query), "primary_tool_slugs": sorted(PRIMARY_TOOL_SLUGS)}
+
+def session_key(query: ResearchQuery) -> Dict[str, Any]:
+    """
+    What the Composio session is derived from: the normalised topic and the tool set.
+    Every query on a topic shares a session, and with it the checkpoint directory, so an edited
+    query can reuse the stages its edit did not affect. Checkpoints within a session are keyed
+    by the fingerprint of their inputs (stages) or of the whole query (crew tasks), so
+    concurrent queries on one topic never read or discard each other's outputs.
+    """
+    return {"topic": canonical_query(query)["topic"], "primary_tool_slugs": sorted(PRIMARY_TOOL_SLUGS)}
+
+def session_id_for_query(query: ResearchQuery) -> str:
+    """The stable Composio session ID that planning will assign to this query (one per topic)."""
+    return get_composio_client().session_id_for(session_key(query))
+
+def _plan_cache_key(query: ResearchQuery) -> str:
+    return stable_digest(plan_key(query))
+
+def _cached_plan(query: ResearchQuery) -> Optional[WorkflowPlan]:
+    cached_plan = PLAN_CACHE.get(_plan_cache_key(query))
+    if cached_plan is None:
+        return None
+    print(f"-> CREATE_PLAN cache hit for: {plan_use_case(query)}")
+    return WorkflowPlan(**cached_plan)
+
+def _plan_from_result(query: ResearchQuery, plan_result: Dict[str, Any]) -> WorkflowPlan:
+    """Validates a CREATE_PLAN result and caches the plan."""
+    if not plan_result.get("successful"):
+        raise ToolExecutionError(f"Error generating plan: {plan_result.get('reasoning', 'Unknown Error')}")
+
+    plan = WorkflowPlan(session_id=plan_result["session_id"], workflow_steps=plan_result["workflow_steps"])
+    PLAN_CACHE.set(_plan_cache_key(query), plan.dict())
+    return plan
+
+def plan_workflow(query: ResearchQuery) -> WorkflowPlan:
+    """
+    Typed core of CreateWorkflowPlan: calls COMPOSIO_CREATE_PLAN for a validated query.
+    Raises ToolExecutionError if the plan could not be generated.
+    """
+    plan = _cached_plan(query)
+    if plan is not None:
+        return plan
+
+    plan_result = get_composio_client().create_plan(
+        use_case=plan_use_case(query),
+        primary_tool_slugs=PRIMARY_TOOL_SLUGS,
+        session_key=session_key(query)
+    )
+    return _plan_from_result(query, plan_result)
+
+def _plan_message(plan: WorkflowPlan) -> str:
+    # Return the session_id and plan for the next agent
+    return (f"Plan successful. Session ID: {plan.session_id}. "
+            f"Workflow steps: {plan.workflow_steps}.")
+
+_PLAN_ERRORS = (
+    "CRITICAL TOOL ERROR: Input was not valid JSON. You must pass a JSON string conforming to ResearchQuery.",
+    "Failed to call Composio CREATE_PLAN",
+)
+
+@traced("tool", name="CreateWorkflowPlan")
+def create_workflow_plan(query_json: str) -> str:
+    """
+    REQUIRED META-TOOL: Uses COMPOSIO_CREATE_PLAN to generate a reliable, multi-step execution plan.
+    Input MUST be a JSON string of the ResearchQuery model.
+    """
+    try:
+        # Pydantic validation for input quality (adherence to Type Safety)
+        query = ResearchQuery(**json.loads(query_json))
+        return _plan_message(plan_workflow(query))
+    except Exception as e:
+        return _tool_error_message(e, *_PLAN_ERRORS)
+
+# --- Tool 2: COMPOSIO_MULTI_EXECUTE_TOOL Wrapper ---
+def _prepare_execution_requests(requests_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Maps symbolic tool names (e.g. 'ARXIV_SEARCH') to the configured slugs."""
+    execution_requests = []
+    for req in requests_list:
+        tool_slug = TOOL_SLUGS.get(req.get('tool_slug')) or req.get('tool_slug')
+        execution_requests.append({
+            "tool_slug": tool_slug,
+            "arguments": req.get('arguments', {})
+        })
+    return execution_requests
+
+def research_request_fingerprint(request: ToolExecutionRequest) -> str:
+    """Stable identity of one research request (resolved tool slug + arguments)."""
+    return stable_digest(_prepare_execution_requests([request.dict()])[0])
+
+def collect_parallel_research(
+    session_id: str,
+    requests: List[ToolExecutionRequest],
+    reuse: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> ResearchResult:
+    """
+    Typed core of ExecuteParallelResearch: runs all requests via COMPOSIO_MULTI_EXECUTE_TOOL.
+    `reuse` maps request fingerprints to results of an earlier run; those requests are not
+    re-issued and their results (marked 'reused') keep their place in request order.
+    Raises ToolExecutionError if no request succeeded.
+    """
+    reuse = reuse or {}
+    fingerprints = [research_request_fingerprint(req) for req in requests]
+    results = [dict(reuse[fp], reused=True) if fp in reuse else None for fp in fingerprints]
+    pending = [i for i, result in enumerate(results) if result is None]
+    if len(pending) < len(requests):
+        print(f"-> Reusing {len(requests) - len(pending)} research result(s) for session {session_id}")
+    if not pending:
+        return _research_from_result({"successful": True, "results": results})
+
+    multi_exec_result = get_composio_client().multi_execute_tool(
+        execution_requests=_prepare_execution_requests([requests[i].dict() for i in pending]),
+        session_id=session_id
+    )
+    if len(pending) == len(requests):
+        return _research_from_result(multi_exec_result)
+    for i, result in zip(pending, multi_exec_result.get("results", [])):
+        results[i] = result
+    # The reused results completed, so the merged run succeeded whatever the fresh requests did
+    return _research_from_result({"successful": True, "results": [r for r in results if r is not None]})
+
+def _research_from_result(multi_exec_result: Dict[str, Any]) -> ResearchResult:
+    if not multi_exec_result.get("successful"):
+        # Informative error message (adherence to Error Handling): why each request failed
+        errors = [
+            f"{res.get('tool_slug')}: {res.get('error') or res.get('status')}"
+            for res in multi_exec_result.get("results", []) if res.get("status") != "completed"
+        ]
+        raise ToolExecutionError(f"Error during multi-execution: {'; '.join(errors) or 'no requests were executed'}")
+
+    # Extract the crucial Workbench keys for the next stage
+    workbench_keys = [res.get('workbench_key') for res in multi_exec_result['results'] if res.get('workbench_key')]
+    return ResearchResult(workbench_keys=workbench_keys, results=multi_exec_result['results'])
+
+def _parse_research_requests(requests_json: str) -> List[ToolExecutionRequest]:
+    # No Pydantic validation of the arguments, as the LLM's output for this tool is inherently nested and complex
+    requests_list = json.loads(requests_json)
+    return [ToolExecutionRequest(**req) for req in _prepare_execution_requests(requests_list)]
+
+def _research_message(research: ResearchResult) -> str:
+    return (f"Parallel execution successful. Raw data saved to Workbench. "
+            f"Workbench Keys (JSON list): {json.dumps(research.workbench_keys)}. Summary: {research.results}")
+
+_RESEARCH_ERRORS = (
+    "JSON Error: The 'requests_json' input was not valid JSON.",
+    "Failed to call Composio MULTI_EXECUTE",
+)
+
+@traced("tool", name="ExecuteParallelResearch")
+def execute_parallel_research(session_id: str, requests_json: str) -> str:
+    """
+    REQUIRED META-TOOL: Executes multiple API calls concurrently via COMPOSIO_MULTI_EXECUTE_TOOL.
+    Inputs: session_id and a JSON string of a list of ToolExecutionRequest objects.
+    """
+    try:
+        requests = _parse_research_requests(requests_json)
+        return _research_message(collect_parallel_research(session_id, requests))
+    except Exception as e:
+        return _tool_error_message(e, *_RESEARCH_ERRORS)
+
+def iter_parallel_research(
+    session_id: str, requests_json: str
+) -> Iterator[Tuple[ToolExecutionRequest, Dict[str, Any], Optional[str]]]:
+    """
+    Streaming variant of ExecuteParallelResearch for programmatic callers.
+    Yields (request, result, workbench_key) as soon as each request finishes, so the
+    Workbench and analysis steps can start on the first results while slower queries run.
+    Unlike the tool wrapper, invalid input raises instead of returning an error string.
+    """
+    requests_list = json.loads(requests_json)
+    execution_requests = _prepare_execution_requests(requests_list)
+    print(f"-> Streaming MULTI_EXECUTE_TOOL for session {session_id} (count: {len(execution_requests)})")
+
+    for index, result in get_composio_client().iter_multi_execute_tool(execution_requests):
+        request = ToolExecutionRequest(**execution_requests[index])
+        yield request, result, result.get('workbench_key')
+
+# --- Tool 3: COMPOSIO_REMOTE_BASH_TOOL Wrapper ---
+def analyze_workbench_data(workbench_keys: List[str]) -> AnalysisResult:
+    """
+    Typed core of RunRemoteDataAnalysis: retrieves the payloads and runs the analysis via Remote Bash.
+    Raises ToolExecutionError for unknown keys or a failed execution.
+    """
+    # Fetch every payload from the Workbench in one batch (Crucial Step for context management).
+    # Payloads are zero-copy views, so large data is never materialised whole in memory.
+    retrieval = get_composio_client().retrieve_many(workbench_keys)
+    _check_retrieval(retrieval)
+    bash_result = get_composio_client().remote_bash_tool(
+        script=_analysis_script(workbench_keys), inputs=retrieval["payloads"]
+    )
+    return _analysis_from_result(bash_result)
+
+def _check_retrieval(retrieval: Dict[str, Any]):
+    if retrieval["missing"]:
+        raise ToolExecutionError(f"Workbench Error: Unknown workbench key(s): {retrieval['missing']}. "
+                                 "Pass only keys returned by ExecuteParallelResearch.")
+
+# Analysis script run in the Remote Bash sandbox: the vectorised risk filters in src.risk_engine
+# applied to every PubChem payload (compounds pass when they are not toxicity-flagged and
+# satisfy Lipinski-style property thresholds).
+ANALYSIS_SCRIPT_TEMPLATE = '''
+import json
+from src.risk_engine import analyze_payloads
+
+# Each payload is streamed chunk by chunk, so peak memory does not grow with the payload size
+print(json.dumps(analyze_payloads(iter_chunks(key) for key in {keys!r})))
+'''
+
+def _analysis_script(workbench_keys: List[str]) -> str:
+    # In a real system, the agent would generate a complex Python script here
+    return ANALYSIS_SCRIPT_TEMPLATE.format(keys=list(workbench_keys))
+
+def _analysis_from_result(bash_result: Dict[str, Any]) -> AnalysisResult:
+    if not bash_result.get("successful"):
+        raise ToolExecutionError(f"Error during Remote Bash execution: {bash_result.get('stderr', 'Unknown Error')}")
+    return AnalysisResult(**json.loads(bash_result["stdout"]))
+
+def _analysis_message(analysis: AnalysisResult) -> str:
+    return f"Analysis complete. Raw analysis output (stdout JSON): {analysis.json()}"
+
+_ANALYSIS_ERRORS = (
+    "JSON Error: The 'workbench_keys_json' input was not valid JSON.",
+    "Failed to run data analysis",
+)
+
+@traced("tool", name="RunRemoteDataAnalysis")
+def run_data_analysis(workbench_keys_json: str) -> str:
+    """
+    REQUIRED META-TOOL: Executes custom Python/Pandas code via COMPOSIO_REMOTE_BASH_TOOL on Workbench data.
+    Input: A JSON string containing a list of workbench keys to retrieve data.
+    """
+    try:
+        workbench_keys = json.loads(workbench_keys_json)
+        return _analysis_message(analyze_workbench_data(workbench_keys))
+    except Exception as e:
+        return _tool_error_message(e, *_ANALYSIS_ERRORS)
+
+# --- Tool 4: Simple Documentation/Reporting Tool ---
+def publish_synthesis(synthesis_data: FinalSynthesis) -> str:
+    """
+    Typed core of PublishFinalReport: publishes a validated synthesis and returns the report URL.
+    """
+    # Simulate Notion/Docs tool call via Composio
+    print(f"-> Calling Composio Notion Tool: Creating page '{synthesis_data.hypothesis}'")
+    return f"https://notion.com/reports/{stable_digest(synthesis_data.hypothesis)}"
+
+def _report_message(report_url: str) -> str:
+    return f"Final Synthesis published successfully. Report URL: {report_url}."
+
+_REPORT_ERRORS = (
+    "JSON Error: The 'final_synthesis_json' input was not valid JSON. Ensure all fields in FinalSynthesis are present.",
+    "Failed to publish report",
+)
+
+@traced("tool", name="PublishFinalReport")
+def publish_final_report(final_synthesis_json: str) -> str:
+    """
+    Publishes the final report to Notion/Docs.
+    Input: A JSON string conforming to the FinalSynthesis model.
+    """
+    try:
+        # Pydantic validation for output quality (Best Practice)
+        synthesis_data = FinalSynthesis(**json.loads(final_synthesis_json))
+        return _report_message(publish_synthesis(synthesis_data))
+    except Exception as e:
+        return _tool_error_message(e, *_REPORT_ERRORS)
+
+
+# --- Async Tool Functions ---
+# Coroutine counterparts of the four tools for asyncio callers (one event loop driving many
+# sessions). They share the plan cache, validation and messages with the sync tools above.
+
+async def aplan_workflow(query: ResearchQuery) -> WorkflowPlan:
+    """Async form of plan_workflow."""
+    plan = _cached_plan(query)
+    if plan is not None:
+        return plan
+
+    plan_result = await get_async_composio_client().create_plan(
+        use_case=plan_use_case(query),
+        primary_tool_slugs=PRIMARY_TOOL_SLUGS,
+        session_key=session_key(query)
+    )
+    return _plan_from_result(query, plan_result)
+
+async def acollect_parallel_research(session_id: str, requests: List[ToolExecutionRequest]) -> ResearchResult:
+    """Async form of collect_parallel_research."""
+    multi_exec_result = await get_async_composio_client().multi_execute_tool(
+        execution_requests=_prepare_execution_requests([req.dict() for req in requests]),
+        session_id=session_id
+    )
+    return _research_from_result(multi_exec_result)
+
+async def aiter_parallel_research(
+    session_id: str, requests_json: str
+) -> AsyncIterator[Tuple[ToolExecutionRequest, Dict[str, Any], Optional[str]]]:
+    """Async form of iter_parallel_research: yields each (request, result, workbench_key) as it finishes."""
+    execution_requests = _prepare_execution_requests(json.loads(requests_json))
+    print(f"-> Streaming MULTI_EXECUTE_TOOL async for session {session_id} (count: {len(execution_requests)})")
+
+    async for index, result in get_async_composio_client().iter_multi_execute_tool(execution_requests):
+        request = ToolExecutionRequest(**execution_requests[index])
+        yield request, result, result.get('workbench_key')
+
+async def aanalyze_workbench_data(workbench_keys: List[str]) -> AnalysisResult:
+    """Async form of analyze_workbench_data."""
+    client = get_async_composio_client()
+    retrieval = await client.retrieve_many(workbench_keys)
+    _check_retrieval(retrieval)
+    bash_result = await client.remote_bash_tool(script=_analysis_script(workbench_keys), inputs=retrieval["payloads"])
+    return _analysis_from_result(bash_result)
+
+async def apublish_synthesis(synthesis_data: FinalSynthesis) -> str:
+    """Async form of publish_synthesis."""
+    return publish_synthesis(synthesis_data)
+
+async def acreate_workflow_plan(query_json: str) -> str:
+    """Async CreateWorkflowPlan: same input and return strings as create_workflow_plan."""
+    try:
+        query = ResearchQuery(**json.loads(query_json))
+        return _plan_message(await aplan_workflow(query))
+    except Exception as e:
+        return _tool_error_message(e, *_PLAN_ERRORS)
+
+async def aexecute_parallel_research(session_id: str, requests_json: str) -> str:
+    """Async ExecuteParallelResearch: same input and return strings as execute_parallel_research."""
+    try:
+        requests = _parse_research_requests(requests_json)
+        return _research_message(await acollect_parallel_research(session_id, requests))
+    except Exception as e:
+        return _tool_error_message(e, *_RESEARCH_ERRORS)
+
+async def arun_data_analysis(workbench_keys_json: str) -> str:
+    """Async RunRemoteDataAnalysis: same input and return strings as run_data_analysis."""
+    try:
+        workbench_keys = json.loads(workbench_keys_json)
+        return _analysis_message(await aanalyze_workbench_data(workbench_keys))
+    except Exception as e:
+        return _tool_error_message(e, *_ANALYSIS_ERRORS)
+
+async def apublish_final_report(final_synthesis_json: str) -> str:
+    """Async PublishFinalReport: same input and return strings as publish_final_report."""
+    try:
+        synthesis_data = FinalSynthesis(**json.loads(final_synthesis_json))
+        return _report_message(await apublish_synthesis(synthesis_data))
+    except Exception as e:
+        return _tool_error_message(e, *_REPORT_ERRORS)
+
+
+# Define the list of tools that CrewAI will expose to the agents.
+# Built lazily on first use so that importing this module does not pull in crewai.
+_scientist_tools: Optional[list] = None
+_scientist_tools_lock = threading.Lock()
+
+def _build_scientist_tools() -> list:
+    from crewai import Tool  # Deferred: crewai is slow to import and only needed in crew mode
+    return [
+        Tool(
+            name="CreateWorkflowPlan",
+            func=create_workflow_plan,
+            description="A required planning meta-tool. Use this FIRST to define the workflow steps and get a session ID. Input MUST be a JSON string of the ResearchQuery model."
+        ),
+        Tool(
+            name="ExecuteParallelResearch",
+            func=execute_parallel_research,
+            description="A required execution meta-tool. Use this to run multiple data acquisition APIs (Arxiv, PubChem) concurrently and store large results in the Workbench. Requires session_id and a list of tool requests in JSON format."
+        ),
+        Tool(
+            name="RunRemoteDataAnalysis",
+            func=run_data_analysis,
+            description="A required execution meta-tool. Use this to execute Python/Pandas scripts via Remote Bash on the data stored in the Workbench. Input MUST be a JSON list of workbench keys."
+        ),
+        Tool(
+            name="PublishFinalReport",
+            func=publish_final_report,
+            description="A final documentation tool. Use this to format and publish the final synthesis (hypothesis, protocol, and analysis) to Notion or Google Docs. Input MUST be a JSON string of the FinalSynthesis model."
+        )
+    ]
+
+def get_scientist_tools() -> list:
+    """Returns the shared list of CrewAI tools, creating it on first use."""
+    global _scientist_tools
+    if _scientist_tools is None:
+        with _scientist_tools_lock:
+            if _scientist_tools is None:
+                _scientist_tools = _build_scientist_tools()
+    return _scientist_tools
+
+def __getattr__(name: str):
+    # Backwards-compatible module attribute: SCIENTIST_TOOLS resolves to the lazily built list
+    if name == "SCIENTIST_TOOLS":
+        return get_scientist_tools()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,146 @@
+import re
+import json
+import asyncio
+import threading
+from typing import Any, Dict, Optional, Tuple
+from src.tools.backends import ToolBackend, LocalToolBackend
+from src.tools.resilience import TransientToolError
+from src.tools.transport import read_http_head, read_http_body, encode_http_message
+
+# --- Local Stand-in for the Composio HTTP API ---
+# Serves the TOOL_EXECUTE_PATH wire protocol from a ToolBackend on localhost, so the HTTP
+# transports and clients can be exercised (and benchmarked) end to end without network access.
+
+_EXECUTE_ROUTE = re.compile(r"^/api/v1/tools/(?P<tool_slug>[^/?]+)/execute$")
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 503: "Service Unavailable"}
+
+
+class LocalComposioServer:
+    """
+    Keep-alive HTTP/1.1 server executing tool calls on `backend` (a LocalToolBackend by default).
+    `latency_s` adds a non-blocking delay per call. Use `start()`/`stop()` from a running event loop,
+    or `start_in_thread()`/`stop_in_thread()` to serve synchronous clients.
+    """
+    def __init__(
+        self,
+        backend: Optional[ToolBackend] = None,
+        latency_s: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.backend = backend or LocalToolBackend()
+        self.latency_s = latency_s
+        self.host = host
+        self.port = port
+        self.connections_accepted = 0
+        self.requests_served = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def _execute(self, tool_slug: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        try:
+            request = json.loads(body or b"{}")
+        except ValueError:
+            return 400, {"error": "Request body was not valid JSON."}
+        if self.latency_s > 0:
+            await asyncio.sleep(self.latency_s)
+        try:
+            output = await asyncio.to_thread(self.backend.execute, tool_slug, request.get("arguments", {}))
+        except TransientToolError as e:
+            return 503, {"error": str(e)}
+        except Exception as e:
+            return 400, {"error": str(e)}
+        return 200, output
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections_accepted += 1
+        self._connections[asyncio.current_task()] = writer
+        try:
+            while True:
+                head = await read_http_head(reader)
+                if head is None:
+                    break
+                request_line, headers = head
+                body = await read_http_body(reader, headers)
+                method, target, _ = (request_line.split(" ", 2) + ["", ""])[:3]
+
+                route = _EXECUTE_ROUTE.match(target)
+                if method == "POST" and route:
+                    status, payload = await self._execute(route.group("tool_slug"), body)
+                else:
+                    status, payload = 404, {"error": f"No route for {method} {target}."}
+                self.requests_served += 1
+
+                response_body = json.dumps(payload).encode("utf-8")
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(encode_http_message(
+                    f"HTTP/1.1 {status} {_REASONS.get(status, '')}",
+                    {
+                        "Content-Type": "application/json",
+                        "Content-Length": str(len(response_body)),
+                        "Connection": "keep-alive" if keep_alive else "close",
+                    },
+                    response_body,
+                ))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.pop(asyncio.current_task(), None)
+            writer.close()
+
+    async def start(self) -> str:
+        """Starts listening (port 0 picks a free port) and returns the base URL."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.base_url
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            # Close idle keep-alive connections and let their handlers finish before shutting down
+            handlers = list(self._connections)
+            for writer in self._connections.values():
+                writer.close()
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "LocalComposioServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    def start_in_thread(self) -> str:
+        """Runs the server on its own event loop in a daemon thread and returns the base URL."""
+        started = threading.Event()
+
+        def _serve():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.start())
+            started.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self.stop())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=_serve, name="composio-local-server", daemon=True)
+        self._thread.start()
+        started.wait()
+        return self.base_url
+
+    def stop_in_thread(self):
+        if self._loop is not None and self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop = self._thread = None
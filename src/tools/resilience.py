@@ -0,0 +1,150 @@
+import time
+import random
+import asyncio
+import threading
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Awaitable, Callable, Deque, Dict, NamedTuple, Optional, Tuple
+from src.tools.concurrency import RateLimitTimeout
+
+# --- Retries, Backoff and Hedged Requests ---
+# Transient failures are retried here, at the client level, instead of surfacing as a tool error
+# that the LLM then "retries" with a full reasoning turn. Only idempotent calls are retried or hedged.
+
+
+class TransientToolError(Exception):
+    """Raised by backends for failures that are safe to retry (throttling, 5xx, dropped connections)."""
+
+
+# Exceptions treated as transient; anything else (bad arguments, parse errors) fails immediately
+RETRYABLE_EXCEPTIONS = (TransientToolError, TimeoutError, ConnectionError)
+# ...except our own throttling: the call already waited its full timeout for a rate-limit slot,
+# and retrying would only queue it again
+NON_RETRYABLE_EXCEPTIONS = (RateLimitTimeout,)
+
+
+class RetryPolicy(NamedTuple):
+    """Exponential backoff with full jitter: attempt n waits uniform(0, min(max_delay, base * 2**n))."""
+    max_attempts: int = 3
+    base_delay_s: float = 0.25
+    max_delay_s: float = 4.0
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+def backoff_delay(attempt: int, policy: RetryPolicy, rng: Optional[random.Random] = None) -> float:
+    """Jittered delay before retry number `attempt` (0-based)."""
+    ceiling = min(policy.max_delay_s, policy.base_delay_s * (2 ** attempt))
+    return (rng or random).uniform(0.0, ceiling)
+
+
+def call_with_retry(fn: Callable[[], Any], policy: RetryPolicy) -> Tuple[Any, int]:
+    """Calls `fn` until it succeeds or the policy is exhausted. Returns (result, attempts used)."""
+    for attempt in range(policy.max_attempts):
+        try:
+            return fn(), attempt + 1
+        except NON_RETRYABLE_EXCEPTIONS:
+            raise
+        except RETRYABLE_EXCEPTIONS:
+            if attempt + 1 >= policy.max_attempts:
+                raise
+            time.sleep(backoff_delay(attempt, policy))
+
+
+async def acall_with_retry(fn: Callable[[], Awaitable[Any]], policy: RetryPolicy) -> Tuple[Any, int]:
+    """Async form of call_with_retry: backoff delays sleep without blocking the event loop."""
+    for attempt in range(policy.max_attempts):
+        try:
+            return await fn(), attempt + 1
+        except NON_RETRYABLE_EXCEPTIONS:
+            raise
+        except RETRYABLE_EXCEPTIONS:
+            if attempt + 1 >= policy.max_attempts:
+                raise
+            await asyncio.sleep(backoff_delay(attempt, policy))
+
+
+class LatencyTracker:
+    """Sliding window of recent successful call latencies per slug, for percentile estimates."""
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, slug: str, duration_s: float):
+        with self._lock:
+            self._samples.setdefault(slug, deque(maxlen=self.window)).append(duration_s)
+
+    def percentile(self, slug: str, q: float) -> Optional[float]:
+        """Latency at quantile `q` (0-1), or None until `min_samples` calls have been observed."""
+        with self._lock:
+            samples = sorted(self._samples.get(slug, ()))
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def hedged_call(
+    fn: Callable[[], Any],
+    hedge_after_s: Optional[float],
+    executor: ThreadPoolExecutor,
+) -> Tuple[Any, bool]:
+    """
+    Runs `fn`; if it has not finished after `hedge_after_s`, starts an identical duplicate and
+    returns whichever finishes first successfully. Returns (result, hedge_was_sent).
+    The losing call cannot be interrupted and its result is discarded.
+    Without a hedge threshold `fn` simply runs on the calling thread.
+    """
+    if hedge_after_s is None:
+        return fn(), False
+
+    # Each attempt runs in a copy of the caller's context, so its trace spans nest under the caller's
+    primary = executor.submit(contextvars.copy_context().run, fn)
+
+    done, _ = wait([primary], timeout=hedge_after_s)
+    if done:
+        return primary.result(), False
+
+    pending = {primary, executor.submit(contextvars.copy_context().run, fn)}
+    error: Optional[BaseException] = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                return future.result(), True
+            except BaseException as e:
+                error = error or e
+    raise error
+
+
+async def ahedged_call(fn: Callable[[], Awaitable[Any]], hedge_after_s: Optional[float]) -> Tuple[Any, bool]:
+    """
+    Async form of hedged_call. Unlike threads, the losing attempt is cancelled as soon as
+    the other one succeeds. Returns (result, hedge_was_sent).
+    """
+    if hedge_after_s is None:
+        return await fn(), False
+
+    attempts = [asyncio.ensure_future(fn())]
+    try:
+        done, _ = await asyncio.wait(attempts, timeout=hedge_after_s)
+        if done:
+            return attempts[0].result(), False
+
+        attempts.append(asyncio.ensure_future(fn()))
+        pending = set(attempts)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result(), True
+                error = error or task.exception()
+        raise error
+    finally:
+        for task in attempts:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,293 @@
+import os
+import sys
+import json
+import time
+import queue
+import select
+import threading
+import subprocess
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Not available on Windows: the sandbox then cannot enforce limits
+    resource = None
+
+# --- Local Remote-Bash Sandbox ---
+# Executes analysis scripts for COMPOSIO_REMOTE_BASH_TOOL in a pool of pre-warmed Python worker
+# processes (see sandbox_worker.py). Interpreter start-up and the numpy/pandas imports dominate
+# the cost of a small script, so workers pay them once and are reused. Each worker runs under
+# address-space and CPU-time rlimits; a script that overruns its wall-clock limit or kills its
+# worker gets the worker replaced in the background.
+# Reuse means scripts share a process: each job gets a fresh namespace and the worker undoes
+# changes to sys.modules, sys.path, os.environ and the working directory, but changes made to
+# already imported modules (monkeypatches) persist. Workers are therefore recycled after a
+# failed script and after `max_jobs_per_worker` jobs.
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sandbox_worker.py")
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_SANDBOX_WORKERS = 2
+DEFAULT_MAX_JOBS_PER_WORKER = 100
+QUEUE_POLL_INTERVAL_S = 1.0  # How often a queued run re-checks for a pool that has shrunk or closed
+DEFAULT_PRELOAD_MODULES = ("numpy", "pandas")
+# The only parent environment variables a worker inherits; API keys and other secrets stay out
+WORKER_ENV_VARS = ("PATH", "PYTHONPATH", "LANG", "LC_ALL", "LC_CTYPE", "TMPDIR", "TEMP", "TMP", "SYSTEMROOT")
+
+
+class SandboxLimits(NamedTuple):
+    """Per-script resource limits."""
+    cpu_time_s: float = 30.0
+    wall_time_s: float = 60.0
+    memory_bytes: int = 2 * 1024 ** 3  # Address-space limit of each worker process
+    max_output_bytes: int = 1024 * 1024  # stdout and stderr are each truncated beyond this
+    # How long a run may wait for a busy worker before failing; None waits until one is free.
+    # The wall-clock limit only starts once the script is running.
+    queue_timeout_s: Optional[float] = None
+
+
+def sandbox_supported() -> bool:
+    """True where rlimits are available (POSIX), so scripts can be run with enforced limits."""
+    return resource is not None
+
+
+class SandboxWorkerError(Exception):
+    """Raised when a worker process dies or stops responding."""
+
+
+class _Worker:
+    """One warm interpreter process speaking the sandbox_worker line protocol."""
+    def __init__(self, preload: Tuple[str, ...], limits: SandboxLimits):
+        def _apply_limits():
+            resource.setrlimit(resource.RLIMIT_AS, (limits.memory_bytes, limits.memory_bytes))
+
+        env = {name: os.environ[name] for name in WORKER_ENV_VARS if name in os.environ}
+        # Scripts may import project modules (e.g. the analysis engine); BLAS gets one thread per worker
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [PROJECT_ROOT, env.get("PYTHONPATH")]))
+        env.setdefault("OPENBLAS_NUM_THREADS", "1")
+        env.setdefault("OMP_NUM_THREADS", "1")
+
+        self.process = subprocess.Popen(
+            [sys.executable, "-u", WORKER_SCRIPT, *preload],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=env,
+            cwd=PROJECT_ROOT,
+            preexec_fn=_apply_limits if resource is not None else None,
+        )
+        ready = self._read_message(timeout_s=limits.wall_time_s)
+        self.preloaded: List[str] = ready.get("preloaded", [])
+        self.jobs = 0
+
+    def _read_message(self, timeout_s: float) -> Dict[str, Any]:
+        readable, _, _ = select.select([self.process.stdout], [], [], timeout_s)
+        if not readable:
+            raise TimeoutError(f"Sandbox worker did not respond within {timeout_s}s.")
+        line = self.process.stdout.readline()
+        if not line:
+            raise SandboxWorkerError(f"Sandbox worker exited with code {self.process.wait()}.")
+        return json.loads(line)
+
+    def run(self, job: Dict[str, Any], timeout_s: float) -> Dict[str, Any]:
+        try:
+            self.process.stdin.write((json.dumps(job) + "\n").encode("utf-8"))
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise SandboxWorkerError(f"Sandbox worker exited with code {self.process.poll()}.") from e
+        self.jobs += 1
+        return self._read_message(timeout_s)
+
+    def kill(self):
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+
+
+class SandboxPool:
+    """
+    Pool of warm sandbox workers; `run` blocks while all workers are busy.
+    Workers start on first use (or on `warm()`), each importing `preload` once. A worker that
+    dies, fails a script or has run `max_jobs_per_worker` jobs is replaced in the background;
+    if that fails, the next `run` starts one itself.
+    """
+    def __init__(
+        self,
+        size: int = DEFAULT_SANDBOX_WORKERS,
+        limits: SandboxLimits = SandboxLimits(),
+        preload: Tuple[str, ...] = DEFAULT_PRELOAD_MODULES,
+        max_jobs_per_worker: int = DEFAULT_MAX_JOBS_PER_WORKER,
+    ):
+        self.size = size
+        self.limits = limits
+        self.preload = tuple(preload)
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._started = False
+        self._closed = False
+        self._lock = threading.Lock()
+        self._workers = 0  # Live workers plus those being started, at most `size`
+        self.jobs = 0
+        self.timeouts = 0
+        self.crashes = 0
+        self.recycled = 0
+        self.workers_started = 0
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self.preload, self.limits)
+        with self._lock:
+            self.workers_started += 1
+        return worker
+
+    def _reserve(self) -> bool:
+        """Claims a worker slot; False when the pool is full (or closed)."""
+        with self._lock:
+            if self._closed or self._workers >= self.size:
+                return False
+            self._workers += 1
+            return True
+
+    def _release(self):
+        with self._lock:
+            self._workers -= 1
+
+    def _retire(self, worker: _Worker):
+        worker.kill()
+        self._release()
+
+    def _spawn_into_pool(self) -> bool:
+        """Starts a worker in an already reserved slot and makes it idle. Returns whether it started."""
+        try:
+            worker = self._spawn()
+        except Exception as e:
+            self._release()
+            print(f"WARNING: Failed to start sandbox worker: {e}")
+            return False
+        if self._closed:
+            self._retire(worker)
+            return False
+        self._idle.put(worker)
+        return True
+
+    def _replace_in_background(self):
+        if self._reserve():
+            threading.Thread(target=self._spawn_into_pool, name="sandbox-respawn", daemon=True).start()
+
+    def _acquire(self) -> _Worker:
+        """
+        Takes an idle worker. If none is idle and the pool has shrunk below `size` (a replacement
+        failed to start), a worker is started synchronously; otherwise waits for a busy one to be
+        returned, for at most `limits.queue_timeout_s` (no limit by default).
+        """
+        deadline = None if self.limits.queue_timeout_s is None else time.monotonic() + self.limits.queue_timeout_s
+        while True:
+            if self._closed:
+                raise SandboxWorkerError("The sandbox pool is closed.")
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            if self._reserve():
+                try:
+                    return self._spawn()
+                except Exception as e:
+                    self._release()
+                    raise SandboxWorkerError(f"Failed to start sandbox worker: {e}") from e
+            # Wake up periodically: a replacement may fail to start while we wait
+            wait_s = QUEUE_POLL_INTERVAL_S if deadline is None else min(QUEUE_POLL_INTERVAL_S, deadline - time.monotonic())
+            if wait_s <= 0:
+                raise SandboxWorkerError(f"No sandbox worker became available within {self.limits.queue_timeout_s}s.")
+            try:
+                return self._idle.get(timeout=wait_s)
+            except queue.Empty:
+                pass
+
+    def warm(self):
+        """Starts all workers concurrently and waits until they have finished their imports."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        started: List[bool] = []
+        starters = [
+            threading.Thread(target=lambda: started.append(self._spawn_into_pool()))
+            for _ in range(self.size) if self._reserve()
+        ]
+        for starter in starters:
+            starter.start()
+        for starter in starters:
+            starter.join()
+        # Concurrent runs may already have taken the new workers, so count starts, not idle workers
+        if starters and not any(started):
+            self._started = False
+            raise SandboxWorkerError("No sandbox worker could be started.")
+
+    def run(self, script: str, input_paths: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Runs `script` on a warm worker. `input_paths` maps Workbench keys to payload files, which
+        the script sees as `inputs[key]`. Returns successful/exit_code/stdout/stderr/execution_time_ms.
+        Raises SandboxWorkerError if no worker can be started or none frees up within the queue timeout.
+        """
+        self.warm()
+        job = {
+            "script": script,
+            "inputs": input_paths or {},
+            "cpu_time_s": self.limits.cpu_time_s,
+            "max_output_bytes": self.limits.max_output_bytes,
+        }
+        worker = self._acquire()
+        with self._lock:
+            self.jobs += 1
+        started = time.perf_counter()
+        try:
+            result = worker.run(job, timeout_s=self.limits.wall_time_s)
+        except (TimeoutError, SandboxWorkerError) as e:
+            timed_out = isinstance(e, TimeoutError)
+            with self._lock:
+                if timed_out:
+                    self.timeouts += 1
+                else:
+                    self.crashes += 1
+            self._retire(worker)
+            self._replace_in_background()
+            reason = (f"Script exceeded the {self.limits.wall_time_s}s wall-clock limit." if timed_out
+                      else f"{e} The script may have exceeded the {self.limits.memory_bytes} byte memory limit.")
+            return {
+                "successful": False,
+                "exit_code": None,
+                "stdout": "",
+                "stderr": reason,
+                "execution_time_ms": int((time.perf_counter() - started) * 1000),
+            }
+        if self._closed:
+            self._retire(worker)
+        elif not result.get("successful") or worker.jobs >= self.max_jobs_per_worker:
+            # A failed script may have left its worker half-modified
+            with self._lock:
+                self.recycled += 1
+            self._retire(worker)
+            self._replace_in_background()
+        else:
+            self._idle.put(worker)
+        return result
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._retire(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.size,
+                "live_workers": self._workers,
+                "idle_workers": self._idle.qsize(),
+                "workers_started": self.workers_started,
+                "jobs": self.jobs,
+                "timeouts": self.timeouts,
+                "crashes": self.crashes,
+                "recycled": self.recycled,
+            }
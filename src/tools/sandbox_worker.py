@@ -0,0 +1,167 @@
+"""
+Warm sandbox worker process, started by src.tools.sandbox.SandboxPool.
+
+Imports the preload modules once, then executes analysis scripts one at a time. Each job is one
+JSON line on stdin, {"script", "inputs": {key: path}, "cpu_time_s", "max_output_bytes"}, and each
+result is one JSON line on the protocol stream. Scripts run in a fresh namespace with
+`inputs` (read-only memoryviews over the Workbench payload files), `iter_chunks(key)` (the same
+payload as consecutive chunks, read ahead sequentially), `load_json(key)` and the preloaded
+modules (numpy as `np`, pandas as `pd`). Their stdout/stderr are captured.
+The process is reused for many jobs. After each one it drops the modules the script imported
+and restores sys.path, os.environ, the working directory and the SIGXCPU handler. Changes to
+modules that were already loaded (monkeypatches) are not undone. The pool therefore replaces a
+worker after a failed job or after a fixed number of jobs.
+Standard library only: this file runs as a plain script and does not import `src`.
+"""
+import io
+import os
+import sys
+import json
+import mmap
+import time
+import signal
+import resource
+import importlib
+import traceback
+from contextlib import redirect_stdout, redirect_stderr
+
+MODULE_ALIASES = {"numpy": "np", "pandas": "pd"}
+CHUNK_SIZE = 1024 * 1024  # Same default as the Workbench's iter_chunks()
+
+
+class CPUTimeLimitExceeded(Exception):
+    """Raised inside the script when it exceeds its CPU-time budget (SIGXCPU)."""
+
+
+def _on_sigxcpu(signum, frame):
+    raise CPUTimeLimitExceeded("CPU time limit exceeded.")
+
+
+def _cpu_seconds() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _set_cpu_limit(seconds):
+    # RLIMIT_CPU counts the whole process lifetime, so each job's budget starts from current usage
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if seconds is None:
+        soft = hard
+    else:
+        soft = int(_cpu_seconds() + seconds) + 1
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _map_inputs(paths):
+    views = {}
+    for key, path in paths.items():
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                views[key] = memoryview(b"")
+            else:
+                views[key] = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    return views
+
+
+def _iter_chunks(view, chunk_size=CHUNK_SIZE):
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive.")
+    if isinstance(view.obj, mmap.mmap) and hasattr(mmap, "MADV_SEQUENTIAL"):
+        view.obj.madvise(mmap.MADV_SEQUENTIAL)  # Read ahead; pages already read can be reclaimed early
+    for offset in range(0, len(view), chunk_size):
+        yield view[offset:offset + chunk_size]
+
+
+def _snapshot():
+    return set(sys.modules), list(sys.path), dict(os.environ), os.getcwd()
+
+
+def _restore(snapshot):
+    modules, path, environ, cwd = snapshot
+    for name in set(sys.modules) - modules:
+        del sys.modules[name]
+    sys.path[:] = path
+    if os.environ != environ:
+        os.environ.clear()
+        os.environ.update(environ)
+    os.chdir(cwd)
+    signal.signal(signal.SIGXCPU, _on_sigxcpu)
+
+
+def _truncate(text, limit):
+    if limit is None or len(text) <= limit:
+        return text
+    return text[:limit] + f"\n[truncated {len(text) - limit} characters]"
+
+
+def run_job(job, preloaded):
+    inputs = _map_inputs(job.get("inputs") or {})
+    namespace = {
+        "__name__": "__sandbox__",
+        "inputs": inputs,
+        "iter_chunks": lambda key, chunk_size=CHUNK_SIZE: _iter_chunks(inputs[key], chunk_size),
+        "load_json": lambda key: json.loads(bytes(inputs[key]).decode("utf-8")),
+        **preloaded,
+    }
+    stdout, stderr = io.StringIO(), io.StringIO()
+
+    snapshot = _snapshot()
+    started = time.perf_counter()
+    _set_cpu_limit(job.get("cpu_time_s"))
+    try:
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                exec(compile(job["script"], "<analysis-script>", "exec"), namespace)
+                exit_code = 0
+            except SystemExit as e:
+                exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            except BaseException:
+                traceback.print_exc()
+                exit_code = 1
+    finally:
+        _set_cpu_limit(None)
+        _restore(snapshot)
+    elapsed_ms = int((time.perf_counter() - started) * 1000)
+
+    limit = job.get("max_output_bytes")
+    return {
+        "successful": exit_code == 0,
+        "exit_code": exit_code,
+        "stdout": _truncate(stdout.getvalue(), limit),
+        "stderr": _truncate(stderr.getvalue(), limit),
+        "execution_time_ms": elapsed_ms,
+    }
+
+
+def main():
+    preloaded = {}
+    for name in sys.argv[1:]:
+        try:
+            preloaded[MODULE_ALIASES.get(name, name.rsplit(".", 1)[-1])] = importlib.import_module(name)
+        except ImportError:
+            pass
+
+    # Keep a private copy of stdout for the protocol and point fd 1 at /dev/null, so output
+    # written below the Python level (os.write, subprocesses) cannot corrupt the result stream
+    protocol = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    signal.signal(signal.SIGXCPU, _on_sigxcpu)
+
+    protocol.write(json.dumps({"ready": True, "preloaded": sorted(preloaded)}) + "\n")
+    protocol.flush()
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            result = run_job(json.loads(line), preloaded)
+        except Exception as e:  # Malformed job or unreadable input file
+            result = {"successful": False, "exit_code": 1, "stdout": "", "stderr": repr(e), "execution_time_ms": 0}
+        protocol.write(json.dumps(result) + "\n")
+        protocol.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,518 @@
+import ssl
+import json
+import asyncio
+import threading
+import http.client
+from urllib.parse import urljoin, urlsplit
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# --- HTTP Transport for the Composio API ---
+# Tool calls go over a shared transport that keeps connections alive and pools them per host,
+# instead of opening a new connection for every call. HTTP/2 (one multiplexed connection per host)
+# is used when httpx and h2 are installed (httpx[http2] in requirements.txt); otherwise pooled
+# HTTP/1.1 keep-alive connections. Every transport raises ConnectionError and TimeoutError for
+# network failures, so retry policies treat them alike. Anything that speaks the wire protocol
+# below can sit behind it: the real API, or the local stand-in server in src.tools.local_server.
+
+# Wire protocol: POST {"arguments": {...}, "user_id": ...} -> {"output_summary": ..., "data" | "workbench_key": ...}
+TOOL_EXECUTE_PATH = "/api/v1/tools/{tool_slug}/execute"
+
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 10
+DEFAULT_TRANSPORT_TIMEOUT_S = 30.0
+
+
+class TransportResponse(NamedTuple):
+    status: int
+    headers: Dict[str, str]  # Lower-cased header names
+    body: bytes
+
+    def json(self) -> Any:
+        return json.loads(self.body.decode("utf-8")) if self.body else None
+
+
+class Origin(NamedTuple):
+    scheme: str
+    host: str
+    port: int
+
+
+def split_url(url: str) -> Tuple[Origin, str]:
+    """Splits an absolute URL into its origin (the pooling unit) and the request target."""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError(f"Unsupported URL: {url!r}")
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    return Origin(parts.scheme, parts.hostname, port), target
+
+
+# --- HTTP/1.1 Framing (shared with the local stand-in server) ---
+
+async def read_http_head(reader: asyncio.StreamReader) -> Optional[Tuple[str, Dict[str, str]]]:
+    """Reads a start line and headers. Returns None if the peer closed the connection cleanly."""
+    start_line = await reader.readline()
+    if not start_line:
+        return None
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n"):
+            break
+        if not line:
+            raise asyncio.IncompleteReadError(b"", None)
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return start_line.decode("latin-1").rstrip("\r\n"), headers
+
+
+async def read_http_body(reader: asyncio.StreamReader, headers: Dict[str, str], until_eof: bool = False) -> bytes:
+    """Reads a message body framed by Content-Length or chunked encoding (or EOF, for responses)."""
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks: List[bytes] = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0].strip(), 16)
+            if size == 0:
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass  # Trailers
+                return b"".join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+    if "content-length" in headers:
+        return await reader.readexactly(int(headers["content-length"]))
+    return await reader.read() if until_eof else b""
+
+
+def encode_http_message(start_line: str, headers: Dict[str, str], body: bytes = b"") -> bytes:
+    lines = [start_line] + [f"{name}: {value}" for name, value in headers.items()]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+class AsyncTransport:
+    """
+    Base interface for async HTTP transports used by the AsyncComposioClient.
+    Subclasses must implement `request`; `url` may be absolute or relative to the transport's base URL.
+    `idempotent` marks requests that are safe to send twice (see the stale-connection replay below).
+    """
+    async def request(
+        self,
+        method: str,
+        url: str,
+        json_body: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        idempotent: bool = False,
+    ) -> TransportResponse:
+        raise NotImplementedError("AsyncTransport subclasses must implement request().")
+
+    async def aclose(self):
+        """Closes pooled connections."""
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class AsyncHTTPTransport(AsyncTransport):
+    """
+    HTTP/1.1 keep-alive transport on asyncio streams. Idle connections are pooled per origin and
+    reused; at most `max_connections_per_host` requests per origin are in flight at once, and
+    further requests wait for a free connection. A pooled connection the server has already
+    closed is detected on use and, for idempotent requests only, the request is replayed once on a
+    fresh connection (the server may have executed it before closing, so a non-idempotent call
+    such as creating a Notion page fails instead of risking a duplicate).
+    """
+    def __init__(
+        self,
+        base_url: str = "",
+        max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+        timeout_s: float = DEFAULT_TRANSPORT_TIMEOUT_S,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        self.base_url = base_url
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout_s = timeout_s
+        self.headers = dict(headers or {})
+        self._idle: Dict[Origin, List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]] = {}
+        self._limits: Dict[Origin, asyncio.Semaphore] = {}
+        self._ssl_context: Optional[ssl.SSLContext] = None
+        self.requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+
+    def _limit_for(self, origin: Origin) -> asyncio.Semaphore:
+        if origin not in self._limits:
+            self._limits[origin] = asyncio.Semaphore(self.max_connections_per_host)
+        return self._limits[origin]
+
+    def _checkout(self, origin: Origin) -> Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]:
+        """Pops an idle connection for the origin, discarding any the server has closed."""
+        idle = self._idle.get(origin, [])
+        while idle:
+            reader, writer = idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer
+            writer.close()
+        return None
+
+    async def _connect(self, origin: Origin) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        context = None
+        if origin.scheme == "https":
+            self._ssl_context = self._ssl_context or ssl.create_default_context()
+            context = self._ssl_context
+        return await asyncio.open_connection(origin.host, origin.port, ssl=context)
+
+    async def _exchange(
+        self,
+        connection: Tuple[asyncio.StreamReader, asyncio.StreamWriter],
+        origin: Origin,
+        method: str,
+        target: str,
+        body: bytes,
+        headers: Dict[str, str],
+    ) -> Tuple[TransportResponse, bool]:
+        """Sends one request and reads its response. Returns (response, connection_reusable)."""
+        reader, writer = connection
+        default_port = 443 if origin.scheme == "https" else 80
+        request_headers = {
+            "Host": origin.host if origin.port == default_port else f"{origin.host}:{origin.port}",
+            "Connection": "keep-alive",
+            "Accept": "application/json",
+            "Content-Length": str(len(body)),
+            **({"Content-Type": "application/json"} if body else {}),
+            **self.headers,
+            **headers,
+        }
+        writer.write(encode_http_message(f"{method} {target} HTTP/1.1", request_headers, body))
+        await writer.drain()
+
+        head = await read_http_head(reader)
+        if head is None:
+            raise ConnectionResetError("Connection closed by the server before a response was received.")
+        status_line, response_headers = head
+        version, status, _ = (status_line.split(" ", 2) + [""])[:3]
+        keep_alive = version == "HTTP/1.1" and response_headers.get("connection", "").lower() != "close"
+        has_length = "content-length" in response_headers or "transfer-encoding" in response_headers
+        response_body = await read_http_body(reader, response_headers, until_eof=not has_length)
+        return TransportResponse(int(status), response_headers, response_body), keep_alive and has_length
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        json_body: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        idempotent: bool = False,
+    ) -> TransportResponse:
+        origin, target = split_url(urljoin(self.base_url, url))
+        body = b"" if json_body is None else json.dumps(json_body).encode("utf-8")
+
+        async with self._limit_for(origin):
+            self.requests += 1
+            connection = self._checkout(origin)
+            for replay in (False, True):
+                reused = connection is not None
+                if reused:
+                    self.connections_reused += 1
+                else:
+                    connection = await asyncio.wait_for(self._connect(origin), self.timeout_s)
+                    self.connections_created += 1
+
+                try:
+                    response, reusable = await asyncio.wait_for(
+                        self._exchange(connection, origin, method, target, body, headers or {}), self.timeout_s
+                    )
+                except (ConnectionError, asyncio.IncompleteReadError) as e:
+                    connection[1].close()
+                    connection = None
+                    if reused and idempotent and not replay:
+                        continue  # Stale keep-alive connection: replay once on a fresh one
+                    raise ConnectionError(f"{method} {url} failed: {e!r}") from e
+                except BaseException:
+                    connection[1].close()  # Timed out or cancelled mid-exchange: the stream state is unknown
+                    raise
+
+                if reusable:
+                    self._idle.setdefault(origin, []).append(connection)
+                else:
+                    connection[1].close()
+                return response
+
+    async def aclose(self):
+        for idle in self._idle.values():
+            for _, writer in idle:
+                writer.close()
+        self._idle.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "idle_connections": sum(len(idle) for idle in self._idle.values()),
+        }
+
+
+# --- Synchronous Transports (used by the ComposioClient's worker threads) ---
+
+
+class Transport:
+    """
+    Base interface for thread-safe HTTP transports used by the ComposioClient.
+    Subclasses must implement `request`; `url` may be absolute or relative to the transport's base URL.
+    `idempotent` marks requests that are safe to send twice (see the stale-connection replay below).
+    """
+    def request(
+        self,
+        method: str,
+        url: str,
+        json_body: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        idempotent: bool = False,
+    ) -> TransportResponse:
+        raise NotImplementedError("Transport subclasses must implement request().")
+
+    def close(self):
+        """Closes pooled connections."""
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class HTTPTransport(Transport):
+    """
+    Thread-safe HTTP/1.1 keep-alive connection pool built on http.client. Idle connections are
+    reused per origin, at most `max_connections_per_host` requests per origin run at once, and an
+    idempotent request on a pooled connection the server has closed is replayed once on a fresh
+    connection.
+    """
+    def __init__(
+        self,
+        base_url: str = "",
+        max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+        timeout_s: float = DEFAULT_TRANSPORT_TIMEOUT_S,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        self.base_url = base_url
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout_s = timeout_s
+        self.headers = dict(headers or {})
+        self._idle: Dict[Origin, List[http.client.HTTPConnection]] = {}
+        self._limits: Dict[Origin, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+
+    def _limit_for(self, origin: Origin) -> threading.BoundedSemaphore:
+        with self._lock:
+            if origin not in self._limits:
+                self._limits[origin] = threading.BoundedSemaphore(self.max_connections_per_host)
+            return self._limits[origin]
+
+    def _checkout(self, origin: Origin) -> http.client.HTTPConnection:
+        with self._lock:
+            self.requests += 1
+            idle = self._idle.get(origin)
+            if idle:
+                self.connections_reused += 1
+                return idle.pop()
+            self.connections_created += 1
+        if origin.scheme == "https":
+            return http.client.HTTPSConnection(origin.host, origin.port, timeout=self.timeout_s)
+        return http.client.HTTPConnection(origin.host, origin.port, timeout=self.timeout_s)
+
+    def _checkin(self, origin: Origin, connection: http.client.HTTPConnection):
+        with self._lock:
+            self._idle.setdefault(origin, []).append(connection)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        json_body: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        idempotent: bool = False,
+    ) -> TransportResponse:
+        origin, target = split_url(urljoin(self.base_url, url))
+        body = None if json_body is None else json.dumps(json_body).encode("utf-8")
+        request_headers = {
+            "Accept": "application/json",
+            **({"Content-Type": "application/json"} if body else {}),
+            **self.headers,
+            **(headers or {}),
+        }
+
+        with self._limit_for(origin):
+            connection = self._checkout(origin)
+            for replay in (False, True):
+                reused = connection.sock is not None
+                try:
+                    connection.request(method, target, body=body, headers=request_headers)
+                    response = connection.getresponse()
+                    response_body = response.read()
+                except (ConnectionError, http.client.RemoteDisconnected, http.client.BadStatusLine) as e:
+                    connection.close()
+                    if reused and idempotent and not replay:
+                        # Stale keep-alive connection: http.client reconnects on the next request
+                        with self._lock:
+                            self.connections_created += 1
+                        continue
+                    raise ConnectionError(f"{method} {url} failed: {e!r}") from e
+                except BaseException:
+                    connection.close()
+                    raise
+
+                if response.will_close:
+                    connection.close()
+                else:
+                    self._checkin(origin, connection)
+                return TransportResponse(
+                    response.status, {k.lower(): v for k, v in response.getheaders()}, response_body
+                )
+
+    def close(self):
+        with self._lock:
+            for idle in self._idle.values():
+                for connection in idle:
+                    connection.close()
+            self._idle.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "http_version": "HTTP/1.1",
+                "requests": self.requests,
+                "connections_created": self.connections_created,
+                "connections_reused": self.connections_reused,
+                "idle_connections": sum(len(idle) for idle in self._idle.values()),
+            }
+
+
+class HTTPXTransport(Transport):
+    """
+    Transport on an httpx.Client, which negotiates HTTP/2 (many concurrent requests multiplexed
+    over one connection per host) when the h2 package is installed. httpx only limits connections
+    across the whole client, so at most `max_connections_per_host` requests per origin are let
+    through at once here, as in HTTPTransport. Connection reuse is counted through httpcore's
+    trace hook: every request that did not open a TCP connection reused one. httpx errors are
+    raised as TimeoutError / ConnectionError, and an idempotent request that fails on a reused
+    connection is replayed once on a fresh one.
+    """
+    def __init__(
+        self,
+        base_url: str = "",
+        max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+        timeout_s: float = DEFAULT_TRANSPORT_TIMEOUT_S,
+        headers: Optional[Dict[str, str]] = None,
+        http2: bool = True,
+    ):
+        import httpx  # Optional dependency, see create_transport()
+
+        self._httpx = httpx
+        self.base_url = base_url
+        self.max_connections_per_host = max_connections_per_host
+        self.http2 = http2 and _h2_available()
+        self._client = httpx.Client(
+            base_url=base_url,
+            http2=self.http2,
+            timeout=timeout_s,
+            headers=headers,
+            # Per-origin caps are enforced by _limit_for(); httpx's own limits are client-wide
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=None),
+        )
+        self._limits: Dict[Origin, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections_created = 0
+        self.http_versions: Dict[str, int] = {}
+
+    def _limit_for(self, origin: Origin) -> threading.BoundedSemaphore:
+        with self._lock:
+            if origin not in self._limits:
+                self._limits[origin] = threading.BoundedSemaphore(self.max_connections_per_host)
+            return self._limits[origin]
+
+    def _send(self, method: str, url: str, json_body: Any, headers: Optional[Dict[str, str]]) -> Any:
+        """Sends one request; an httpx error is tagged with whether it happened on a new connection."""
+        opened = []
+
+        def _trace(event_name: str, info: Dict[str, Any]):
+            if event_name == "connection.connect_tcp.complete":
+                opened.append(True)
+                with self._lock:
+                    self.connections_created += 1
+
+        try:
+            response = self._client.request(
+                method, url, json=json_body, headers=headers, extensions={"trace": _trace}
+            )
+        except self._httpx.TransportError as e:
+            e.opened_connection = bool(opened)
+            raise
+        return response
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        json_body: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        idempotent: bool = False,
+    ) -> TransportResponse:
+        origin, _ = split_url(urljoin(self.base_url, url))
+        with self._limit_for(origin):
+            for replay in (False, True):
+                try:
+                    response = self._send(method, url, json_body, headers)
+                    break
+                except self._httpx.TimeoutException as e:
+                    raise TimeoutError(f"{method} {url} timed out: {e!r}") from e
+                except self._httpx.TransportError as e:
+                    if idempotent and not replay and not e.opened_connection:
+                        continue  # Stale keep-alive connection: replay once on a fresh one
+                    raise ConnectionError(f"{method} {url} failed: {e!r}") from e
+        with self._lock:
+            self.requests += 1
+            self.http_versions[response.http_version] = self.http_versions.get(response.http_version, 0) + 1
+        return TransportResponse(
+            response.status_code, {k.lower(): v for k, v in response.headers.items()}, response.content
+        )
+
+    def close(self):
+        self._client.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "http_version": "HTTP/2" if self.http2 else "HTTP/1.1",
+                "requests": self.requests,
+                "connections_created": self.connections_created,
+                "connections_reused": self.requests - self.connections_created,
+                "responses_by_http_version": dict(self.http_versions),
+            }
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def create_transport(
+    base_url: str,
+    max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+    timeout_s: float = DEFAULT_TRANSPORT_TIMEOUT_S,
+    headers: Optional[Dict[str, str]] = None,
+) -> Transport:
+    """
+    The best available pooled transport: HTTP/2 via httpx when httpx and h2 are installed,
+    otherwise the stdlib HTTP/1.1 keep-alive pool.
+    """
+    try:
+        import httpx  # noqa: F401
+        http2_ready = _h2_available()
+    except ImportError:
+        http2_ready = False
+    if http2_ready:
+        return HTTPXTransport(base_url, max_connections_per_host, timeout_s, headers, http2=True)
+    return HTTPTransport(base_url, max_connections_per_host, timeout_s, headers)
@@ -0,0 +1,223 @@
+import os
+import re
+import mmap
+import time
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from urllib.parse import quote, unquote
+from typing import Dict, Any, Optional, Union, Iterator
+from src.identity import canonical_json
+from src.paths import private_state_dir
+
+# --- Content-Addressed Workbench Storage ---
+# Payloads are written once under their SHA-256 digest and read back through mmap,
+# so identical payloads are deduplicated and retrieval never copies the blob into Python memory.
+# Keys arrive from LLM tool input, so only well-formed digests are ever turned into paths.
+
+KEY_PREFIX = "sha256-"
+DEFAULT_CHUNK_SIZE = 1024 * 1024  # 1 MiB per chunk when streaming payloads
+DEFAULT_WORKBENCH_DIR_NAME = "workbench"  # Under the per-user STATE_ROOT (see src.paths)
+DEFAULT_MAX_OPEN_MAPS = 64  # Each open map holds a file descriptor and address space
+DEFAULT_OBJECT_TTL_S = 7 * 24 * 3600  # prune() removes payloads not stored for this long
+
+_DIGEST_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+Payload = Union[bytes, bytearray, memoryview, str, Dict[str, Any], list]
+
+
+def encode_payload(data: Payload) -> bytes:
+    """Serialises a payload to bytes: raw bytes as-is, text as UTF-8, anything else as canonical JSON."""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return bytes(data)
+    if isinstance(data, str):
+        return data.encode("utf-8")
+    return canonical_json(data).encode("utf-8")
+
+
+class LocalWorkbenchStore:
+    """
+    Disk-backed, content-addressed Workbench backend.
+    Keys have the form 'sha256-<64 lowercase hex digits>'; optional human-readable names are
+    stored as references pointing at a digest key. Anything else is an unknown key.
+    """
+    def __init__(self, root_dir: Optional[str] = None, max_open_maps: int = DEFAULT_MAX_OPEN_MAPS):
+        self.root_dir = root_dir or os.getenv("COMPOSIO_WORKBENCH_DIR") or private_state_dir(DEFAULT_WORKBENCH_DIR_NAME)
+        self._objects_dir = os.path.join(self.root_dir, "objects")
+        self._refs_dir = os.path.join(self.root_dir, "refs")
+        os.makedirs(self._objects_dir, mode=0o700, exist_ok=True)
+        os.makedirs(self._refs_dir, mode=0o700, exist_ok=True)
+
+        # Open read-only maps, shared by every retrieve of the same key; least recently used first
+        self.max_open_maps = max_open_maps
+        self._maps: "OrderedDict[str, mmap.mmap]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _object_path(self, digest: str) -> str:
+        if not _DIGEST_PATTERN.fullmatch(digest):
+            raise KeyError(f"Invalid workbench digest: {digest!r}")
+        return os.path.join(self._objects_dir, digest[:2], digest[2:])
+
+    def _ref_path(self, name: str) -> str:
+        return os.path.join(self._refs_dir, quote(name, safe=""))
+
+    def resolve(self, key: str) -> Optional[str]:
+        """Returns the hex digest for a content key or named reference, or None if unknown or malformed."""
+        if not isinstance(key, str) or not key:
+            return None
+        if key.startswith(KEY_PREFIX):
+            digest = key[len(KEY_PREFIX):]
+            if not _DIGEST_PATTERN.fullmatch(digest):
+                return None
+            return digest if os.path.isfile(self._object_path(digest)) else None
+        try:
+            with open(self._ref_path(key), "r", encoding="utf-8") as f:
+                target = f.read().strip()
+        except OSError:
+            return None
+        # References always point at a content key, never at another reference
+        return self.resolve(target) if target.startswith(KEY_PREFIX) else None
+
+    def exists(self, key: str) -> bool:
+        return self.resolve(key) is not None
+
+    def path(self, key: str) -> str:
+        """Absolute path of the payload file, for processes that map it themselves. Raises KeyError."""
+        digest = self.resolve(key)
+        if digest is None:
+            raise KeyError(f"Unknown workbench key: {key}")
+        return os.path.abspath(self._object_path(digest))
+
+    def store(self, data: Payload, name: Optional[str] = None) -> str:
+        """
+        Writes the payload once (identical payloads are deduplicated) and returns its content key.
+        If a name is given it is recorded as a reference, and returned instead of the digest key.
+        """
+        blob = encode_payload(data)
+        digest = hashlib.sha256(blob).hexdigest()
+        path = self._object_path(digest)
+
+        if os.path.exists(path):
+            os.utime(path)  # Stored again: keep it from being pruned
+        else:
+            os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+            # Write to a temp file and rename, so readers never see a partial object
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(blob)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+
+        key = f"{KEY_PREFIX}{digest}"
+        if name:
+            ref_path = self._ref_path(name)
+            fd, tmp_path = tempfile.mkstemp(dir=self._refs_dir, prefix=".tmp-")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(key)
+            os.replace(tmp_path, ref_path)
+            return name
+        return key
+
+    def retrieve(self, key: str) -> memoryview:
+        """
+        Returns a read-only, zero-copy view of the payload backed by mmap.
+        Raises KeyError if the key is unknown.
+        """
+        digest = self.resolve(key)
+        if digest is None:
+            raise KeyError(f"Unknown workbench key: {key}")
+
+        with self._lock:
+            mapped = self._maps.get(digest)
+            if mapped is None:
+                path = self._object_path(digest)
+                if os.path.getsize(path) == 0:
+                    return memoryview(b"")  # mmap cannot map empty files
+                with open(path, "rb") as f:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._maps[digest] = mapped
+                while len(self._maps) > self.max_open_maps:
+                    _, evicted = self._maps.popitem(last=False)
+                    self._close_map(evicted)
+            else:
+                self._maps.move_to_end(digest)
+        return memoryview(mapped)
+
+    @staticmethod
+    def _close_map(mapped: mmap.mmap):
+        try:
+            mapped.close()
+        except BufferError:
+            pass  # A caller still holds a view; the map is released with its last view
+
+    def retrieve_range(self, key: str, offset: int, length: int) -> memoryview:
+        """
+        Returns a zero-copy view of `length` bytes starting at `offset`.
+        The range is clipped to the end of the payload; only the touched pages are read from disk.
+        """
+        if offset < 0 or length < 0:
+            raise ValueError("offset and length must be non-negative.")
+        return self.retrieve(key)[offset:offset + length]
+
+    def iter_chunks(self, key: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[memoryview]:
+        """Yields consecutive zero-copy views of at most `chunk_size` bytes over the payload."""
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive.")
+        payload = self.retrieve(key)
+        mapped = payload.obj
+        if isinstance(mapped, mmap.mmap) and hasattr(mmap, "MADV_SEQUENTIAL"):
+            mapped.madvise(mmap.MADV_SEQUENTIAL)  # Hint aggressive read-ahead and early page reclaim
+
+        for offset in range(0, len(payload), chunk_size):
+            yield payload[offset:offset + chunk_size]
+
+    def size(self, key: str) -> int:
+        digest = self.resolve(key)
+        if digest is None:
+            raise KeyError(f"Unknown workbench key: {key}")
+        return os.path.getsize(self._object_path(digest))
+
+    def prune(self, max_age_s: Optional[float] = None) -> int:
+        """
+        Removes payloads last stored more than `max_age_s` ago (default: WORKBENCH_TTL_S, else
+        7 days), plus references to them. Returns the number of payloads removed.
+        Caches and checkpoints check that their keys still exist, so pruned payloads are refetched.
+        """
+        if max_age_s is None:
+            max_age_s = float(os.getenv("WORKBENCH_TTL_S", DEFAULT_OBJECT_TTL_S))
+        cutoff = time.time() - max_age_s
+        removed = 0
+        for prefix in os.listdir(self._objects_dir):
+            prefix_dir = os.path.join(self._objects_dir, prefix)
+            for name in os.listdir(prefix_dir) if os.path.isdir(prefix_dir) else ():
+                path = os.path.join(prefix_dir, name)
+                try:
+                    if os.path.getmtime(path) >= cutoff:
+                        continue
+                    with self._lock:
+                        mapped = self._maps.pop(prefix + name, None)
+                    if mapped is not None:
+                        self._close_map(mapped)
+                    os.unlink(path)  # Open maps of other processes stay valid until they close
+                    removed += 1
+                except OSError:
+                    continue
+        for name in os.listdir(self._refs_dir):
+            if not name.startswith(".tmp-") and self.resolve(unquote(name)) is None:
+                try:
+                    os.unlink(os.path.join(self._refs_dir, name))
+                except OSError:
+                    pass
+        return removed
+
+    def close(self):
+        """Unmaps every open payload. Views returned by retrieve() must be released first."""
+        with self._lock:
+            for mapped in self._maps.values():
+                self._close_map(mapped)
+            self._maps.clear()
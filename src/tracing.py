@@ -0,0 +1,307 @@
+import os
+import json
+import time
+import threading
+import functools
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from src.metrics import LLM_TOKENS, LLM_CALL_DURATION
+
+# --- Lightweight Tracing ---
+# Records timed spans for workflow runs, tasks/pipeline stages, Scientist tool calls, ComposioClient
+# methods and LLM calls. Each span carries its duration plus, where known, payload sizes
+# (bytes_in/bytes_out) and token counts (tokens_in/tokens_out); LLM token counts roll up into
+# the enclosing span. Spans live in a bounded in-memory buffer and are exported in the Chrome
+# Trace Event format, which chrome://tracing and the Perfetto UI open offline.
+# TRACE_FILE exports automatically at the end of each workflow run; TRACING_DISABLED=1 turns
+# recording off (the instrumented calls then cost one attribute check).
+
+DEFAULT_MAX_SPANS = 100_000
+TOKEN_ATTRIBUTES = ("tokens_in", "tokens_out")
+
+# The innermost open span of the current thread or asyncio task
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+def payload_size(value: Any) -> int:
+    """Size in bytes of a text or binary payload; 0 for anything else (never serialises objects)."""
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, memoryview):
+        return value.nbytes
+    return 0
+
+
+class Span:
+    """One timed operation. Times are perf_counter seconds; attributes end up in the trace event args."""
+    __slots__ = ("name", "category", "start_s", "end_s", "thread_id", "thread_name", "parent", "attributes")
+
+    def __init__(self, name: str, category: str, attributes: Dict[str, Any], parent: Optional["Span"] = None):
+        self.name = name
+        self.category = category
+        self.start_s = time.perf_counter()
+        self.end_s: Optional[float] = None
+        thread = threading.current_thread()
+        self.thread_id = threading.get_native_id()
+        self.thread_name = thread.name
+        self.parent = parent
+        self.attributes = attributes
+
+    @property
+    def duration_s(self) -> float:
+        return (self.end_s if self.end_s is not None else time.perf_counter()) - self.start_s
+
+    def set(self, **attributes: Any) -> "Span":
+        self.attributes.update(attributes)
+        return self
+
+    def add(self, **counters: int) -> "Span":
+        """Increments numeric attributes (e.g. token counts) instead of replacing them."""
+        for key, value in counters.items():
+            self.attributes[key] = self.attributes.get(key, 0) + value
+        return self
+
+
+class Tracer:
+    """
+    Thread- and asyncio-safe span recorder. Spans nest through a context variable, so a span
+    opened in a worker thread or task is parented correctly when the context is propagated
+    (asyncio tasks and asyncio.to_thread do this automatically).
+    """
+    def __init__(self, enabled: bool = True, max_spans: int = DEFAULT_MAX_SPANS):
+        self.enabled = enabled
+        self.dropped_spans = 0
+        self._spans: deque = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+        # Trace timestamps are relative to this instant; the wall-clock equivalent goes in the export
+        self._epoch_s = time.perf_counter()
+        self._epoch_unix_s = time.time()
+
+    def current_span(self) -> Optional[Span]:
+        return _current_span.get()
+
+    @contextmanager
+    def span(self, name: str, category: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        """Times the enclosed block. Yields the Span (None when tracing is disabled)."""
+        if not self.enabled:
+            yield None
+            return
+        span = Span(name, category, attributes, parent=_current_span.get())
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.attributes.setdefault("error", f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            _current_span.reset(token)
+            self.finish(span)
+
+    def annotate(self, **attributes: Any):
+        """Sets attributes on the innermost open span, if any."""
+        span = _current_span.get()
+        if span is not None:
+            span.set(**attributes)
+
+    def finish(self, span: Span, end_s: Optional[float] = None):
+        """Closes a span, rolls its token counts up into its parent and adds it to the buffer."""
+        span.end_s = time.perf_counter() if end_s is None else end_s
+        if span.parent is not None:
+            tokens = {k: span.attributes[k] for k in TOKEN_ATTRIBUTES if span.attributes.get(k)}
+            if tokens:
+                span.parent.add(**tokens)
+        with self._lock:
+            if len(self._spans) == self._spans.maxlen:
+                self.dropped_spans += 1
+            self._spans.append(span)
+
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+            self.dropped_spans = 0
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """The recorded spans as a Chrome Trace Event document (complete 'X' events, microseconds)."""
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = []
+        threads: Dict[int, str] = {}
+        for span in self.spans():
+            threads.setdefault(span.thread_id, span.thread_name)
+            events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": round((span.start_s - self._epoch_s) * 1e6, 3),
+                "dur": round(span.duration_s * 1e6, 3),
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": span.attributes,
+            })
+        # Metadata events label the rows with thread names
+        events.extend(
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in threads.items()
+        )
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"epoch_unix_s": self._epoch_unix_s, "dropped_spans": self.dropped_spans},
+        }
+
+    def export_chrome_trace(self, path: str) -> str:
+        """Writes the Chrome trace JSON file and returns its path."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f, default=str)
+        return path
+
+
+TRACER = Tracer(enabled=os.getenv("TRACING_DISABLED", "").lower() not in ("1", "true"))
+
+
+def export_trace(path: Optional[str] = None) -> Optional[str]:
+    """Exports the process-wide trace to `path` (default: TRACE_FILE); returns the path, or None if unset."""
+    path = path or os.getenv("TRACE_FILE")
+    if not path or not TRACER.enabled:
+        return None
+    TRACER.export_chrome_trace(path)
+    print(f"-> Trace written to {path} ({len(TRACER.spans())} spans; open in chrome://tracing or Perfetto)")
+    return path
+
+
+def traced(category: str, name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """
+    Decorator that records a span per call. Text/bytes arguments and results are counted as
+    bytes_in/bytes_out; the function can set or refine them with TRACER.annotate().
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return func(*args, **kwargs)
+            bytes_in = sum(payload_size(a) for a in args) + sum(payload_size(v) for v in kwargs.values())
+            with TRACER.span(span_name, category) as span:
+                if bytes_in:
+                    span.set(bytes_in=bytes_in)
+                result = func(*args, **kwargs)
+                if "bytes_out" not in span.attributes and payload_size(result):
+                    span.set(bytes_out=payload_size(result))
+                return result
+        return wrapper
+    return decorator
+
+
+class SequentialTaskSpans:
+    """
+    Task spans for a sequential CrewAI crew, built from Task completion callbacks: each task is
+    timed from the previous task's completion (or from start()), and is credited with the
+    tokens its LLM calls added to the enclosing span in the meantime.
+    """
+    def __init__(self, tracer: Tracer = TRACER, category: str = "task"):
+        self.tracer = tracer
+        self.category = category
+        self.start()
+
+    def _enclosing_tokens(self) -> Dict[str, int]:
+        attributes = self._parent.attributes if self._parent is not None else {}
+        return {k: attributes.get(k, 0) for k in TOKEN_ATTRIBUTES}
+
+    def start(self):
+        """Marks the start of the first task (call right before kickoff)."""
+        self._parent = self.tracer.current_span()
+        self._mark_s = time.perf_counter()
+        self._mark_tokens = self._enclosing_tokens()
+
+    def callback(self, task_name: str) -> Callable[[Any], None]:
+        """Returns a Task(callback=...) that records the task's span when it completes."""
+        def _on_complete(output: Any):
+            if not self.tracer.enabled:
+                return
+            tokens = self._enclosing_tokens()
+            span = Span(task_name, self.category, {
+                "bytes_out": payload_size(str(getattr(output, "raw", output))),
+                **{k: tokens[k] - self._mark_tokens[k] for k in TOKEN_ATTRIBUTES},
+            })
+            span.start_s = self._mark_s
+            self.tracer.finish(span)  # No parent: the tokens were already counted by the enclosing span
+            self._mark_s, self._mark_tokens = span.end_s, tokens
+        return _on_complete
+
+
+def _llm_token_usage(response: Any) -> Dict[str, int]:
+    """Prompt/completion token counts from a LangChain LLMResult (provider usage or message metadata)."""
+    usage = (getattr(response, "llm_output", None) or {}).get("token_usage") or {}
+    if usage:
+        return {"tokens_in": usage.get("prompt_tokens", 0), "tokens_out": usage.get("completion_tokens", 0)}
+    counts = {"tokens_in": 0, "tokens_out": 0}
+    for generations in getattr(response, "generations", None) or []:
+        for generation in generations:
+            metadata = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+            counts["tokens_in"] += metadata.get("input_tokens", 0)
+            counts["tokens_out"] += metadata.get("output_tokens", 0)
+    return counts
+
+
+def langchain_tracing_handler(tracer: Tracer = TRACER):
+    """
+    Returns a LangChain callback handler that records one 'llm' span per model call (with
+    prompt/completion sizes and token counts), or None if LangChain is not installed.
+    Token counts and call latency also feed the LLM metrics, even when tracing is disabled.
+    Attach it to the model (callbacks=[...]) so that both crew and direct runs are covered.
+    """
+    try:
+        from langchain_core.callbacks import BaseCallbackHandler
+    except ImportError:
+        return None
+
+    class _TracingHandler(BaseCallbackHandler):
+        def __init__(self):
+            self._open: Dict[Any, Span] = {}
+            self._lock = threading.Lock()
+
+        def _start(self, serialized: Optional[Dict[str, Any]], prompt_bytes: int, run_id: Any, **kwargs: Any):
+            params = kwargs.get("invocation_params") or {}
+            model = params.get("model_name") or params.get("model") or (serialized or {}).get("name", "llm")
+            span = Span(f"llm:{model}", "llm", {"model": model, "bytes_in": prompt_bytes}, parent=tracer.current_span())
+            with self._lock:
+                self._open[run_id] = span
+
+        def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+            self._start(serialized, sum(payload_size(p) for p in prompts), run_id, **kwargs)
+
+        def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+            prompt_bytes = sum(payload_size(getattr(m, "content", "")) for batch in messages for m in batch)
+            self._start(serialized, prompt_bytes, run_id, **kwargs)
+
+        def on_llm_end(self, response, *, run_id, **kwargs):
+            with self._lock:
+                span = self._open.pop(run_id, None)
+            if span is None:
+                return
+            text = "".join(getattr(g, "text", "") for batch in response.generations for g in batch)
+            tokens = _llm_token_usage(response)
+            span.set(bytes_out=payload_size(text), **tokens)
+            model = span.attributes["model"]
+            LLM_TOKENS.inc(tokens["tokens_in"], model=model, direction="in")
+            LLM_TOKENS.inc(tokens["tokens_out"], model=model, direction="out")
+            LLM_CALL_DURATION.observe(span.duration_s, model=model)
+            if tracer.enabled:
+                tracer.finish(span)
+
+        def on_llm_error(self, error, *, run_id, **kwargs):
+            with self._lock:
+                span = self._open.pop(run_id, None)
+            if span is not None and tracer.enabled:
+                span.set(error=f"{type(error).__name__}: {error}")
+                tracer.finish(span)
+
+    return _TracingHandler()
@@ -0,0 +1,57 @@
+import pytest
+
+import src.checkpoints as checkpoints_module
+from benchmarks.fakes import FakeToolBackend
+from src.checkpoints import CheckpointStore
+from src.tools.caching import TTLCache
+from src.tools.composio_client import ComposioClient, set_composio_client
+from src.tools.workbench import LocalWorkbenchStore
+
+# --- Shared Fixtures ---
+# Every test gets its own Workbench and result cache under tmp_path and a ComposioClient on an
+# in-process backend, so no test touches the network, the shared temp dirs or another test's state.
+
+
+@pytest.fixture(autouse=True)
+def isolated_environment(monkeypatch):
+    for name in ("COMPOSIO_API_KEY", "COMPOSIO_BASE_URL", "RESULT_CACHE_DIR", "COMPOSIO_RATE_LIMITS"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("REMOTE_BASH_SANDBOX", "0")
+    yield
+    set_composio_client(None)
+
+
+@pytest.fixture
+def workbench(tmp_path):
+    store = LocalWorkbenchStore(str(tmp_path / "workbench"))
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def make_client(workbench):
+    """Builds ComposioClients (installed as the shared client) on a fake backend by default."""
+    clients = []
+
+    def _make(**kwargs) -> ComposioClient:
+        kwargs.setdefault("backend", FakeToolBackend())
+        kwargs.setdefault("workbench", workbench)
+        kwargs.setdefault("result_cache", TTLCache())
+        kwargs.setdefault("rate_limits", {})
+        client = ComposioClient(**kwargs)
+        set_composio_client(client)
+        clients.append(client)
+        return client
+
+    yield _make
+    for client in clients:
+        client.shutdown(wait=False)
+
+
+@pytest.fixture
+def checkpoints(tmp_path, monkeypatch):
+    """A fresh CheckpointStore installed as the process-wide store used by the pipeline."""
+    store = CheckpointStore(str(tmp_path / "checkpoints"))
+    monkeypatch.setattr(checkpoints_module, "_checkpoint_store", store)
+    monkeypatch.delenv("CHECKPOINTS_DISABLED", raising=False)
+    return store
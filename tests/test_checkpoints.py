@@ -0,0 +1,111 @@
+import json
+import os
+import time
+
+import pytest
+
+from benchmarks.fakes import FakeLLM, FakeMessage
+from src.checkpoints import CheckpointStore
+from src.models import ResearchQuery
+from src.paths import ensure_private_dir
+from src.pipeline import run_direct_pipeline
+
+QUERY = ResearchQuery(
+    topic="Lipid nanoparticles for targeted mRNA delivery",
+    target_output="Draft full experimental protocol",
+    keywords=["ionizable lipid", "PEG-lipid"],
+)
+
+
+class FailingSynthesisLLM(FakeLLM):
+    """FakeLLM whose synthesis call fails while `fail` is set."""
+    fail = True
+
+    def invoke(self, prompt: str) -> FakeMessage:
+        if self.fail and "Reply with ONLY a JSON object" in prompt:
+            raise RuntimeError("LLM unavailable")
+        return super().invoke(prompt)
+
+
+def test_saved_output_is_keyed_by_stage_and_fingerprint(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    store.save("session", "plan", {"steps": 1}, fingerprint="a")
+
+    assert store.load("session", "plan", "a") == {"steps": 1}
+    assert store.load("session", "plan", "b") is None
+    assert store.load("other-session", "plan", "a") is None
+
+
+def test_expired_checkpoints_are_ignored_and_removed(tmp_path):
+    store = CheckpointStore(str(tmp_path), ttl_s=60)
+    store.save("session", "plan", {"steps": 1})
+    path = store._path("session", "plan")
+    with open(path, "r+", encoding="utf-8") as f:
+        record = json.load(f)
+        record["saved_at"] -= 120
+        f.seek(0)
+        f.truncate()
+        json.dump(record, f)
+
+    assert store.load("session", "plan") is None
+    assert not os.path.exists(path)
+
+
+def test_max_age_tightens_the_ttl_without_removing(tmp_path):
+    store = CheckpointStore(str(tmp_path), ttl_s=60)
+    store.save("session", "research-request", {"status": "completed"})
+    time.sleep(0.01)
+
+    assert store.load("session", "research-request", max_age_s=0.0) is None
+    assert store.load("session", "research-request") == {"status": "completed"}
+
+
+def test_prune_removes_expired_checkpoints_and_empty_sessions(tmp_path):
+    store = CheckpointStore(str(tmp_path), ttl_s=60)
+    store.save("old", "plan", {})
+    store.save("new", "plan", {})
+    expired = time.time() - 120
+    os.utime(store._path("old", "plan"), (expired, expired))
+
+    assert store.prune() == 1
+    assert os.listdir(tmp_path) == ["new"]
+
+
+def test_state_dirs_must_be_private(tmp_path):
+    private = ensure_private_dir(str(tmp_path / "state"))
+    assert os.stat(private).st_mode & 0o777 == 0o700
+
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    os.chmod(shared, 0o777)
+    with pytest.raises(PermissionError):
+        ensure_private_dir(str(shared))
+
+    os.symlink(private, tmp_path / "link")
+    with pytest.raises(PermissionError):
+        ensure_private_dir(str(tmp_path / "link"))
+
+
+def test_failed_run_resumes_after_the_last_completed_stage(make_client, checkpoints, tmp_path):
+    make_client()
+    llm = FailingSynthesisLLM()
+
+    with pytest.raises(RuntimeError, match="LLM unavailable") as failure:
+        run_direct_pipeline(QUERY, llm, output_file=None)
+    assert "synthesis" in failure.value.schedule_report.failed_stages
+
+    llm.fail = False
+    calls_before = llm.calls
+    result = run_direct_pipeline(QUERY, llm, output_file=str(tmp_path / "report.txt"))
+
+    assert set(result.reused_stages) >= {
+        "plan", "hypothesis", "analysis", "research:ARXIV_SEARCH", "research:PUBCHEM_QUERY",
+    }
+    assert "synthesis" not in result.reused_stages
+    assert llm.calls == calls_before + 1  # Only the synthesis prompt was sent again
+
+
+def test_resume_can_be_disabled(make_client, checkpoints):
+    make_client()
+    run_direct_pipeline(QUERY, FakeLLM(), output_file=None)
+    assert run_direct_pipeline(QUERY, FakeLLM(), output_file=None, resume=False).reused_stages == []
@@ -0,0 +1,75 @@
+import pytest
+
+import src.pipeline as pipeline
+from benchmarks.fakes import FakeLLM
+from src.models import ResearchQuery, ResearchResult
+from src.pipeline import run_direct_pipeline, stage_fingerprint
+from src.tools.custom_tools import plan_key, session_id_for_query
+
+QUERY = ResearchQuery(
+    topic="Lipid nanoparticles for targeted mRNA delivery",
+    target_output="Draft full experimental protocol",
+    keywords=["ionizable lipid", "PEG-lipid"],
+)
+ALL_STAGES = {"plan", "hypothesis", "analysis", "synthesis", "research:ARXIV_SEARCH", "research:PUBCHEM_QUERY"}
+
+
+@pytest.fixture
+def rerun(make_client, checkpoints):
+    """Runs QUERY once, then returns a function that reruns an edited query and reports what was reused."""
+    make_client()
+    llm = FakeLLM()
+    run_direct_pipeline(QUERY, llm, output_file=None)
+
+    def _rerun(query: ResearchQuery = QUERY) -> set:
+        return set(run_direct_pipeline(query, llm, output_file=None).reused_stages)
+    return _rerun
+
+
+def test_unchanged_query_reuses_every_stage(rerun):
+    assert rerun() == ALL_STAGES
+
+
+def test_adding_a_keyword_reissues_only_the_pubchem_request(rerun):
+    edited = QUERY.copy(update={"keywords": QUERY.keywords + ["DSPC"]})
+    assert rerun(edited) == {"plan", "hypothesis", "research:ARXIV_SEARCH"}
+
+
+def test_changing_the_target_output_recomputes_only_the_llm_stages(rerun):
+    edited = QUERY.copy(update={"target_output": "Summarise prior art"})
+    assert rerun(edited) == ALL_STAGES - {"hypothesis", "synthesis"}
+
+
+def test_research_is_reissued_when_its_workbench_payload_is_gone(rerun, workbench):
+    workbench.prune(max_age_s=-1)
+    # The refetched payloads have the same content keys, so downstream stages are still reused
+    assert rerun() == ALL_STAGES - {"research:ARXIV_SEARCH", "research:PUBCHEM_QUERY"}
+
+
+def test_prompt_change_invalidates_the_stages_using_it(rerun, monkeypatch):
+    monkeypatch.setattr(pipeline, "HYPOTHESIS_PROMPT", pipeline.HYPOTHESIS_PROMPT + "\nBe concise.")
+    assert rerun() == ALL_STAGES - {"hypothesis", "synthesis"}
+
+
+def test_analysis_fingerprint_depends_on_the_execution_mode(make_client):
+    client = make_client()
+    inputs = {"research": ResearchResult(workbench_keys=["sha256-" + "0" * 64], results=[])}
+    simulated = stage_fingerprint("analysis", QUERY, inputs)
+    client.sandbox_enabled = True
+    assert stage_fingerprint("analysis", QUERY, inputs) != simulated
+
+
+def test_analysis_fingerprint_ignores_fields_it_does_not_read(make_client):
+    make_client()
+    inputs = {"research": ResearchResult(workbench_keys=[], results=[])}
+    edited = QUERY.copy(update={"topic": "Something else", "keywords": ["x"]})
+    assert stage_fingerprint("analysis", QUERY, inputs) == stage_fingerprint("analysis", edited, inputs)
+
+
+def test_plan_cache_key_covers_the_whole_query_and_the_session_only_the_topic(make_client):
+    make_client()
+    reordered = QUERY.copy(update={"keywords": list(reversed(QUERY.keywords))})
+    edited = QUERY.copy(update={"target_output": "Summarise prior art"})
+
+    assert plan_key(reordered) == plan_key(QUERY) != plan_key(edited)
+    assert session_id_for_query(edited) == session_id_for_query(QUERY)
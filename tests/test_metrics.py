@@ -0,0 +1,46 @@
+import gc
+import weakref
+
+from src.metrics import METRICS, MetricsRegistry
+from src.tools.caching import TTLCache
+
+
+def _hit_ratio_lines(registry: MetricsRegistry):
+    return [line for line in registry.render().splitlines() if line.startswith("co_scientist_cache_hit_ratio{")]
+
+
+def test_nan_and_infinities_use_prometheus_spelling():
+    registry = MetricsRegistry()
+    registry.register_cache("empty", lambda: {"hits": 0, "misses": 0, "hit_ratio": float("nan")})
+    registry.register_pool("pool", lambda: {"jobs": float("inf"), "crashes": float("-inf")})
+
+    text = registry.render()
+    assert 'co_scientist_cache_hit_ratio{cache="empty"} NaN' in text
+    assert 'co_scientist_pool_jobs_total{pool="pool"} +Inf' in text
+    assert 'co_scientist_pool_crashes_total{pool="pool"} -Inf' in text
+
+
+def test_registrations_do_not_keep_their_owner_alive():
+    registry = MetricsRegistry()
+    older, newer = TTLCache(), TTLCache()
+    older.set("key", "value")
+    older.get("key")
+    newer.get("missing")
+    registry.register_cache("results", older.stats)
+    registry.register_cache("results", newer.stats)
+    assert _hit_ratio_lines(registry) == ['co_scientist_cache_hit_ratio{cache="results"} 0']
+
+    collected = weakref.ref(newer)
+    del newer
+    gc.collect()
+    assert collected() is None
+    # The superseded, still-live registration is exported again
+    assert _hit_ratio_lines(registry) == ['co_scientist_cache_hit_ratio{cache="results"} 1']
+
+
+def test_shut_down_clients_are_no_longer_exported(make_client):
+    client = make_client()
+    assert any(ref() == client.transport_stats for ref in METRICS._pools["transport"])
+
+    client.shutdown(wait=False)
+    assert not any(ref() == client.transport_stats for ref in METRICS._pools.get("transport", []))
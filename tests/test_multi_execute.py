@@ -0,0 +1,73 @@
+import asyncio
+import time
+from typing import Any, Dict
+
+from src.tools.async_client import AsyncComposioClient
+from src.tools.backends import AsyncToolBackend, LocalToolBackend
+from src.tracing import TRACER
+
+
+class DelayBackend(LocalToolBackend):
+    """Sleeps for the request's `delay_s` argument, then answers like the local backend."""
+    def execute(self, tool_slug: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        time.sleep(arguments.get("delay_s", 0.0))
+        return super().execute(tool_slug, arguments)
+
+
+def _requests(*delays_s: float):
+    return [{"tool_slug": "delay_tool", "arguments": {"delay_s": d, "n": i}} for i, d in enumerate(delays_s)]
+
+
+def test_results_are_returned_in_request_order(make_client):
+    client = make_client(backend=DelayBackend(), max_workers=4)
+    result = client.multi_execute_tool(_requests(0.2, 0.0, 0.1), session_id="s")
+
+    assert result["successful"]
+    assert [res["status"] for res in result["results"]] == ["completed"] * 3
+
+
+def test_timeout_counts_from_dispatch_not_from_the_batch_start(make_client):
+    # Four 0.3s requests on two workers: the second pair starts at ~0.3s, yet each runs well
+    # within its own 0.5s budget, so none of them may time out.
+    client = make_client(backend=DelayBackend(), max_workers=2)
+    result = client.multi_execute_tool(_requests(0.3, 0.3, 0.3, 0.3), session_id="s", timeout_s=0.5)
+
+    assert [res["status"] for res in result["results"]] == ["completed"] * 4
+
+
+def test_slow_request_times_out_without_failing_the_batch(make_client):
+    client = make_client(backend=DelayBackend(), max_workers=2)
+    started = time.monotonic()
+    result = client.multi_execute_tool(_requests(0.0, 2.0), session_id="s", timeout_s=0.3)
+
+    assert time.monotonic() - started < 1.5
+    assert result["successful"]
+    assert [res["status"] for res in result["results"]] == ["completed", "timeout"]
+
+
+class AsyncDelayBackend(AsyncToolBackend):
+    async def execute(self, tool_slug: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        await asyncio.sleep(arguments.get("delay_s", 0.0))
+        return LocalToolBackend().execute(tool_slug, arguments)
+
+
+def _run_async(client, requests, timeout_s):
+    async def _run():
+        async_client = AsyncComposioClient(backend=AsyncDelayBackend(), client=client, max_concurrency=2)
+        return await async_client.multi_execute_tool(requests, session_id="s", timeout_s=timeout_s)
+    return asyncio.run(_run())
+
+
+def test_async_timeout_counts_from_the_concurrency_slot(make_client):
+    result = _run_async(make_client(), _requests(0.3, 0.3, 0.3, 0.3), timeout_s=0.5)
+    assert [res["status"] for res in result["results"]] == ["completed"] * 4
+
+
+def test_async_slow_request_times_out_with_a_tool_span(make_client):
+    TRACER.clear()
+    result = _run_async(make_client(), _requests(0.0, 2.0), timeout_s=0.3)
+
+    assert [res["status"] for res in result["results"]] == ["completed", "timeout"]
+    spans = [span for span in TRACER.spans() if span.category == "tool_call"]
+    assert sorted(span.attributes["status"] for span in spans) == ["completed", "timeout"]
+    assert all(span.parent.name == "AsyncComposioClient.multi_execute_tool" for span in spans)
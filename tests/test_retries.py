@@ -0,0 +1,111 @@
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+
+import pytest
+
+from src.tools.backends import LocalToolBackend
+from src.tools.concurrency import RateLimit, RateLimiter, RateLimitTimeout, TokenBucket
+from src.tools.composio_client import TOOL_SLUGS, load_rate_limits
+from src.tools.resilience import RetryPolicy, TransientToolError, call_with_retry, hedged_call
+
+FAST_RETRIES = RetryPolicy(max_attempts=3, base_delay_s=0.001, max_delay_s=0.001)
+
+
+class FlakyBackend(LocalToolBackend):
+    """Fails the first `failures` calls of every slug with a retryable error."""
+    def __init__(self, failures: int):
+        super().__init__()
+        self.failures = failures
+        self.calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def execute(self, tool_slug: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            self.calls[tool_slug] = call = self.calls.get(tool_slug, 0) + 1
+        if call <= self.failures:
+            raise TransientToolError(f"{tool_slug} failed with HTTP 503.")
+        return super().execute(tool_slug, arguments)
+
+
+def _failing(exception: Exception, failures: int):
+    attempts = []
+
+    def _call():
+        attempts.append(1)
+        if len(attempts) <= failures:
+            raise exception
+        return "ok"
+    return _call, attempts
+
+
+def test_transient_errors_are_retried_until_success():
+    call, attempts = _failing(TransientToolError("503"), failures=2)
+    assert call_with_retry(call, FAST_RETRIES) == ("ok", 3)
+
+
+def test_retries_stop_at_max_attempts():
+    call, attempts = _failing(ConnectionError("reset"), failures=5)
+    with pytest.raises(ConnectionError):
+        call_with_retry(call, FAST_RETRIES)
+    assert len(attempts) == 3
+
+
+def test_rate_limit_timeouts_are_not_retried():
+    limiter = RateLimiter({"slow": RateLimit(rate_per_s=0.1, burst=1)})
+    with limiter.limit("slow"):
+        pass  # Takes the only token; the next one is 10s away
+
+    attempts = []
+
+    def _call():
+        attempts.append(1)
+        with limiter.limit("slow", timeout=0.05):
+            return "ok"
+
+    with pytest.raises(RateLimitTimeout):
+        call_with_retry(_call, FAST_RETRIES)
+    assert len(attempts) == 1
+    assert limiter.stats()["slow"]["rejected"] == 1
+
+
+@pytest.mark.parametrize("rate_per_s", [0, -1.0])
+def test_non_positive_rates_are_rejected(rate_per_s, monkeypatch):
+    with pytest.raises(ValueError):
+        TokenBucket(rate_per_s)
+    monkeypatch.setenv("COMPOSIO_RATE_LIMITS", f'{{"ARXIV_SEARCH": {{"rate_per_s": {rate_per_s}}}}}')
+    with pytest.raises(ValueError):
+        load_rate_limits()
+
+
+def test_rate_limit_overrides_use_tool_aliases(monkeypatch):
+    monkeypatch.setenv("COMPOSIO_RATE_LIMITS", '{"ARXIV_SEARCH": {"rate_per_s": 2, "burst": 2, "max_in_flight": 2}}')
+    assert load_rate_limits()[TOOL_SLUGS["ARXIV_SEARCH"]] == RateLimit(rate_per_s=2, burst=2, max_in_flight=2)
+
+
+def test_client_retries_idempotent_tools_only(make_client):
+    backend = FlakyBackend(failures=1)
+    client = make_client(backend=backend, retry_policy=FAST_RETRIES, result_ttls_s={})
+    result = client.multi_execute_tool([
+        {"tool_slug": TOOL_SLUGS["PUBCHEM_QUERY"], "arguments": {"keywords": ["peg"]}},
+        {"tool_slug": TOOL_SLUGS["NOTION_DRAFT"], "arguments": {"title": "Report"}},
+    ], session_id="s")
+
+    pubchem, notion = result["results"]
+    assert pubchem["status"] == "completed" and pubchem["attempts"] == 2
+    assert notion["status"] == "failed"
+    assert backend.calls[TOOL_SLUGS["NOTION_DRAFT"]] == 1
+
+
+def test_hedged_call_runs_inline_without_a_threshold_and_keeps_the_context():
+    request_id = contextvars.ContextVar("request_id", default=None)
+    request_id.set("r1")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert hedged_call(threading.get_ident, None, executor) == (threading.get_ident(), False)
+
+        def _slow():
+            time.sleep(0.1)
+            return request_id.get()
+        assert hedged_call(_slow, 0.01, executor) == ("r1", True)
@@ -0,0 +1,31 @@
+import json
+
+import pytest
+
+from src.risk_engine import load_compound_table
+
+FLAGS = [True, "true", "Yes", "1", 1, False, "false", "No", "0", "", 0, None]
+EXPECTED = [True] * 5 + [False] * 7
+
+
+def _records_payload():
+    return {"source": "pubchem", "compounds": [{"cid": i, "toxicity_flag": flag} for i, flag in enumerate(FLAGS)]}
+
+
+def _columns_payload():
+    return {"source": "pubchem", "columns": {"cid": list(range(len(FLAGS))), "toxicity_flag": FLAGS}}
+
+
+@pytest.mark.parametrize("build", [_records_payload, _columns_payload])
+@pytest.mark.parametrize("streamed", [False, True])
+def test_string_flags_are_parsed_the_same_way_in_every_payload_form(build, streamed):
+    payload = json.dumps(build()).encode("utf-8")
+    if streamed:
+        payload = [memoryview(payload[i:i + 16]) for i in range(0, len(payload), 16)]
+
+    assert load_compound_table([payload]).toxicity_flag.tolist() == EXPECTED
+
+
+def test_boolean_flag_columns_are_used_as_they_are():
+    table = load_compound_table([{"source": "pubchem", "columns": {"cid": [1, 2], "toxicity_flag": [True, False]}}])
+    assert table.toxicity_flag.tolist() == [True, False]
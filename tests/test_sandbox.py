@@ -0,0 +1,64 @@
+import threading
+import time
+
+import pytest
+
+from src.tools.sandbox import SandboxLimits, SandboxPool, SandboxWorkerError, sandbox_supported
+
+pytestmark = pytest.mark.skipif(not sandbox_supported(), reason="The sandbox needs POSIX rlimits.")
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def _make(**kwargs) -> SandboxPool:
+        kwargs.setdefault("size", 1)
+        kwargs.setdefault("preload", ())
+        pools.append(SandboxPool(**kwargs))
+        return pools[-1]
+
+    yield _make
+    for pool in pools:
+        pool.close()
+
+
+def test_jobs_on_a_reused_worker_do_not_see_each_others_state(make_pool):
+    pool = make_pool()
+    pool.run("import os, sys, json.tool\nos.environ['LEAK'] = '1'\nsys.path.append('/leak')\nleak = 1")
+    result = pool.run("import os, sys\nprint('json.tool' in sys.modules, 'LEAK' in os.environ, '/leak' in sys.path, 'leak' in dir())")
+
+    assert result["stdout"].split() == ["False"] * 4
+    assert pool.stats()["workers_started"] == 1
+
+
+def test_workers_are_recycled_after_a_failed_job_and_their_job_quota(make_pool):
+    pool = make_pool(max_jobs_per_worker=2)
+    assert not pool.run("raise ValueError('boom')")["successful"]
+    pool.run("pass")
+    pool.run("pass")
+
+    assert pool.stats()["recycled"] == 2
+    assert pool.run("print('ok')")["stdout"] == "ok\n"
+
+
+def test_queued_runs_wait_beyond_the_wall_time_unless_given_a_queue_timeout(make_pool):
+    # Three 0.3s scripts on one worker: the last waits ~0.6s, longer than its 0.5s wall time
+    pool = make_pool(limits=SandboxLimits(wall_time_s=0.5))
+    pool.warm()
+    results = []
+    runs = [threading.Thread(target=lambda: results.append(pool.run("import time; time.sleep(0.3)"))) for _ in range(3)]
+    for run in runs:
+        run.start()
+    for run in runs:
+        run.join()
+    assert [result["successful"] for result in results] == [True] * 3
+
+    pool = make_pool(limits=SandboxLimits(queue_timeout_s=0.1))
+    pool.warm()
+    busy = threading.Thread(target=pool.run, args=("import time; time.sleep(0.5)",))
+    busy.start()
+    time.sleep(0.1)
+    with pytest.raises(SandboxWorkerError, match="within 0.1s"):
+        pool.run("pass")
+    busy.join()
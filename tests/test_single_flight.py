@@ -0,0 +1,95 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+
+import pytest
+
+from src.tools.backends import LocalToolBackend
+from src.tools.concurrency import AsyncSingleFlight, SingleFlight
+from src.tools.composio_client import TOOL_SLUGS
+
+
+class CountingBackend(LocalToolBackend):
+    """Counts executions per slug; each call takes `delay_s`, so concurrent calls overlap."""
+    def __init__(self, delay_s: float = 0.2):
+        super().__init__()
+        self.delay_s = delay_s
+        self.calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def execute(self, tool_slug: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            self.calls[tool_slug] = self.calls.get(tool_slug, 0) + 1
+        time.sleep(self.delay_s)
+        return super().execute(tool_slug, arguments)
+
+
+def test_concurrent_calls_for_one_key_share_a_single_execution():
+    flight = SingleFlight()
+    executions = []
+
+    def _work():
+        executions.append(1)
+        time.sleep(0.2)
+        return "value"
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        results = list(pool.map(lambda _: flight.do("key", _work), range(5)))
+
+    assert len(executions) == 1
+    assert [value for value, _ in results] == ["value"] * 5
+    assert sorted(shared for _, shared in results) == [False] + [True] * 4
+    assert flight.stats() == {"executed": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_waiters_share_the_leader_exception_and_the_next_call_runs_again():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def _fail():
+        started.set()
+        time.sleep(0.2)
+        raise RuntimeError("upstream down")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flight.do, "key", _fail)
+        started.wait()
+        follower = pool.submit(flight.do, "key", lambda: "never called")
+        for future in (leader, follower):
+            with pytest.raises(RuntimeError, match="upstream down"):
+                future.result()
+
+    assert flight.do("key", lambda: "fresh") == ("fresh", False)
+
+
+def test_client_coalesces_identical_calls_to_idempotent_tools_only(make_client):
+    backend = CountingBackend()
+    client = make_client(backend=backend, max_workers=8, result_ttls_s={})
+    arxiv = {"tool_slug": TOOL_SLUGS["ARXIV_SEARCH"], "arguments": {"query": "lipid nanoparticles"}}
+    notion = {"tool_slug": TOOL_SLUGS["NOTION_DRAFT"], "arguments": {"title": "Report"}}
+
+    result = client.multi_execute_tool([arxiv] * 4 + [notion] * 2, session_id="s")
+
+    assert [res["status"] for res in result["results"]] == ["completed"] * 6
+    assert backend.calls == {TOOL_SLUGS["ARXIV_SEARCH"]: 1, TOOL_SLUGS["NOTION_DRAFT"]: 2}
+    assert sum(res["coalesced"] for res in result["results"][:4]) == 3
+
+
+def test_cancelling_the_async_leader_does_not_cancel_its_followers():
+    async def _run():
+        flight = AsyncSingleFlight()
+
+        async def _work():
+            await asyncio.sleep(0.1)
+            return "value"
+
+        leader = asyncio.ensure_future(flight.do("key", _work))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do("key", _work))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower, flight.stats()
+
+    assert asyncio.run(_run()) == (("value", True), {"executed": 1, "coalesced": 1, "in_flight": 0})
@@ -0,0 +1,182 @@
+import asyncio
+import socket
+import threading
+
+import pytest
+
+from src.tools.backends import HTTPToolBackend
+from src.tools.transport import (
+    AsyncHTTPTransport, HTTPTransport, HTTPXTransport, Transport, TransportResponse, split_url,
+)
+
+
+class DroppingServer:
+    """
+    HTTP/1.1 server that answers the first request on each connection with keep-alive, then
+    reads the next request on that connection and closes it without answering, as a server
+    does when its idle timeout races a client reusing the connection.
+    """
+    def __init__(self):
+        self.requests_received = 0
+        self._lock = threading.Lock()
+        self._socket = socket.create_server(("127.0.0.1", 0))
+        self.url = f"http://127.0.0.1:{self._socket.getsockname()[1]}"
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _read_request(self, connection: socket.socket) -> bool:
+        data = b""
+        while b"\r\n\r\n" not in data:
+            chunk = connection.recv(4096)
+            if not chunk:
+                return False
+            data += chunk
+        head, _, body = data.partition(b"\r\n\r\n")
+        length = next((int(line.split(b":")[1]) for line in head.split(b"\r\n")
+                       if line.lower().startswith(b"content-length:")), 0)
+        while len(body) < length:
+            body += connection.recv(4096)
+        with self._lock:
+            self.requests_received += 1
+        return True
+
+    def _handle(self, connection: socket.socket):
+        with connection:
+            if self._read_request(connection):
+                connection.sendall(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nConnection: keep-alive\r\n\r\n{}")
+                self._read_request(connection)  # ...and drop the connection instead of answering
+
+    def _serve(self):
+        while True:
+            try:
+                connection, _ = self._socket.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle, args=(connection,), daemon=True).start()
+
+    def close(self):
+        self._socket.close()
+
+
+@pytest.fixture
+def server():
+    server = DroppingServer()
+    yield server
+    server.close()
+
+
+def test_sync_transport_replays_idempotent_request_on_stale_connection(server):
+    transport = HTTPTransport(server.url)
+    assert transport.request("POST", "/run", {"n": 1}, idempotent=True).status == 200
+    assert transport.request("POST", "/run", {"n": 2}, idempotent=True).status == 200
+
+    assert server.requests_received == 3  # The dropped request was sent again on a fresh connection
+    assert transport.stats()["connections_created"] == 2
+    transport.close()
+
+
+def test_sync_transport_never_replays_non_idempotent_request(server):
+    transport = HTTPTransport(server.url)
+    transport.request("POST", "/run", {"n": 1})
+    with pytest.raises(ConnectionError):
+        transport.request("POST", "/run", {"n": 2})
+
+    assert server.requests_received == 2
+    transport.close()
+
+
+@pytest.mark.parametrize("idempotent", [True, False])
+def test_async_transport_replays_only_idempotent_requests(server, idempotent):
+    async def _run():
+        transport = AsyncHTTPTransport(server.url)
+        try:
+            await transport.request("POST", "/run", {"n": 1}, idempotent=idempotent)
+            return await transport.request("POST", "/run", {"n": 2}, idempotent=idempotent)
+        finally:
+            await transport.aclose()
+
+    if idempotent:
+        assert asyncio.run(_run()).status == 200
+        assert server.requests_received == 3
+    else:
+        with pytest.raises(ConnectionError):
+            asyncio.run(_run())
+        assert server.requests_received == 2
+
+
+class RecordingTransport(Transport):
+    def __init__(self):
+        self.idempotent = []
+
+    def request(self, method, url, json_body=None, headers=None, idempotent=False):
+        self.idempotent.append(idempotent)
+        return TransportResponse(200, {}, b'{"output_summary": "ok"}')
+
+
+def test_http_backend_marks_only_idempotent_slugs():
+    transport = RecordingTransport()
+    backend = HTTPToolBackend(transport, user_id="u", idempotent_slugs=frozenset({"search"}))
+    backend.execute("search", {})
+    backend.execute("create_page", {})
+
+    assert transport.idempotent == [True, False]
+
+
+class SilentServer:
+    """Accepts connections and reads requests but never answers."""
+    def __init__(self):
+        self._socket = socket.create_server(("127.0.0.1", 0))
+        self.url = f"http://127.0.0.1:{self._socket.getsockname()[1]}"
+        self._connections = []
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                self._connections.append(self._socket.accept()[0])
+            except OSError:
+                return
+
+    def close(self):
+        for connection in self._connections:
+            connection.close()
+        self._socket.close()
+
+
+def test_httpx_transport_replays_idempotent_request_on_stale_connection(server):
+    transport = HTTPXTransport(server.url, http2=False)
+    assert transport.request("POST", "/run", {"n": 1}, idempotent=True).status == 200
+    assert transport.request("POST", "/run", {"n": 2}, idempotent=True).status == 200
+
+    assert server.requests_received == 3
+    assert transport.stats()["connections_created"] == 2
+    transport.close()
+
+
+def test_httpx_transport_maps_errors_and_never_replays_non_idempotent_request(server):
+    transport = HTTPXTransport(server.url, http2=False)
+    transport.request("POST", "/run", {"n": 1})
+    with pytest.raises(ConnectionError):
+        transport.request("POST", "/run", {"n": 2})
+
+    assert server.requests_received == 2
+    transport.close()
+
+
+def test_httpx_transport_raises_timeout_error():
+    silent = SilentServer()
+    transport = HTTPXTransport(silent.url, timeout_s=0.2, http2=False)
+    try:
+        with pytest.raises(TimeoutError):
+            transport.request("POST", "/run", {}, idempotent=True)
+    finally:
+        transport.close()
+        silent.close()
+
+
+def test_httpx_transport_limits_concurrency_per_origin():
+    transport = HTTPXTransport("http://127.0.0.1:1", max_connections_per_host=2, http2=False)
+    limit = transport._limit_for(split_url("http://127.0.0.1:1/run")[0])
+    assert limit.acquire(blocking=False) and limit.acquire(blocking=False)
+    assert not limit.acquire(blocking=False)
+    assert transport._limit_for(split_url("http://localhost:1/run")[0]).acquire(blocking=False)
+    transport.close()
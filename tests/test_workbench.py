@@ -0,0 +1,76 @@
+import os
+import time
+
+import pytest
+
+from src.tools.workbench import KEY_PREFIX, LocalWorkbenchStore
+
+
+def test_identical_payloads_are_stored_once(workbench):
+    key = workbench.store({"compounds": [1, 2, 3]})
+    assert key.startswith(KEY_PREFIX)
+    assert workbench.store({"compounds": [1, 2, 3]}) == key
+    assert bytes(workbench.retrieve(key)) == b'{"compounds":[1,2,3]}'
+
+
+def test_named_reference_resolves_to_the_content_key(workbench):
+    name = workbench.store(b"payload", name="pubchem/run 1")
+    assert name == "pubchem/run 1"
+    assert workbench.path(name) == workbench.path(workbench.store(b"payload"))
+    assert bytes(workbench.retrieve_range(name, 3, 4)) == b"load"
+    assert b"".join(bytes(chunk) for chunk in workbench.iter_chunks(name, chunk_size=3)) == b"payload"
+
+
+@pytest.mark.parametrize("key", [
+    "",
+    None,
+    KEY_PREFIX,
+    KEY_PREFIX + "../../etc/passwd",
+    KEY_PREFIX + "ab/../../" + "0" * 56,
+    KEY_PREFIX + "A" * 64,  # Digests are lowercase hex
+    KEY_PREFIX + "0" * 63,
+    KEY_PREFIX + "0" * 65,
+    KEY_PREFIX + "0" * 64,  # Well-formed but never stored
+])
+def test_malformed_or_unknown_keys_are_rejected(workbench, key):
+    assert not workbench.exists(key)
+    with pytest.raises(KeyError):
+        workbench.path(key)
+    with pytest.raises(KeyError):
+        workbench.retrieve(key)
+    with pytest.raises(KeyError):
+        workbench.retrieve_range(key, 0, 1)
+    with pytest.raises(KeyError):
+        list(workbench.iter_chunks(key))
+
+
+def test_reference_must_point_at_a_content_key(workbench):
+    workbench.store(b"secret", name="ok")
+    # Hand-written refs pointing outside the object store, or at other refs, are not followed
+    for name, target in (("evil", "../../../etc/passwd"), ("chain", "ok"), ("bad-digest", KEY_PREFIX + "../x")):
+        with open(workbench._ref_path(name), "w", encoding="utf-8") as f:
+            f.write(target)
+        assert workbench.resolve(name) is None
+    assert workbench.resolve("ok") == workbench.resolve(workbench.store(b"secret"))
+
+
+def test_open_maps_are_bounded(tmp_path):
+    store = LocalWorkbenchStore(str(tmp_path / "wb"), max_open_maps=2)
+    keys = [store.store(f"payload {i}") for i in range(5)]
+    for key in keys:
+        view = store.retrieve(key)
+        view.release()
+    assert len(store._maps) == 2
+    store.close()
+
+
+def test_prune_removes_expired_payloads_and_their_references(workbench):
+    old = workbench.store(b"old", name="old-ref")
+    fresh = workbench.store(b"fresh")
+    expired = time.time() - 3600
+    os.utime(workbench.path(old), (expired, expired))
+
+    assert workbench.prune(max_age_s=60) == 1
+    assert not workbench.exists(old)
+    assert not os.path.exists(workbench._ref_path("old-ref"))
+    assert workbench.exists(fresh)